@@ -1,16 +1,26 @@
+import argparse
+import asyncio
+import itertools
 import logging
 import sys
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
 
 sys.path = ["", ".."] + sys.path[1:]
 
+from jaanevis.config import settings
 from jaanevis.domain.note import Note, NoteCreateApi
+from jaanevis.domain.user import User
 from jaanevis.repository import repository
+from jaanevis.repository.asyncrepo import AsyncRepo, AsyncRepository
 from jaanevis.requests.add_note_request import AddNoteRequest
+from jaanevis.requests.note_batch_request import AddNotesRequest
 from jaanevis.requests.note_list_request import NoteListRequest
 from jaanevis.responses import ResponseObject
 from jaanevis.usecases.add_note import AddNoteUseCase
+from jaanevis.usecases.note_batch import AddNotesUseCase
 from jaanevis.usecases.note_list import NoteListUseCase
+from jaanevis.utils import note_import, session_sweeper
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +30,9 @@ def get_notes_list(filters: Optional[dict]) -> ResponseObject:
 
     request_obj = NoteListRequest.from_dict(qrystr_params)
 
-    repo = repository()
+    repo = AsyncRepo(repository())
     usecase = NoteListUseCase(repo)
-    response = usecase.execute(request_obj)
+    response = asyncio.run(usecase.execute(request_obj))
     return response
 
 
@@ -30,20 +40,126 @@ def add_note(note_in: NoteCreateApi) -> ResponseObject:
     note = Note(**note_in.dict(), creator="default")
     request_obj = AddNoteRequest.build(note)
 
-    repo = repository()
+    repo = AsyncRepo(repository())
     usecase = AddNoteUseCase(repo)
-    response = usecase.execute(request_obj)
+    response = asyncio.run(usecase.execute(request_obj))
     return response
 
 
-if __name__ == "__main__":
-    notes = get_notes_list(filters={})
-    print(notes.value)
+@dataclass
+class ImportResult:
+    imported: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+async def import_records(
+    repo: AsyncRepository,
+    user: User,
+    records: Iterable[dict],
+    chunk_size: int = 500,
+) -> ImportResult:
+    """validate records in chunks and add each chunk with one write"""
+
+    result = ImportResult()
+    usecase = AddNotesUseCase(repo)
+    records = iter(records)
+    number = 1
+    while chunk := [*itertools.islice(records, chunk_size)]:
+        notes, errors = note_import.notes_from_records(chunk, number)
+        number += len(chunk)
+        result.errors.extend(errors)
+        if not notes:
+            continue
+        request_obj = AddNotesRequest.build(notes=notes, user=user)
+        response = await usecase.execute(request_obj)
+        if not response:
+            raise RuntimeError(response.message)
+        result.imported += len(notes)
+        logger.info("imported %s notes", result.imported)
+    return result
+
+
+def import_notes(
+    path: str,
+    username: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = 500,
+) -> ImportResult:
+    repo = AsyncRepo(repository())
+    user = asyncio.run(repo.get_user_by_username(username=username))
+    if not user:
+        raise ValueError(f"user '{username}' not found")
+    file_format = file_format or note_import.detect_format(path)
+    with open(path, "r") as stream:
+        records = note_import.iter_records(stream, file_format)
+        return asyncio.run(import_records(repo, user, records, chunk_size))
+
+
+def sweep_sessions() -> int:
+    repo = AsyncRepo(repository())
+    return asyncio.run(session_sweeper.sweep_expired_sessions(repo))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="jaanevis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="print stored notes")
+    list_parser.add_argument("--creator")
+
+    import_parser = commands.add_parser(
+        "import", help="import notes from a geojson or ndjson file"
+    )
+    import_parser.add_argument("path")
+    import_parser.add_argument(
+        "--user", required=True, help="username of the notes creator"
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=note_import.FORMATS,
+        help="file format, detected from the file extension by default",
+    )
+    import_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help=f"notes written at once, at most {settings.NOTE_BATCH_MAX_SIZE}",
+    )
+
+    commands.add_parser(
+        "sweep-sessions",
+        help="delete expired sessions and activation tokens",
+    )
 
-    new_note = NoteCreateApi(
-        url="https://example.com/1",
-        lat=1,
-        long=1,
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        filters = {"creator__eq": args.creator} if args.creator else {}
+        response = get_notes_list(filters)
+        for note in response.value:
+            print(note.to_dict())
+        return 0
+
+    if args.command == "sweep-sessions":
+        print(f"removed {sweep_sessions()} expired sessions")
+        return 0
+
+    if not 0 < args.chunk_size <= settings.NOTE_BATCH_MAX_SIZE:
+        parser.error(
+            f"--chunk-size must be between 1 and"
+            f" {settings.NOTE_BATCH_MAX_SIZE}"
+        )
+    result = import_notes(
+        args.path, args.user, args.format, chunk_size=args.chunk_size
+    )
+    for error in result.errors:
+        logger.warning(error)
+    print(
+        f"imported {result.imported} notes,"
+        f" skipped {len(result.errors)} invalid records"
     )
-    note_add_res = add_note(new_note)
-    print(note_add_res.value)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
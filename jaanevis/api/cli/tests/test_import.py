@@ -0,0 +1,176 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from jaanevis.api.cli import main
+from jaanevis.domain import note as n
+from jaanevis.repository import memrepo, sqliterepo
+from jaanevis.utils import note_import
+
+features = [
+    {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [51.4, 35.7]},
+        "properties": {"url": "https://example.com/1", "text": "#tehran"},
+    },
+    {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [2.35, 48.85]},
+        "properties": {"url": "not a url"},
+    },
+    {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [2.35, 48.85]},
+        "properties": {"url": "https://example.com/2", "country": "XX"},
+    },
+]
+collection = {
+    "type": "FeatureCollection",
+    "name": "notes",
+    "features": features,
+    "crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+}
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 64, 1 << 16])
+def test_geojson_features_are_streamed_across_reads(buffer_size) -> None:
+    stream = io.StringIO(json.dumps(collection, indent=2))
+
+    records = note_import.iter_geojson_features(stream, buffer_size)
+
+    assert [*records] == features
+
+
+def test_geojson_features_of_empty_collection() -> None:
+    stream = io.StringIO('{"type": "FeatureCollection", "features": []}')
+
+    assert [*note_import.iter_geojson_features(stream)] == []
+
+
+def test_ndjson_records() -> None:
+    stream = io.StringIO("\n".join(json.dumps(f) for f in features) + "\n\n")
+
+    assert [*note_import.iter_ndjson(stream)] == features
+
+
+def test_notes_from_records_geocodes_chunk_at_once() -> None:
+    with mock.patch(
+        "reverse_geocode.search",
+        return_value=[{"country_code": "IR"}, {"country_code": "FR"}],
+    ) as search:
+        notes, errors = note_import.notes_from_records(features, 10)
+
+    search.assert_called_once_with([(35.7, 51.4), (48.85, 2.35)])
+    assert [note.country for note in notes] == ["IR", "XX"]
+    assert notes[0].tags == ["tehran"]
+    assert len(errors) == 1
+    assert errors[0].startswith("record 11:")
+
+
+def test_notes_from_records_rejects_invalid_coordinates() -> None:
+    records = [{"url": "https://example.com", "lat": 91, "long": 0}, {}]
+
+    notes, errors = note_import.notes_from_records(records)
+
+    assert notes == []
+    assert len(errors) == 2
+
+
+@pytest.fixture
+def repo() -> memrepo.MemRepo:
+    repo = memrepo.MemRepo(
+        {
+            "notes": [],
+            "users": [
+                {
+                    "email": "a@a.com",
+                    "username": "username",
+                    "password": "password",
+                    "is_active": True,
+                }
+            ],
+            "sessions": [],
+        }
+    )
+    repo._write_data_to_file = mock.Mock()
+    with mock.patch.object(main, "repository", return_value=repo):
+        yield repo
+
+
+def test_import_command_adds_notes_in_chunks(repo, tmp_path, capsys) -> None:
+    path = tmp_path / "notes.geojson"
+    path.write_text(json.dumps(collection))
+
+    main.main(["import", str(path), "--user", "username", "--chunk-size", "1"])
+
+    notes = repo.list()
+    assert sorted(str(note.url) for note in notes) == [
+        "https://example.com/1",
+        "https://example.com/2",
+    ]
+    assert {note.creator for note in notes} == {"username"}
+    assert repo._write_data_to_file.call_count == 2
+    assert (
+        "imported 2 notes, skipped 1 invalid records"
+        in capsys.readouterr().out
+    )
+
+
+def test_import_command_reads_ndjson(repo, tmp_path) -> None:
+    path = tmp_path / "notes.ndjson"
+    path.write_text("\n".join(json.dumps(f) for f in features))
+
+    main.main(["import", str(path), "--user", "username"])
+
+    assert len(repo.list()) == 2
+    repo._write_data_to_file.assert_called_once()
+
+
+@pytest.mark.parametrize("backend", ["memrepo", "sqlite"])
+def test_import_does_not_overwrite_stored_notes(backend, tmp_path) -> None:
+    if backend == "sqlite":
+        repo = sqliterepo.SQLiteRepo(db_path=tmp_path / "db.sqlite3")
+    else:
+        repo = memrepo.MemRepo({"notes": [], "users": [], "sessions": []})
+        repo._write_data_to_file = mock.Mock()
+    repo.create_user(email="a@a.com", username="username", password="p")
+    stored = n.Note(
+        url="https://example.com/stored", lat=1, long=1, creator="other"
+    )
+    repo.add(stored)
+    path = tmp_path / "notes.ndjson"
+    path.write_text(
+        json.dumps(
+            {
+                "code": str(stored.code),
+                "url": "https://example.com/imported",
+                "lat": 2,
+                "long": 2,
+            }
+        )
+    )
+
+    with mock.patch.object(main, "repository", return_value=repo):
+        result = main.import_notes(str(path), "username")
+
+    assert (result.imported, result.errors) == (1, [])
+    stored_note = repo.get_by_code(code=str(stored.code))
+    assert (str(stored_note.url), stored_note.creator) == (
+        "https://example.com/stored",
+        "other",
+    )
+    imported = repo.list(filters={"creator__eq": "username"})
+    assert [str(note.url) for note in imported] == [
+        "https://example.com/imported"
+    ]
+    assert str(imported[0].code) != str(stored.code)
+
+
+def test_import_command_requires_existing_user(repo, tmp_path) -> None:
+    path = tmp_path / "notes.ndjson"
+    path.write_text("")
+
+    with pytest.raises(ValueError):
+        main.main(["import", str(path), "--user", "nobody"])
@@ -0,0 +1,29 @@
+from unittest import mock
+
+from jaanevis.api.cli import main
+from jaanevis.repository import memrepo
+
+
+def test_sweep_sessions_command_reports_removed_sessions(capsys) -> None:
+    repo = memrepo.MemRepo(
+        {
+            "notes": [],
+            "users": [],
+            "sessions": [
+                {
+                    "session_id": str(expire_time),
+                    "email": "a@a.com",
+                    "username": "username",
+                    "expire_time": expire_time,
+                }
+                for expire_time in (1.0, 2.0, 4102444800.0)
+            ],
+        }
+    )
+    repo._write_data_to_file = mock.Mock()
+
+    with mock.patch.object(main, "repository", return_value=repo):
+        assert main.main(["sweep-sessions"]) == 0
+
+    assert capsys.readouterr().out == "removed 2 expired sessions\n"
+    assert len(repo.data["sessions"]) == 1
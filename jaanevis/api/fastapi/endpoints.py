@@ -1,14 +1,23 @@
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
-
-from fastapi import APIRouter, Cookie, Depends, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from typing import Any, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Cookie,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+)
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 
 from jaanevis.domain import note as n
 from jaanevis.domain import session as s
 from jaanevis.domain import user as u
 from jaanevis.i18n import gettext as _
-from jaanevis.repository import Repository, repository
+from jaanevis.repository import AsyncRepository, async_repository
 from jaanevis.requests import (
     activate_user_request,
     add_note_request,
@@ -18,122 +27,355 @@ from jaanevis.requests import (
     register_request,
 )
 from jaanevis.requests.delete_note_request import DeleteNoteRequest
+from jaanevis.requests.note_batch_request import (
+    AddNotesRequest,
+    DeleteNotesRequest,
+    UpdateNotesRequest,
+)
+from jaanevis.requests.note_cluster_request import NoteClusterRequest
+from jaanevis.requests.note_export_request import NoteExportRequest
+from jaanevis.requests.note_tile_request import NoteTileRequest
 from jaanevis.requests.read_note_request import ReadNoteRequest
 from jaanevis.requests.update_note_request import UpdateNoteRequest
 from jaanevis.requests.update_own_user_request import UpdateOwnUserRequest
+from jaanevis.responses import ResponseFailure, ResponseSuccess, StatusCode
+from jaanevis.serializers import note_export_serializer, note_json_serializer
 from jaanevis.usecases import activate_user as activate_user_uc
 from jaanevis.usecases import add_note, authenticate, delete_note
 from jaanevis.usecases import login as login_uc
 from jaanevis.usecases import logout as logout_uc
-from jaanevis.usecases import note_list, read_note
+from jaanevis.usecases import (
+    note_batch,
+    note_clusters,
+    note_export,
+    note_list,
+    note_tiles,
+    read_note,
+)
 from jaanevis.usecases import register as register_uc
 from jaanevis.usecases import update_note, update_own_user
+from jaanevis.utils import geo, mvt
+from jaanevis.utils.session_cache import session_cache
 
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {
+    media_type: {}
+    for media_type, *_ in note_export_serializer.EXPORT_FORMATS.values()
+}
+
+FAILURE_STATUS_CODES = {
+    ResponseFailure.PARAMETERS_ERROR: 400,
+    ResponseFailure.RESOURCE_ERROR: 404,
+    ResponseFailure.SYSTEM_ERROR: 500,
+}
+
+
+def failure_status_code(response: ResponseFailure) -> int:
+    """http status code of a failed use case response"""
+
+    if response.code == StatusCode.permission_denied:
+        return 403
+    return FAILURE_STATUS_CODES[response.type]
+
 
 async def get_user(session: str = Cookie(default=None)) -> u.UserRead:
-    """dependency function to authenticate user with session"""
+    """dependency function to authenticate user with session
 
-    repo = repository()
+    users of recently authenticated sessions come from the session cache
+    without touching the repository.
+    """
+
+    if session:
+        user = session_cache.get(session)
+        if user is not None:
+            return user
+
+    repo = await async_repository()
 
     auth_usecase = authenticate.AuthenticateUseCase(repo)
     auth_request = authenticate.AuthenticateRequest.build(session=session)
-    auth_res = auth_usecase.execute(auth_request)
+    auth_res = await auth_usecase.execute(auth_request)
 
     if not auth_res:
         raise HTTPException(status_code=401, detail=auth_res.message)
     return auth_res.value
 
 
-async def get_repository() -> Repository:
+async def get_repository() -> AsyncRepository:
     """dependency to get data repository"""
 
-    return repository()
+    return await async_repository()
 
 
-@router.get("/note")
-def read_notes(
+def note_list_filters(
     creator: Optional[str] = None,
     country: Optional[str] = None,
     tag: Optional[str] = None,
+    tag_in: Optional[list[str]] = Query(default=None),
+    tag_all: Optional[list[str]] = Query(default=None),
+    bbox: Optional[str] = Query(
+        default=None, description="min_lon,min_lat,max_lon,max_lat"
+    ),
+    near: Optional[str] = Query(default=None, description="lat,long"),
+    radius_km: Optional[float] = None,
+    k: Optional[int] = Query(
+        default=None, description="number of notes nearest to near"
+    ),
+) -> dict:
+    """dependency to get note list filters from query parameters"""
+
+    filters = {
+        "creator__eq": creator,
+        "country__eq": country,
+        "tag__eq": tag,
+        "tag__in": tag_in,
+        "tag__all": tag_all,
+        "location__within": bbox,
+    }
+    if near is not None:
+        point = near.split(",")
+        if radius_km is not None or k is None:
+            filters["location__radius"] = [*point, radius_km]
+        if k is not None:
+            filters["location__nearest"] = [*point, k]
+    return filters
+
+
+def json_response(content: Any, response: ResponseSuccess) -> Response:
+    """json ready content as a response, skipping response model
+    validation, with the cursor of the next page in X-Next-Cursor"""
+
+    http_response = Response(
+        content=note_json_serializer.dumps(content),
+        media_type="application/json",
+    )
+    next_cursor = response.meta.get("next_cursor")
+    if next_cursor:
+        http_response.headers["X-Next-Cursor"] = next_cursor
+    return http_response
+
+
+@router.get("/note", response_model=list[n.NoteRead])
+async def read_notes(
+    filters: dict = Depends(note_list_filters),
     skip: int = 0,
     limit: int = 100,
-    repo: Repository = Depends(get_repository),
-) -> list[n.NoteRead]:
-    """read notes"""
+    cursor: Optional[str] = None,
+    repo: AsyncRepository = Depends(get_repository),
+) -> Response:
+    """read notes, pass X-Next-Cursor of a page as cursor to read the next"""
 
     note_list_usecase = note_list.NoteListUseCase(repo)
     request_obj = note_list_request.NoteListRequest.from_dict(
         data={
-            "filters": {
-                "creator__eq": creator,
-                "country__eq": country,
-                "tag__eq": tag,
-            },
+            "filters": filters,
             "limit": limit,
             "skip": skip,
+            "cursor": cursor,
         }
     )
-    response = note_list_usecase.execute(request_obj)
+    response = await note_list_usecase.execute(request_obj)
 
-    return response.value
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    return json_response(
+        note_json_serializer.notes_to_read_dicts(response.value), response
+    )
 
 
 @router.get("/note/geojson", response_model=list[n.NoteGeoJsonFeature])
-def read_notes_geojson(
-    creator: Optional[str] = None,
-    country: Optional[str] = None,
-    tag: Optional[str] = None,
+async def read_notes_geojson(
+    filters: dict = Depends(note_list_filters),
     skip: int = 0,
     limit: int = 100,
-    repo: Repository = Depends(get_repository),
-) -> list[n.NoteGeoJsonFeature]:
+    cursor: Optional[str] = None,
+    repo: AsyncRepository = Depends(get_repository),
+) -> Response:
     """read notes as geojson feature objects"""
 
     note_list_usecase = note_list.GeoJsonNoteListUseCase(repo)
     request_obj = note_list_request.NoteListRequest.from_dict(
         data={
-            "filters": {
-                "creator__eq": creator,
-                "country__eq": country,
-                "tag__eq": tag,
-            },
+            "filters": filters,
             "skip": skip,
             "limit": limit,
+            "cursor": cursor,
         }
     )
-    response = note_list_usecase.execute(request_obj)
+    response = await note_list_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    return json_response(response.value, response)
+
+
+@router.get(
+    "/note/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": EXPORT_MEDIA_TYPES}},
+)
+async def export_notes(
+    format: str = Query(
+        default="ndjson", description="ndjson, geojson or csv"
+    ),
+    filters: dict = Depends(note_list_filters),
+    repo: AsyncRepository = Depends(get_repository),
+) -> StreamingResponse:
+    """stream all notes matching filters as a file"""
+
+    note_export_usecase = note_export.NoteExportUseCase(repo)
+    request_obj = NoteExportRequest.from_dict(
+        data={"filters": filters, "format": format}
+    )
+    response = await note_export_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    media_type, extension = note_export_serializer.EXPORT_FORMATS[format][:2]
+    return StreamingResponse(
+        response.value,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="notes.{extension}"'
+        },
+    )
+
+
+@router.get("/note/clusters", response_model=list[n.NoteClusterFeature])
+async def read_note_clusters(
+    zoom: int,
+    bbox: Optional[str] = Query(
+        default=None, description="min_lon,min_lat,max_lon,max_lat"
+    ),
+    repo: AsyncRepository = Depends(get_repository),
+) -> list[n.NoteClusterFeature]:
+    """read notes clustered for a map zoom level as geojson features"""
+
+    note_clusters_usecase = note_clusters.NoteClusterUseCase(repo)
+    request_obj = NoteClusterRequest.build(zoom=zoom, bbox=bbox)
+    response = await note_clusters_usecase.execute(request_obj)
 
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    return response.value
+
+
+@router.get(
+    "/note/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {mvt.MEDIA_TYPE: {}}}},
+)
+async def read_note_tile(
+    z: int, x: int, y: int, repo: AsyncRepository = Depends(get_repository)
+) -> Response:
+    """read notes of a map tile as a mapbox vector tile"""
+
+    note_tiles_usecase = note_tiles.NoteTileUseCase(repo)
+    request_obj = NoteTileRequest.build(zoom=z, x=x, y=y)
+    response = await note_tiles_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    return Response(content=response.value, media_type=mvt.MEDIA_TYPE)
+
+
+def build_notes(notes_in: list[n.NoteCreateApi]) -> list[n.Note]:
+    """notes of a batch, geocoded with one query"""
+
+    countries = geo.get_countries_from_latlongs(
+        [(note_in.lat, note_in.long) for note_in in notes_in]
+    )
+    return [
+        n.Note(**note_in.dict(), country=country or "", geocode=False)
+        for note_in, country in zip(notes_in, countries, strict=True)
+    ]
+
+
+@router.post("/note/batch")
+async def create_notes(
+    notes_in: list[n.NoteCreateApi],
+    user: u.User = Depends(get_user),
+    repo: AsyncRepository = Depends(get_repository),
+) -> list[n.Note]:
+    """add many notes at once"""
+
+    # geocoding blocks, and builds the kd-tree in a cold process
+    notes = await asyncio.to_thread(build_notes, notes_in)
+
+    add_notes_usecase = note_batch.AddNotesUseCase(repo)
+    request_obj = AddNotesRequest.build(notes=notes, user=user)
+    response = await add_notes_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(status_code=400, detail=response.value["message"])
+    return response.value
+
+
+@router.put("/note/batch")
+async def update_notes(
+    notes_in: list[n.NoteBatchUpdateApi],
+    user: u.User = Depends(get_user),
+    repo: AsyncRepository = Depends(get_repository),
+) -> list[n.Note]:
+    """update many notes at once, all or none of them"""
+
+    update_notes_usecase = note_batch.UpdateNotesUseCase(repo)
+    request_obj = UpdateNotesRequest.build(notes=notes_in, user=user)
+    response = await update_notes_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(
+            status_code=failure_status_code(response),
+            detail=response.value["message"],
+        )
+    return response.value
+
+
+@router.delete("/note/batch")
+async def delete_notes(
+    codes: list[str] = Body(),
+    user: u.User = Depends(get_user),
+    repo: AsyncRepository = Depends(get_repository),
+) -> list[n.Note]:
+    """delete many notes by code at once, all or none of them"""
+
+    delete_notes_usecase = note_batch.DeleteNotesUseCase(repo)
+    request_obj = DeleteNotesRequest.build(codes=codes, user=user)
+    response = await delete_notes_usecase.execute(request_obj)
+
+    if not response:
+        raise HTTPException(
+            status_code=failure_status_code(response),
+            detail=response.value["message"],
+        )
     return response.value
 
 
 @router.get("/note/{code}")
-def read_note_by_code(
-    code: str, repo: Repository = Depends(get_repository)
+async def read_note_by_code(
+    code: str, repo: AsyncRepository = Depends(get_repository)
 ) -> n.NoteRead:
     """read note by code"""
 
     read_note_usecase = read_note.ReadNoteUseCase(repo)
     request_obj = ReadNoteRequest(code=code)
-    response = read_note_usecase.execute(request_obj)
+    response = await read_note_usecase.execute(request_obj)
 
     return response.value
 
 
 @router.delete("/note/{code}")
-def delete_note_by_code(
+async def delete_note_by_code(
     code: str,
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
     user: u.User = Depends(get_user),
 ) -> n.Note:
     """delete note by code"""
 
-    repo = repository()
-
     delete_note_usecase = delete_note.DeleteNoteUseCase(repo)
     request_obj = DeleteNoteRequest(code=code, user=user)
-    response = delete_note_usecase.execute(request_obj)
+    response = await delete_note_usecase.execute(request_obj)
 
     if not response:
         raise HTTPException(status_code=403, detail=response.value["message"])
@@ -141,34 +383,35 @@ def delete_note_by_code(
 
 
 @router.post("/note")
-def create_note(
+async def create_note(
     note_in: n.NoteCreateApi,
     user: u.User = Depends(get_user),
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> n.Note:
     """add new note"""
 
-    note = n.Note(**note_in.dict())
+    # a note without a country is reverse geocoded on creation
+    note = await asyncio.to_thread(n.Note, **note_in.dict())
 
     add_note_usecase = add_note.AddNoteUseCase(repo)
     request_obj = add_note_request.AddNoteRequest.build(note=note, user=user)
-    response = add_note_usecase.execute(request_obj)
+    response = await add_note_usecase.execute(request_obj)
 
     return response.value
 
 
 @router.put("/note/{code}")
-def update_note_by_code(
+async def update_note_by_code(
     code: str,
     note_in: n.NoteUpdateApi,
     user: u.User = Depends(get_user),
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> n.Note:
     """update note"""
 
     update_note_usecase = update_note.UpdateNoteUseCase(repo)
     request_obj = UpdateNoteRequest(code=code, note=note_in, user=user)
-    response = update_note_usecase.execute(request_obj)
+    response = await update_note_usecase.execute(request_obj)
 
     if not response:
         raise HTTPException(status_code=403, detail=response.value["message"])
@@ -176,8 +419,9 @@ def update_note_by_code(
 
 
 @router.post("/user/login")
-def login(
-    login_data: s.LoginInputApi, repo: Repository = Depends(get_repository)
+async def login(
+    login_data: s.LoginInputApi,
+    repo: AsyncRepository = Depends(get_repository),
 ) -> None:
     """login user and get session"""
 
@@ -185,7 +429,7 @@ def login(
     request = login_request.LoginRequest.build(
         username=login_data.username, password=login_data.password
     )
-    login_response = login_usecase.execute(request)
+    login_response = await login_usecase.execute(request)
 
     if not login_response:
         return JSONResponse(
@@ -208,15 +452,15 @@ def login(
 
 
 @router.get("/user/logout")
-def logout(
+async def logout(
     session: str = Cookie(default=None),
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> None:
     """user logout"""
 
     logout_usecase = logout_uc.LogoutUseCase(repo)
     request = logout_request.LogoutRequest.build(session=session)
-    logout_response = logout_usecase.execute(request)
+    logout_response = await logout_usecase.execute(request)
 
     if not logout_response:
         return JSONResponse(
@@ -232,9 +476,9 @@ def logout(
 
 
 @router.post("/user/register")
-def register(
+async def register(
     register_data: s.RegisterInputApi,
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> None:
     """user registeration"""
 
@@ -244,7 +488,7 @@ def register(
         username=register_data.username,
         password=register_data.password,
     )
-    response = register_usecase.execute(request)
+    response = await register_usecase.execute(request)
 
     if not response:
         return JSONResponse(
@@ -256,10 +500,10 @@ def register(
 
 
 @router.get("/user/activate", response_class=HTMLResponse)
-def activate(
+async def activate(
     username: str,
     token: str,
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> None:
     """activate user with activation token"""
 
@@ -267,7 +511,7 @@ def activate(
         username=username, token=token
     )
     activate_user_usecase = activate_user_uc.ActivateUserUseCase(repo=repo)
-    response = activate_user_usecase.execute(request)
+    response = await activate_user_usecase.execute(request)
 
     success_html = """
     <html>
@@ -294,17 +538,26 @@ def activate(
 
 
 @router.put("/user/own")
-def update_own_user_api(
+async def update_own_user_api(
     user_in: u.UserUpdateApi,
     user: u.User = Depends(get_user),
-    repo: Repository = Depends(get_repository),
+    repo: AsyncRepository = Depends(get_repository),
 ) -> u.UserRead:
     """update own user"""
 
     update_user_usecase = update_own_user.UpdateOwnUserUseCase(repo)
     request_obj = UpdateOwnUserRequest.build(update_user=user_in, user=user)
-    response = update_user_usecase.execute(request_obj)
+    response = await update_user_usecase.execute(request_obj)
 
     if not response:
         raise HTTPException(status_code=403, detail=response.value["message"])
     return response.value
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    """readiness of the service, 503 until startup warm up is done"""
+
+    checks = {"geocoder": geo.geocoder_ready()}
+    status_code = 200 if all(checks.values()) else 503
+    return JSONResponse(content=checks, status_code=status_code)
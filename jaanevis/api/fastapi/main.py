@@ -3,7 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from jaanevis.config import settings
 from jaanevis.i18n import set_lang_code
-from jaanevis.utils import email_listener, telegram_listener
+from jaanevis.utils import (
+    email_listener,
+    geo,
+    session_listener,
+    session_sweeper,
+    telegram_listener,
+    tile_listener,
+)
 
 from .endpoints import router
 
@@ -16,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -32,3 +40,12 @@ async def set_locale(request: Request, call_next):
 async def startup_event():
     email_listener.setup_email_event_handlers()
     telegram_listener.setup_note_add_event_handlers()
+    tile_listener.setup_tile_cache_event_handlers()
+    session_listener.setup_session_cache_event_handlers()
+    geo.start_geocoder_warm_up()
+    session_sweeper.start_session_sweeper()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    session_sweeper.stop_session_sweeper()
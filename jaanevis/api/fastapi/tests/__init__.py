@@ -0,0 +1,9 @@
+from unittest import mock
+
+
+def usecase_mock() -> mock.MagicMock:
+    """mock of a use case class whose instances execute asynchronously"""
+
+    usecase = mock.MagicMock()
+    usecase.return_value.execute = mock.AsyncMock()
+    return usecase
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from jaanevis import requests as req
 from jaanevis.api.fastapi.main import app
+from jaanevis.api.fastapi.tests import usecase_mock
 from jaanevis.config import settings
 from jaanevis.responses import response as res
 
@@ -14,7 +15,7 @@ client = TestClient(app)
 
 
 @mock.patch("jaanevis.requests.login_request.LoginRequest")
-@mock.patch("jaanevis.usecases.login.LoginUseCase")
+@mock.patch("jaanevis.usecases.login.LoginUseCase", new_callable=usecase_mock)
 def test_login(mock_usecase, request_mock) -> None:
     body = {"username": "username", "password": "password"}
     tomorrow = datetime.now() + timedelta(days=1)
@@ -36,7 +37,7 @@ def test_login(mock_usecase, request_mock) -> None:
 
 
 @mock.patch("jaanevis.requests.login_request.LoginRequest")
-@mock.patch("jaanevis.usecases.login.LoginUseCase")
+@mock.patch("jaanevis.usecases.login.LoginUseCase", new_callable=usecase_mock)
 def test_login_invalid_credentials(mock_usecase, request_mock) -> None:
     body = {"username": "username", "password": "wrong_password"}
     mock_usecase().execute.return_value = (
@@ -56,9 +57,14 @@ def test_login_invalid_credentials(mock_usecase, request_mock) -> None:
     }
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
 @mock.patch("jaanevis.requests.logout_request.LogoutRequest")
-@mock.patch("jaanevis.usecases.logout.LogoutUseCase")
+@mock.patch(
+    "jaanevis.usecases.logout.LogoutUseCase", new_callable=usecase_mock
+)
 def test_logout_with_invalid_session(
     mock_usecase, mock_request, auth_usecase
 ) -> None:
@@ -85,7 +91,9 @@ def test_logout_with_invalid_session(
 
 
 @mock.patch("jaanevis.requests.register_request.RegisterRequest")
-@mock.patch("jaanevis.usecases.register.RegisterUseCase")
+@mock.patch(
+    "jaanevis.usecases.register.RegisterUseCase", new_callable=usecase_mock
+)
 def test_register(mock_usecase, request_mock) -> None:
     body = {"email": "a@a.com", "username": "username", "password": "password"}
     mock_usecase().execute.return_value = res.ResponseSuccess(
@@ -107,7 +115,9 @@ def test_register_with_invalid_email() -> None:
 
 
 @mock.patch("jaanevis.requests.register_request.RegisterRequest")
-@mock.patch("jaanevis.usecases.register.RegisterUseCase")
+@mock.patch(
+    "jaanevis.usecases.register.RegisterUseCase", new_callable=usecase_mock
+)
 def test_register_with_invalid_password(mock_usecase, mock_request) -> None:
     body = {"email": "a@a.com", "username": "username", "password": "1234"}
     invalid_request = req.InvalidRequestObject(
@@ -132,7 +142,10 @@ def test_register_with_invalid_password(mock_usecase, mock_request) -> None:
 
 
 @mock.patch("jaanevis.requests.activate_user_request.ActivateUserRequest")
-@mock.patch("jaanevis.usecases.activate_user.ActivateUserUseCase")
+@mock.patch(
+    "jaanevis.usecases.activate_user.ActivateUserUseCase",
+    new_callable=usecase_mock,
+)
 def test_user_activation(mock_usecase, mock_request) -> None:
     username = "a@a.com"
     activation_token = "token"
@@ -152,7 +165,10 @@ def test_user_activation(mock_usecase, mock_request) -> None:
 
 
 @mock.patch("jaanevis.requests.activate_user_request.ActivateUserRequest")
-@mock.patch("jaanevis.usecases.activate_user.ActivateUserUseCase")
+@mock.patch(
+    "jaanevis.usecases.activate_user.ActivateUserUseCase",
+    new_callable=usecase_mock,
+)
 def test_user_activationi_return_correct_html_on_failure(
     mock_usecase, mock_request
 ) -> None:
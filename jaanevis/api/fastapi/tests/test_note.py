@@ -2,13 +2,25 @@ import uuid
 from datetime import datetime
 from unittest import mock
 
+import pytest
 from fastapi.testclient import TestClient
 from pytz import timezone
 
 from jaanevis.api.fastapi.main import app
+from jaanevis.api.fastapi.tests import usecase_mock
 from jaanevis.config import settings
-from jaanevis.domain.note import Note, NoteCreateApi, NoteRead, NoteUpdateApi
+from jaanevis.domain.geojson import GeoJsonPoint
+from jaanevis.domain.note import (
+    Note,
+    NoteClusterFeature,
+    NoteClusterProperties,
+    NoteCreateApi,
+    NoteRead,
+    NoteUpdateApi,
+)
+from jaanevis.domain.user import User
 from jaanevis.responses import response as res
+from jaanevis.utils import geo, mvt
 
 LAT, LONG = 30.0, 50.0
 COUNTRY = "IR"
@@ -34,9 +46,19 @@ note_complete = Note(
 )
 note_complete_read = NoteRead(**note_complete.to_dict())
 note_list = [note_complete]
+user = User(email="a@a.com", username="default", password="password")
+
+
+@pytest.fixture
+def geocode_cache():
+    geo.clear_geocode_cache()
+    yield
+    geo.clear_geocode_cache()
 
 
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes(mock_usecase) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
 
@@ -50,7 +72,9 @@ def test_read_notes(mock_usecase) -> None:
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_with_creator_filter(mock_usecase, mock_request) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
     creator = "default"
@@ -60,12 +84,16 @@ def test_read_notes_with_creator_filter(mock_usecase, mock_request) -> None:
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "creator__eq": creator,
                 "country__eq": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
     mock_usecase().execute.assert_called()
@@ -74,7 +102,9 @@ def test_read_notes_with_creator_filter(mock_usecase, mock_request) -> None:
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_with_country_filter(mock_usecase, mock_request) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
     country = "IR"
@@ -84,12 +114,16 @@ def test_read_notes_with_country_filter(mock_usecase, mock_request) -> None:
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "country__eq": country,
                 "creator__eq": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
     mock_usecase().execute.assert_called()
@@ -98,7 +132,9 @@ def test_read_notes_with_country_filter(mock_usecase, mock_request) -> None:
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_with_tag_filter(mock_usecase, mock_request) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
     tag = "text"
@@ -108,12 +144,16 @@ def test_read_notes_with_tag_filter(mock_usecase, mock_request) -> None:
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "tag__eq": tag,
+                "tag__in": None,
+                "tag__all": None,
                 "country__eq": None,
                 "creator__eq": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
     mock_usecase().execute.assert_called()
@@ -122,7 +162,9 @@ def test_read_notes_with_tag_filter(mock_usecase, mock_request) -> None:
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_with_limit_skip(mock_usecase, mock_request) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
 
@@ -131,19 +173,25 @@ def test_read_notes_with_limit_skip(mock_usecase, mock_request) -> None:
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
                 "country__eq": None,
                 "creator__eq": None,
             },
             "limit": 10,
             "skip": 5,
+            "cursor": None,
         }
     )
     mock_usecase().execute.assert_called()
     assert response.status_code == 200
 
 
-@mock.patch("jaanevis.usecases.read_note.ReadNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.read_note.ReadNoteUseCase", new_callable=usecase_mock
+)
 def test_read_note_by_code(mock_usecase) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_complete)
 
@@ -156,8 +204,14 @@ def test_read_note_by_code(mock_usecase) -> None:
     mock_usecase().execute.assert_called()
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.delete_note.DeleteNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.delete_note.DeleteNoteUseCase",
+    new_callable=usecase_mock,
+)
 def test_delete_note(mock_usecase, auth_usecase) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_complete)
     session = uuid.uuid4()
@@ -172,8 +226,13 @@ def test_delete_note(mock_usecase, auth_usecase) -> None:
     mock_usecase().execute.assert_called()
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.add_note.AddNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.add_note.AddNoteUseCase", new_callable=usecase_mock
+)
 def test_create_note(mock_usecase, auth_usecase) -> None:
     new_note = note.dict()
     new_note["created"] = datetime.now().isoformat()
@@ -197,8 +256,14 @@ def test_create_note(mock_usecase, auth_usecase) -> None:
     auth_usecase().execute.assert_called()
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.update_note.UpdateNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.update_note.UpdateNoteUseCase",
+    new_callable=usecase_mock,
+)
 def test_update_note(mock_usecase, auth_usecase) -> None:
     new_note = note_complete.to_dict()
     note_update = NoteUpdateApi(
@@ -222,7 +287,9 @@ def test_update_note(mock_usecase, auth_usecase) -> None:
     mock_usecase().execute.assert_called()
 
 
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_geojson_data(mock_usecase) -> None:
     mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
 
@@ -243,7 +310,9 @@ def test_read_notes_geojson_data(mock_usecase) -> None:
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_geojson_data_with_creator_filter(
     mock_usecase, mock_request
 ) -> None:
@@ -266,18 +335,24 @@ def test_read_notes_geojson_data_with_creator_filter(
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "creator__eq": creator,
                 "country__eq": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_geojson_data_with_country_filter(
     mock_usecase, mock_request
 ) -> None:
@@ -299,18 +374,24 @@ def test_read_notes_geojson_data_with_country_filter(
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "country__eq": COUNTRY,
                 "creator__eq": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_geojson_data_with_tag_filter(
     mock_usecase, mock_request
 ) -> None:
@@ -332,18 +413,24 @@ def test_read_notes_geojson_data_with_tag_filter(
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "tag__eq": "text",
+                "tag__in": None,
+                "tag__all": None,
                 "country__eq": None,
                 "creator__eq": None,
             },
             "limit": 100,
             "skip": 0,
+            "cursor": None,
         }
     )
 
 
 @mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
-@mock.patch("jaanevis.usecases.note_list.NoteListUseCase")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
 def test_read_notes_geojson_data_with_limit_skip(
     mock_usecase, mock_request
 ) -> None:
@@ -356,12 +443,16 @@ def test_read_notes_geojson_data_with_limit_skip(
     mock_request.from_dict.assert_called_with(
         data={
             "filters": {
+                "location__within": None,
                 "tag__eq": None,
+                "tag__in": None,
+                "tag__all": None,
                 "country__eq": None,
                 "creator__eq": None,
             },
             "limit": 10,
             "skip": 5,
+            "cursor": None,
         }
     )
 
@@ -384,8 +475,14 @@ def test_delete_note_respose_unauthorized_with_no_cookie() -> None:
     assert response.status_code == 401
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.delete_note.DeleteNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.delete_note.DeleteNoteUseCase",
+    new_callable=usecase_mock,
+)
 def test_delete_note_from_wrong_user(mock_usecase, auth_usecase) -> None:
     mock_usecase().execute.return_value = (
         res.ResponseFailure.build_parameters_error("forbidden")
@@ -401,8 +498,14 @@ def test_delete_note_from_wrong_user(mock_usecase, auth_usecase) -> None:
     assert response.json() == {"detail": "forbidden"}
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.update_note.UpdateNoteUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.update_note.UpdateNoteUseCase",
+    new_callable=usecase_mock,
+)
 def test_update_note_from_wrong_user(mock_usecase, auth_usecase) -> None:
     note_update = NoteUpdateApi(
         url="https://newurl.com",
@@ -423,3 +526,361 @@ def test_update_note_from_wrong_user(mock_usecase, auth_usecase) -> None:
 
     assert response.status_code == 403
     assert result == {"detail": "forbidden"}
+
+
+@mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
+def test_read_notes_with_multi_tag_filters(mock_usecase, mock_request) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
+
+    response = client.get(
+        PREFIX + "/note?tag_in=a&tag_in=b&tag_all=c&tag_all=d"
+    )
+
+    assert response.status_code == 200
+    mock_request.from_dict.assert_called_with(
+        data={
+            "filters": {
+                "location__within": None,
+                "tag__eq": None,
+                "tag__in": ["a", "b"],
+                "tag__all": ["c", "d"],
+                "country__eq": None,
+                "creator__eq": None,
+            },
+            "limit": 100,
+            "skip": 0,
+            "cursor": None,
+        }
+    )
+
+
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
+def test_read_notes_sends_next_cursor_header(mock_usecase) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess(
+        note_list, meta={"next_cursor": "cursor"}
+    )
+
+    response = client.get(PREFIX + "/note?limit=1")
+
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == "cursor"
+
+
+def test_read_notes_geojson_rejects_invalid_cursor() -> None:
+    response = client.get(PREFIX + "/note/geojson?cursor=invalid")
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("cursor")
+
+
+@mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
+@mock.patch(
+    "jaanevis.usecases.note_list.GeoJsonNoteListUseCase",
+    new_callable=usecase_mock,
+)
+def test_read_notes_geojson_with_bbox(mock_usecase, mock_request) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess([])
+
+    response = client.get(PREFIX + "/note/geojson?bbox=49,29,51,31")
+
+    assert response.status_code == 200
+    assert (
+        mock_request.from_dict.call_args.kwargs["data"]["filters"][
+            "location__within"
+        ]
+        == "49,29,51,31"
+    )
+
+
+def test_read_notes_rejects_invalid_bbox() -> None:
+    response = client.get(PREFIX + "/note?bbox=51,29,49,31")
+
+    assert response.status_code == 400
+    assert "location__within" in response.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("near=30,50&radius_km=5", {"location__radius": ["30", "50", 5.0]}),
+        ("near=30,50&k=3", {"location__nearest": ["30", "50", 3]}),
+        (
+            "near=30,50&k=3&radius_km=5",
+            {
+                "location__radius": ["30", "50", 5.0],
+                "location__nearest": ["30", "50", 3],
+            },
+        ),
+    ],
+)
+@mock.patch("jaanevis.requests.note_list_request.NoteListRequest")
+@mock.patch(
+    "jaanevis.usecases.note_list.NoteListUseCase", new_callable=usecase_mock
+)
+def test_read_notes_near_point(
+    mock_usecase, mock_request, query, expected
+) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess([])
+
+    response = client.get(PREFIX + "/note?" + query)
+
+    assert response.status_code == 200
+    filters = mock_request.from_dict.call_args.kwargs["data"]["filters"]
+    assert {k: v for k, v in filters.items() if v is not None} == expected
+
+
+def test_read_notes_near_point_requires_radius_or_k() -> None:
+    response = client.get(PREFIX + "/note?near=30,50")
+
+    assert response.status_code == 400
+
+
+@mock.patch(
+    "jaanevis.usecases.note_clusters.NoteClusterUseCase",
+    new_callable=usecase_mock,
+)
+def test_read_note_clusters(mock_usecase) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess(
+        [
+            NoteClusterFeature(
+                geometry=GeoJsonPoint(coordinates=[LONG, LAT]),
+                properties=NoteClusterProperties(count=2),
+            )
+        ]
+    )
+
+    response = client.get(PREFIX + "/note/clusters?zoom=3&bbox=49,29,51,31")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [LONG, LAT]},
+            "properties": {"count": 2, "code": None},
+        }
+    ]
+
+
+def test_read_note_clusters_rejects_invalid_bbox() -> None:
+    response = client.get(PREFIX + "/note/clusters?zoom=3&bbox=1,2")
+
+    assert response.status_code == 400
+
+
+@mock.patch(
+    "jaanevis.usecases.note_tiles.NoteTileUseCase", new_callable=usecase_mock
+)
+def test_read_note_tile(mock_usecase) -> None:
+    mock_usecase().execute.return_value = res.ResponseSuccess(b"tile")
+
+    response = client.get(PREFIX + "/note/tiles/4/10/6.mvt")
+
+    assert response.status_code == 200
+    assert response.content == b"tile"
+    assert response.headers["content-type"] == mvt.MEDIA_TYPE
+
+
+def test_read_note_tile_rejects_invalid_tile() -> None:
+    response = client.get(PREFIX + "/note/tiles/1/5/0.mvt")
+
+    assert response.status_code == 400
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.note_batch.AddNotesUseCase", new_callable=usecase_mock
+)
+def test_create_notes(mock_usecase, auth_usecase, geocode_cache) -> None:
+    auth_usecase().execute.return_value = res.ResponseSuccess(user)
+    mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
+    session = uuid.uuid4()
+
+    with mock.patch(
+        "reverse_geocode.search",
+        return_value=[{"country_code": "IR"}],
+    ) as search:
+        response = client.post(
+            PREFIX + "/note/batch",
+            json=[note.dict(), note.dict()],
+            headers={"cookie": f"session={session}"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [note_complete.to_dict()]
+    request_obj = mock_usecase().execute.call_args.args[0]
+    assert [str(n.url) for n in request_obj.notes] == [note.url] * 2
+    assert [n.country for n in request_obj.notes] == ["IR"] * 2
+    search.assert_called_once()
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.note_batch.AddNotesUseCase", new_callable=usecase_mock
+)
+def test_create_notes_does_not_geocode_points_again(
+    mock_usecase, auth_usecase, geocode_cache
+) -> None:
+    auth_usecase().execute.return_value = res.ResponseSuccess(user)
+    mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
+    session = uuid.uuid4()
+
+    with mock.patch("reverse_geocode.search", return_value=[]) as search:
+        client.post(
+            PREFIX + "/note/batch",
+            json=[note.dict()],
+            headers={"cookie": f"session={session}"},
+        )
+
+    request_obj = mock_usecase().execute.call_args.args[0]
+    assert [n.country for n in request_obj.notes] == [""]
+    search.assert_called_once()
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+def test_create_notes_rejects_empty_batch(auth_usecase) -> None:
+    session = uuid.uuid4()
+
+    response = client.post(
+        PREFIX + "/note/batch",
+        json=[],
+        headers={"cookie": f"session={session}"},
+    )
+
+    assert response.status_code == 400
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.note_batch.UpdateNotesUseCase",
+    new_callable=usecase_mock,
+)
+def test_update_notes(mock_usecase, auth_usecase) -> None:
+    auth_usecase().execute.return_value = res.ResponseSuccess(user)
+    mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
+    session = uuid.uuid4()
+
+    response = client.put(
+        PREFIX + "/note/batch",
+        json=[{"code": note_complete.code, "text": "some text"}],
+        headers={"cookie": f"session={session}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [note_complete.to_dict()]
+    request_obj = mock_usecase().execute.call_args.args[0]
+    assert request_obj.notes[0].code == note_complete.code
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.note_batch.DeleteNotesUseCase",
+    new_callable=usecase_mock,
+)
+def test_delete_notes(mock_usecase, auth_usecase) -> None:
+    auth_usecase().execute.return_value = res.ResponseSuccess(user)
+    mock_usecase().execute.return_value = res.ResponseSuccess(note_list)
+    session = uuid.uuid4()
+
+    response = client.request(
+        "DELETE",
+        PREFIX + "/note/batch",
+        json=[note_complete.code],
+        headers={"cookie": f"session={session}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [note_complete.to_dict()]
+    request_obj = mock_usecase().execute.call_args.args[0]
+    assert request_obj.codes == [note_complete.code]
+
+
+@pytest.mark.parametrize(
+    "method, usecase, body",
+    [
+        ("PUT", "UpdateNotesUseCase", [{"code": "nope", "text": "text"}]),
+        ("DELETE", "DeleteNotesUseCase", ["nope"]),
+    ],
+)
+@pytest.mark.parametrize(
+    "failure, status_code",
+    [
+        (
+            res.ResponseFailure.build_parameters_error(
+                "permission denied", code=res.StatusCode.permission_denied
+            ),
+            403,
+        ),
+        (res.ResponseFailure.build_parameters_error("duplicate codes"), 400),
+        (res.ResponseFailure.build_resource_error("not found"), 404),
+        (res.ResponseFailure.build_system_error("error"), 500),
+    ],
+)
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+def test_batch_failures_map_to_status_codes(
+    auth_usecase, method, usecase, body, failure, status_code
+) -> None:
+    session = uuid.uuid4()
+
+    with mock.patch(
+        f"jaanevis.usecases.note_batch.{usecase}", new_callable=usecase_mock
+    ) as mock_usecase:
+        mock_usecase().execute.return_value = failure
+        response = client.request(
+            method,
+            PREFIX + "/note/batch",
+            json=body,
+            headers={"cookie": f"session={session}"},
+        )
+
+    assert response.status_code == status_code
+    assert response.json() == {"detail": failure.message}
+
+
+@mock.patch(
+    "jaanevis.usecases.note_export.NoteExportUseCase",
+    new_callable=usecase_mock,
+)
+def test_export_notes(mock_usecase) -> None:
+    async def chunks():
+        yield '{"code": "1"}\n'
+        yield '{"code": "2"}\n'
+
+    mock_usecase().execute.return_value = res.ResponseSuccess(chunks())
+
+    response = client.get(PREFIX + "/note/export?format=ndjson&creator=a")
+
+    assert response.status_code == 200
+    assert response.text == '{"code": "1"}\n{"code": "2"}\n'
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "notes.ndjson" in response.headers["content-disposition"]
+    request_obj = mock_usecase().execute.call_args.args[0]
+    assert request_obj.filters == {"creator__eq": "a"}
+
+
+def test_export_notes_rejects_invalid_format() -> None:
+    response = client.get(PREFIX + "/note/export?format=xml")
+
+    assert response.status_code == 400
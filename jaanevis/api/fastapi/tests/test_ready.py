@@ -0,0 +1,31 @@
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from jaanevis.api.fastapi.main import app
+from jaanevis.config import settings
+
+client = TestClient(app)
+PREFIX = settings.API_V1_STR
+
+
+@mock.patch("jaanevis.utils.geo.geocoder_ready", return_value=False)
+def test_not_ready_before_geocoder_warm_up(geocoder_ready) -> None:
+    response = client.get(PREFIX + "/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"geocoder": False}
+
+
+@mock.patch("jaanevis.utils.geo.geocoder_ready", return_value=True)
+def test_ready_after_geocoder_warm_up(geocoder_ready) -> None:
+    response = client.get(PREFIX + "/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"geocoder": True}
+
+
+@mock.patch("jaanevis.utils.geo.start_geocoder_warm_up")
+def test_startup_warms_up_geocoder(start_geocoder_warm_up) -> None:
+    with TestClient(app):
+        start_geocoder_warm_up.assert_called_once_with()
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+TASK_MODULES = ("jaanevis.tasks.core", "rq", "redis", "emails", "requests")
+
+
+def imported_modules(module: str) -> set[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_app_starts_without_task_stack() -> None:
+    modules = imported_modules("jaanevis.api.fastapi.main")
+
+    assert "jaanevis.api.fastapi.main" in modules
+    assert modules.isdisjoint(TASK_MODULES)
+
+
+def test_cli_starts_without_task_stack_and_geocoder() -> None:
+    modules = imported_modules("jaanevis.api.cli.main")
+
+    assert modules.isdisjoint(TASK_MODULES)
+    assert "reverse_geocode" not in modules
+
+
+def test_entry_points_start_without_numpy() -> None:
+    for module in ("jaanevis.api.fastapi.main", "jaanevis.api.cli.main"):
+        assert "numpy" not in imported_modules(module)
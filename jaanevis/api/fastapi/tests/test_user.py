@@ -1,12 +1,15 @@
+import time
 import uuid
 from unittest import mock
 
 from fastapi.testclient import TestClient
 
 from jaanevis.api.fastapi.main import app
+from jaanevis.api.fastapi.tests import usecase_mock
 from jaanevis.config import settings
 from jaanevis.domain.user import User, UserRead, UserUpdateApi
 from jaanevis.responses import response as res
+from jaanevis.utils.session_cache import session_cache
 
 client = TestClient(app)
 PREFIX = settings.API_V1_STR
@@ -18,8 +21,14 @@ user = User(
 )
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.update_own_user.UpdateOwnUserUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.update_own_user.UpdateOwnUserUseCase",
+    new_callable=usecase_mock,
+)
 def test_update_own_user(mock_usecase, auth_usecase) -> None:
     user_update = UserUpdateApi(username="username")
     updated_user_read = UserRead(username=user_update.username, is_active=True)
@@ -47,8 +56,14 @@ def test_update_own_user_respose_unauthorized_with_no_cookie() -> None:
     assert response.status_code == 401
 
 
-@mock.patch("jaanevis.usecases.authenticate.AuthenticateUseCase")
-@mock.patch("jaanevis.usecases.update_own_user.UpdateOwnUserUseCase")
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.update_own_user.UpdateOwnUserUseCase",
+    new_callable=usecase_mock,
+)
 def test_update_own_user_from_wrong_user(mock_usecase, auth_usecase) -> None:
     user_update = UserUpdateApi(username="username")
     mock_usecase().execute.return_value = (
@@ -65,3 +80,36 @@ def test_update_own_user_from_wrong_user(mock_usecase, auth_usecase) -> None:
 
     assert response.status_code == 403
     assert result == {"detail": "forbidden"}
+
+
+@mock.patch(
+    "jaanevis.usecases.authenticate.AuthenticateUseCase",
+    new_callable=usecase_mock,
+)
+@mock.patch(
+    "jaanevis.usecases.update_own_user.UpdateOwnUserUseCase",
+    new_callable=usecase_mock,
+)
+def test_update_own_user_with_cached_session(
+    mock_usecase, auth_usecase
+) -> None:
+    user_update = UserUpdateApi(username="username")
+    updated_user_read = UserRead(username=user_update.username, is_active=True)
+    mock_usecase().execute.return_value = res.ResponseSuccess(
+        updated_user_read
+    )
+    session = str(uuid.uuid4())
+    session_cache.set(session, user, time.time() + 3600)
+
+    try:
+        response = client.put(
+            PREFIX + "/user/own",
+            json=user_update.dict(),
+            headers={"cookie": f"session={session}"},
+        )
+    finally:
+        session_cache.invalidate_session(session)
+
+    assert response.status_code == 200
+    auth_usecase().execute.assert_not_called()
+    assert mock_usecase().execute.call_args.args[0].user is user
@@ -0,0 +1,60 @@
+"""time location filters of the in-memory repository
+
+    python -m jaanevis.benchmarks.memrepo_filters [notes] [repeats]
+"""
+
+import random
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jaanevis.repository.memrepo import MemRepo
+
+
+def make_note_dicts(count: int) -> list[dict]:
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    rand = random.Random(0)
+    return [
+        {
+            "code": str(uuid.uuid4()),
+            "created": str(start + timedelta(seconds=i)),
+            "creator": "default",
+            "url": f"https://example.com/{i}",
+            "text": "note",
+            "tags": ["note"],
+            "country": "IR",
+            "lat": rand.uniform(25, 40),
+            "long": rand.uniform(44, 63),
+        }
+        for i in range(count)
+    ]
+
+
+def main(count: int = 200_000, repeats: int = 5) -> None:
+    repo = MemRepo({"notes": make_note_dicts(count), "users": []})
+    queries = {
+        "bbox": {"location__within": (50, 30, 52, 32)},
+        "radius": {"location__radius": (35.7, 51.4, 100)},
+        "bbox and tag": {
+            "location__within": (50, 30, 52, 32),
+            "tag__eq": "note",
+        },
+    }
+    # build the indexes before timing
+    repo.list(filters=queries["bbox"], limit=1)
+
+    print(f"{count} notes, first page of 100, best of {repeats}")
+    for name, filters in queries.items():
+        best = min(
+            timeit.repeat(
+                lambda filters=filters: repo.list(filters=filters, limit=100),
+                number=1,
+                repeat=repeats,
+            )
+        )
+        print(f"{name:<15} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
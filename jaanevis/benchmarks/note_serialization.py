@@ -0,0 +1,78 @@
+"""compare serializing note list responses through response models
+with the prebuilt dict path of the list endpoints
+
+    python -m jaanevis.benchmarks.note_serialization [notes] [repeats]
+"""
+
+import asyncio
+import sys
+import timeit
+import uuid
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from jaanevis.domain import note as n
+from jaanevis.serializers import note_geojson_serializer as geo_serializer
+from jaanevis.serializers import note_json_serializer as ser
+
+
+def make_notes(count: int) -> list[n.Note]:
+    return [
+        n.Note(
+            code=str(uuid.uuid4()),
+            creator="default",
+            url=f"https://example.com/{i}",
+            text=f"note #{i % 50} #tag",
+            country="IR",
+            lat=30 + i % 90 / 10,
+            long=50 + i % 180 / 10,
+        )
+        for i in range(count)
+    ]
+
+
+def model_path(type_: Any, convert: Callable = list) -> Callable:
+    """validate against a response model and encode, like fastapi does
+    for endpoints returning models"""
+
+    field = create_response_field(name="response", type_=type_)
+
+    def render(notes: list[n.Note]) -> bytes:
+        content = asyncio.run(
+            serialize_response(field=field, response_content=convert(notes))
+        )
+        return JSONResponse(content).body
+
+    return render
+
+
+def main(count: int = 10_000, repeats: int = 5) -> None:
+    notes = make_notes(count)
+    paths = {
+        "list, response model": model_path(list[n.NoteRead]),
+        "list, prebuilt dicts": lambda notes: ser.dumps(
+            ser.notes_to_read_dicts(notes)
+        ),
+        "geojson, response model": model_path(
+            list[n.NoteGeoJsonFeature],
+            geo_serializer.notes_to_geojson_features,
+        ),
+        "geojson, prebuilt dicts": lambda notes: ser.dumps(
+            geo_serializer.notes_to_geojson(notes)
+        ),
+    }
+    print(f"{count} notes, best of {repeats}")
+    for name, render in paths.items():
+        best = min(
+            timeit.repeat(
+                lambda render=render: render(notes), number=1, repeat=repeats
+            )
+        )
+        print(f"{name:<25} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""import time of the entry points, from python -X importtime
+
+    python -m jaanevis.benchmarks.startup [modules shown] [repeats]
+
+every entry point is imported in a fresh interpreter, the fastest of
+the repeats is reported with the slowest modules it imported.
+"""
+
+import subprocess
+import sys
+
+ENTRY_POINTS = {
+    "api": "jaanevis.api.fastapi.main",
+    "cli": "jaanevis.api.cli.main",
+    "worker": "jaanevis.tasks.core",
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """cumulative import time in microseconds of every imported module"""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(shown: int = 10, repeats: int = 3) -> None:
+    for name, module in ENTRY_POINTS.items():
+        times = min(
+            (import_times(module) for _ in range(repeats)),
+            key=lambda times: times[module],
+        )
+        print(f"{name} ({module}): {times[module] / 1000:.1f} ms")
+        slowest = sorted(
+            (item for item in times.items() if item[0] != module),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for imported, micros in slowest[:shown]:
+            print(f"    {imported:<40} {micros / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
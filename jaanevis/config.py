@@ -1,5 +1,5 @@
 import pathlib
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import AnyHttpUrl, BaseSettings, EmailStr, RedisDsn, validator
 
@@ -16,6 +16,38 @@ class Settings(BaseSettings):
     LANGUAGE_CODE: str = "en"
     TZ: str = "Asia/Tehran"
 
+    REPOSITORY: Literal["memrepo", "sqlite"] = "memrepo"
+    # keep sessions in the repository or in redis at REDIS_DSN
+    SESSION_STORE: Literal["repository", "redis"] = "repository"
+
+    # append mutations to a journal instead of rewriting db.json each time
+    DB_JOURNAL: bool = False
+    DB_JOURNAL_COMPACT_THRESHOLD: int = 1000
+
+    # vector tiles cached per process, changes posted as note events
+    # invalidate them right away, others show up once tiles expire
+    TILE_CACHE_SIZE: int = 1024
+    TILE_CACHE_TTL: int = 300
+    # notes drawn in a tile, tiles below the cluster max zoom draw note
+    # clusters instead so they stay small however many notes they span
+    TILE_MAX_NOTES: int = 1000
+
+    # countries of reverse geocoded points, cached by the point rounded
+    # to a number of decimals, 2 decimals is about a kilometer
+    GEOCODE_CACHE_SIZE: int = 4096
+    GEOCODE_CACHE_PRECISION: int = 2
+
+    # users of sessions cached per process, logins, logouts and user
+    # changes posted as events drop them right away
+    SESSION_CACHE_SIZE: int = 10000
+    SESSION_CACHE_TTL: int = 60
+    # seconds between sweeps of expired sessions and activation tokens
+    # by the api, 0 leaves them to `jaanevis sweep-sessions`
+    SESSION_SWEEP_INTERVAL: int = 3600
+
+    # notes accepted by a single batch request
+    NOTE_BATCH_MAX_SIZE: int = 1000
+
     @validator("CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: str | list[str]) -> list[str] | str:
         if isinstance(v, str) and not v.startswith("["):
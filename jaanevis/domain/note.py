@@ -1,6 +1,6 @@
 import re
 import uuid
-from dataclasses import asdict, field
+from dataclasses import MISSING, Field, InitVar, asdict, field, fields
 from datetime import datetime
 from typing import Any, Optional
 
@@ -12,6 +12,12 @@ from jaanevis.domain.geojson import GeoJsonFeature
 from jaanevis.utils import geo
 
 
+def extract_tags(text: str) -> list[str]:
+    """hashtags used in a note text"""
+
+    return re.findall("#(\\w+)", text)
+
+
 def datetime_with_tz():
     TZ = timezone(settings.TZ)
     return datetime.now(TZ)
@@ -31,11 +37,45 @@ class Note:
     creator_id: Optional[str] = None
     creator: Optional[str] = None
     created: datetime = field(default_factory=datetime_with_tz)
+    # False when the country was already looked up, like for notes
+    # geocoded in bulk, so an empty one is not searched again
+    geocode: InitVar[bool] = True
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Note":
         return cls(**data)
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict[str, Any]) -> "Note":
+        """note from data the repositories stored, without validation
+
+        only for data written by to_dict, api input goes through
+        from_dict. records which do not look like that are validated.
+        """
+
+        created = data.get("created")
+        if isinstance(created, str):
+            try:
+                created = datetime.fromisoformat(created)
+            except ValueError:
+                return cls.from_dict(data)
+        note = cls.__new__(cls)
+        values = note.__dict__
+        for name, default in _NOTE_DEFAULTS.items():
+            if name in data:
+                values[name] = data[name]
+            elif default is MISSING:
+                return cls.from_dict(data)
+            else:
+                values[name] = default()
+        values["tags"] = list(values["tags"])
+        if created is not None:
+            values["created"] = created
+        values["__pydantic_initialised__"] = True
+        # stored notes were geocoded when saved, an empty country stays
+        note.__post_init__(geocode=False)
+        return note
+
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
         data["code"] = str(self.code)
@@ -43,12 +83,24 @@ class Note:
         data["created"] = self.created.isoformat()
         return data
 
-    def __post_init__(self):
-        if not self.country:
+    def __post_init__(self, geocode: bool = True):
+        if geocode and not self.country:
             self.country = geo.get_country_from_latlong(self.lat, self.long)
         if not self.tags and "#" in self.text:
-            r = "#(\\w+)"
-            self.tags = re.findall(r, self.text)
+            self.tags = extract_tags(self.text)
+
+
+def _default_factory(f: Field) -> Any:
+    """factory of a dataclass field default, MISSING if it is required"""
+
+    if f.default_factory is not MISSING:
+        return f.default_factory
+    if f.default is not MISSING:
+        return lambda: f.default
+    return MISSING
+
+
+_NOTE_DEFAULTS = {f.name: _default_factory(f) for f in fields(Note)}
 
 
 class NoteRead(BaseModel):
@@ -87,6 +139,12 @@ class NoteUpdateApi(BaseModel):
     long: Optional[float] = None
 
 
+class NoteBatchUpdateApi(NoteUpdateApi):
+    """schema for updating one of many notes via api"""
+
+    code: str
+
+
 class NoteGeoJsonProperties(BaseModel):
     url: AnyHttpUrl
     creator: str
@@ -97,3 +155,22 @@ class NoteGeoJsonProperties(BaseModel):
 
 class NoteGeoJsonFeature(GeoJsonFeature):
     properties: NoteGeoJsonProperties
+
+
+@dataclasses.dataclass
+class NoteCluster:
+    """notes grouped together at a map zoom level"""
+
+    lat: float
+    long: float
+    count: int
+    code: Optional[str] = None
+
+
+class NoteClusterProperties(BaseModel):
+    count: int
+    code: Optional[str] = None
+
+
+class NoteClusterFeature(GeoJsonFeature):
+    properties: NoteClusterProperties
@@ -1,3 +1,9 @@
+from .asyncrepo import AsyncRepository, async_repository
 from .base import Repository, repository
 
-__all__ = ["repository", "Repository"]
+__all__ = [
+    "repository",
+    "Repository",
+    "async_repository",
+    "AsyncRepository",
+]
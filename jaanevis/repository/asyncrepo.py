@@ -0,0 +1,125 @@
+"""asyncio interface to the data repositories"""
+
+import asyncio
+import functools
+from typing import Any, Callable, Iterable, Optional, Protocol
+
+from jaanevis.domain import note as n
+from jaanevis.domain import session as s
+from jaanevis.domain import user as u
+from jaanevis.repository.base import Repository, repository
+
+
+class AsyncRepository(Protocol):
+    """data repository protocol for asyncio code"""
+
+    async def clusters(
+        self, zoom: int, bbox: Optional[tuple[float, ...]] = None
+    ) -> list[n.NoteCluster]:
+        ...
+
+    async def get_many_by_code(self, codes: Iterable[str]) -> list[n.Note]:
+        ...
+
+    async def add_many(self, notes: list[n.Note]) -> None:
+        ...
+
+    async def update_many(self, updates: dict[str, dict]) -> list[n.Note]:
+        ...
+
+    async def delete_many_by_code(self, codes: list[str]) -> list[n.Note]:
+        ...
+
+    async def list(
+        self,
+        filters: Optional[dict] = None,
+        limit: int = None,
+        skip: int = 0,
+        after: Optional[tuple[float, str]] = None,
+    ) -> list[n.Note]:
+        ...
+
+    async def add(self, note: n.Note) -> None:
+        ...
+
+    async def get_by_code(self, code: str) -> n.Note:
+        ...
+
+    async def delete_by_code(self, code: str) -> n.Note:
+        ...
+
+    async def update(self, obj: n.Note, data: dict) -> n.Note:
+        ...
+
+    async def get_user_by_username(self, username: str) -> u.User:
+        ...
+
+    async def get_user_by_email(self, email: str) -> u.User:
+        ...
+
+    async def create_user(self, username: str, password: str) -> u.User:
+        ...
+
+    async def update_user(self, obj: u.User, data: str) -> u.User:
+        ...
+
+    async def delete_user(self, username: str) -> bool:
+        ...
+
+    async def get_session_by_session_id(self, session_id: str) -> s.Session:
+        ...
+
+    async def get_session_by_session_id_and_email(
+        self, session_id: str, email: str
+    ) -> s.Session:
+        ...
+
+    async def get_session_by_session_id_and_username(
+        self, session_id: str, username: str
+    ) -> s.Session:
+        ...
+
+    async def delete_session_by_session_id(self, session_id: str) -> bool:
+        ...
+
+    async def delete_expired_sessions(self, now: float) -> int:
+        ...
+
+    async def create_session(
+        self, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        ...
+
+    async def create_or_update_session(
+        self, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        ...
+
+    async def refresh(self) -> None:
+        ...
+
+
+class AsyncRepo:
+    """run the methods of a repository in worker threads
+
+    repositories block on disk (and MemRepo on its lock), so every call
+    is offloaded and the event loop stays free for other requests.
+    """
+
+    def __init__(self, repo: Repository) -> None:
+        self.repo = repo
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.repo, name)
+
+        @functools.wraps(method)
+        async def offloaded(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return offloaded
+
+
+async def async_repository() -> AsyncRepository:
+    """shared repository for asyncio code, refreshed in a worker thread"""
+
+    return AsyncRepo(await asyncio.to_thread(repository))
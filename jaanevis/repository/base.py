@@ -1,16 +1,41 @@
-from typing import Optional, Protocol
+import threading
+from typing import Any, Iterable, Optional, Protocol
 
+from jaanevis.config import settings
 from jaanevis.domain import note as n
 from jaanevis.domain import session as s
 from jaanevis.domain import user as u
 from jaanevis.repository import memrepo as mr
+from jaanevis.repository import redissessions as rs
+from jaanevis.repository import sqliterepo as sr
 
 
 class Repository(Protocol):
     """base data repository protocol"""
 
+    def clusters(
+        self, zoom: int, bbox: Optional[tuple[float, ...]] = None
+    ) -> list[n.NoteCluster]:
+        ...
+
+    def get_many_by_code(self, codes: Iterable[str]) -> list[n.Note]:
+        ...
+
+    def add_many(self, notes: list[n.Note]) -> None:
+        ...
+
+    def update_many(self, updates: dict[str, dict]) -> list[n.Note]:
+        ...
+
+    def delete_many_by_code(self, codes: list[str]) -> list[n.Note]:
+        ...
+
     def list(
-        self, filters: Optional[dict] = None, limit: int = None, skip: int = 0
+        self,
+        filters: Optional[dict] = None,
+        limit: int = None,
+        skip: int = 0,
+        after: Optional[tuple[float, str]] = None,
     ) -> list[n.Note]:
         ...
 
@@ -57,6 +82,9 @@ class Repository(Protocol):
     def delete_session_by_session_id(self, session_id: str) -> bool:
         ...
 
+    def delete_expired_sessions(self, now: float) -> int:
+        ...
+
     def create_session(
         self, username: str, session_id: str, expire_time: float
     ) -> s.Session:
@@ -67,5 +95,43 @@ class Repository(Protocol):
     ) -> s.Session:
         ...
 
+    def refresh(self) -> None:
+        ...
+
+
+class SessionStoreRepo:
+    """repository with its sessions kept in a separate session store"""
+
+    def __init__(self, repo: Repository, sessions: Any) -> None:
+        self.repo = repo
+        self.sessions = sessions
+
+    def __getattr__(self, name: str) -> Any:
+        if name in rs.SESSION_METHODS:
+            return getattr(self.sessions, name)
+        return getattr(self.repo, name)
+
+
+def _repository_class() -> type[Repository]:
+    if settings.REPOSITORY == "sqlite":
+        return sr.SQLiteRepo
+    return mr.MemRepo
+
+
+_shared_repository: Optional[Repository] = None
+_shared_repository_lock = threading.Lock()
+
+
+def repository() -> Repository:
+    """process-wide data repository, reloaded only when changed on disk"""
 
-repository: Repository = mr.MemRepo
+    global _shared_repository
+    if _shared_repository is None:
+        with _shared_repository_lock:
+            if _shared_repository is None:
+                repo = _repository_class()()
+                if settings.SESSION_STORE == "redis":
+                    repo = SessionStoreRepo(repo, rs.redis_session_store())
+                _shared_repository = repo
+    _shared_repository.refresh()
+    return _shared_repository
@@ -1,12 +1,364 @@
+import bisect
+import fcntl
+import itertools
 import json
+import math
 import os
 import pathlib
-from typing import Optional
+import threading
+from datetime import datetime
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Optional
 
 from jaanevis.config import settings
 from jaanevis.domain import note as n
 from jaanevis.domain import session as s
 from jaanevis.domain import user as u
+from jaanevis.utils import geo
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# fields with a hash index for point lookups, per kind of stored item
+INDEXED_FIELDS = {
+    "notes": ("code",),
+    "users": ("username", "email"),
+    "sessions": ("session_id",),
+}
+
+# filter key -> predicate on a stored note, tag and location filters are
+# masks over the note columns
+NOTE_FILTERS = {
+    "code__eq": lambda note, value: note["code"] == value,
+    "creator__eq": lambda note, value: str(note.get("creator")) == value,
+    "country__eq": lambda note, value: str(note.get("country")) == value,
+    "url__eq": lambda note, value: note["url"] == value,
+    "lat__eq": lambda note, value: note["lat"] == value,
+    "long__eq": lambda note, value: note["long"] == value,
+}
+
+# size in degrees of the grid cells notes are bucketed in by location
+GRID_CELL_DEGREES = 1.0
+# first radius searched for nearest notes, doubled until k notes are found
+NEAREST_START_KM = 10.0
+
+
+def cells_in_range(
+    cells: dict[tuple[int, int], Any],
+    min_cell: tuple[int, int],
+    max_cell: tuple[int, int],
+) -> list[tuple[int, int]]:
+    """keys of grid cells between two corner cells
+
+    walks the occupied cells instead of the range when that is shorter.
+    """
+
+    (min_x, min_y), (max_x, max_y) = min_cell, max_cell
+    if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+        return [
+            (x, y)
+            for x, y in cells
+            if min_x <= x <= max_x and min_y <= y <= max_y
+        ]
+    return [
+        (x, y)
+        for x in range(min_x, max_x + 1)
+        for y in range(min_y, max_y + 1)
+        if (x, y) in cells
+    ]
+
+
+class NoteIndex:
+    """secondary indexes over stored notes
+
+    keeps a tag -> note code posting index, a grid of note codes by
+    location and the notes ordered by creation time, so listing pages
+    does not need to sort or scan every note.
+    """
+
+    # note fields the indexes depend on
+    fields = ("tags", "text", "created", "lat", "long")
+
+    def __init__(self, notes: list[dict]) -> None:
+        self.tags: dict[str, set[str]] = {}
+        self.cells: dict[tuple[int, int], set[str]] = {}
+        self._normalize(notes)
+        for note in notes:
+            self._add_postings(note)
+        self.timeline = sorted(self.key(note) for note in notes)
+
+    @staticmethod
+    def key(note: dict[str, Any]) -> tuple[float, str]:
+        created = note["created"]
+        if not isinstance(created, datetime):
+            created = datetime.fromisoformat(created)
+        return created.timestamp(), note["code"]
+
+    @staticmethod
+    def _normalize(notes: list[dict]) -> None:
+        """fill derived fields like the Note model would on loading,
+        geocoding notes missing a country with a single query"""
+
+        missing = [note for note in notes if not note.get("country")]
+        countries = geo.get_countries_from_latlongs(
+            [(note["lat"], note["long"]) for note in missing]
+        )
+        for note, country in zip(missing, countries, strict=True):
+            note["country"] = country
+        for note in notes:
+            if not note.get("tags"):
+                note["tags"] = n.extract_tags(note.get("text", ""))
+
+    @staticmethod
+    def cell(lat: float, long: float) -> tuple[int, int]:
+        return (
+            math.floor(long / GRID_CELL_DEGREES),
+            math.floor(lat / GRID_CELL_DEGREES),
+        )
+
+    def _add_postings(self, note: dict[str, Any]) -> None:
+        for tag in note["tags"]:
+            self.tags.setdefault(tag, set()).add(note["code"])
+        cell = self.cell(note["lat"], note["long"])
+        self.cells.setdefault(cell, set()).add(note["code"])
+
+    @staticmethod
+    def _discard(postings: dict, key: Any, code: str) -> None:
+        posting = postings.get(key, set())
+        posting.discard(code)
+        if not posting:
+            postings.pop(key, None)
+
+    def add(self, note: dict[str, Any]) -> None:
+        self._normalize([note])
+        self._add_postings(note)
+        bisect.insort(self.timeline, self.key(note))
+
+    def remove(self, note: dict[str, Any]) -> None:
+        for tag in note["tags"]:
+            self._discard(self.tags, tag, note["code"])
+        cell = self.cell(note["lat"], note["long"])
+        self._discard(self.cells, cell, note["code"])
+        key = self.key(note)
+        position = bisect.bisect_left(self.timeline, key)
+        if position < len(self.timeline) and self.timeline[position] == key:
+            del self.timeline[position]
+
+    def within(self, bbox: geo.BBox) -> set[str]:
+        """codes of notes in grid cells overlapping the bounding box"""
+
+        min_lon, min_lat, max_lon, max_lat = bbox
+        cells = cells_in_range(
+            self.cells,
+            self.cell(min_lat, min_lon),
+            self.cell(max_lat, max_lon),
+        )
+        return set().union(*(self.cells[cell] for cell in cells))
+
+    def _count_before(self, before: Optional[tuple[float, str]]) -> int:
+        if before is None:
+            return len(self.timeline)
+        return bisect.bisect_left(self.timeline, before)
+
+    def newest_first(
+        self,
+        skip: int = 0,
+        end: int = None,
+        before: Optional[tuple[float, str]] = None,
+    ) -> list[str]:
+        """codes of a page of notes older than before, newest first"""
+
+        count = self._count_before(before)
+        stop = max(count - skip, 0)
+        start = 0 if end is None else max(count - end, 0)
+        return [code for _, code in reversed(self.timeline[start:stop])]
+
+    def iter_newest_first(
+        self, before: Optional[tuple[float, str]] = None
+    ) -> Iterator[str]:
+        count = self._count_before(before)
+        return (self.timeline[i][1] for i in range(count - 1, -1, -1))
+
+
+class NoteClusters:
+    """note count and summed position of every cluster cell per zoom
+
+    adding or removing a note updates one cell on each zoom level.
+    """
+
+    fields = ("lat", "long")
+
+    def __init__(self, notes: list[dict]) -> None:
+        self.levels: list[dict[tuple[int, int], list]] = [
+            {} for _ in range(geo.CLUSTER_MAX_ZOOM + 1)
+        ]
+        for note in notes:
+            self.add(note)
+
+    def add(self, note: dict[str, Any]) -> None:
+        for zoom, cells in enumerate(self.levels):
+            cell = geo.cluster_cell(zoom, note["lat"], note["long"])
+            cluster = cells.setdefault(cell, [0, 0.0, 0.0])
+            cluster[0] += 1
+            cluster[1] += note["lat"]
+            cluster[2] += note["long"]
+
+    def remove(self, note: dict[str, Any]) -> None:
+        for zoom, cells in enumerate(self.levels):
+            cell = geo.cluster_cell(zoom, note["lat"], note["long"])
+            cluster = cells.get(cell)
+            if cluster is None:
+                continue
+            cluster[0] -= 1
+            cluster[1] -= note["lat"]
+            cluster[2] -= note["long"]
+            if not cluster[0]:
+                del cells[cell]
+
+    def query(
+        self, zoom: int, bbox: Optional[geo.BBox] = None
+    ) -> list[tuple[tuple[int, int], int, float, float]]:
+        """(cell, count, mean lat, mean long) of clusters in the box"""
+
+        cells = self.levels[zoom]
+        if bbox is None:
+            found = list(cells)
+        else:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            found = cells_in_range(
+                cells,
+                geo.cluster_cell(zoom, min_lat, min_lon),
+                geo.cluster_cell(zoom, max_lat, max_lon),
+            )
+        return [
+            (cell, count, sum_lat / count, sum_long / count)
+            for cell, (count, sum_lat, sum_long) in (
+                (cell, cells[cell]) for cell in found
+            )
+        ]
+
+
+class NoteColumns:
+    """note positions and creation times in numpy arrays
+
+    rows sit next to the stored notes so location and time filters run
+    as vectorized masks over every note instead of loops over dicts. a
+    removed row is filled with the last one to keep the arrays dense.
+    numpy is only imported once the columns are built, so processes
+    that never filter by location do not load it.
+    """
+
+    fields = ("lat", "long", "created")
+
+    def __init__(self, notes: list[dict]) -> None:
+        self.rows: dict[str, int] = {}
+        self.size = 0
+        self._allocate(max(len(notes), 16))
+        for note in notes:
+            self.add(note)
+
+    def _allocate(self, capacity: int) -> None:
+        import numpy as np
+
+        size = self.size
+        codes = np.empty(capacity, dtype=object)
+        lats, longs, created = (np.zeros(capacity) for _ in range(3))
+        if size:
+            codes[:size] = self.codes[:size]
+            lats[:size] = self.lats[:size]
+            longs[:size] = self.longs[:size]
+            created[:size] = self.created[:size]
+        self.codes, self.lats, self.longs = codes, lats, longs
+        self.created = created
+
+    def add(self, note: dict[str, Any]) -> None:
+        row = self.rows.get(note["code"])
+        if row is None:
+            if self.size == len(self.codes):
+                self._allocate(2 * self.size)
+            row = self.size
+            self.size += 1
+            self.rows[note["code"]] = row
+            self.codes[row] = note["code"]
+        self.lats[row] = note["lat"]
+        self.longs[row] = note["long"]
+        self.created[row] = NoteIndex.key(note)[0]
+
+    def remove(self, note: dict[str, Any]) -> None:
+        row = self.rows.pop(note["code"], None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            code = self.codes[last]
+            self.codes[row] = code
+            self.lats[row] = self.lats[last]
+            self.longs[row] = self.longs[last]
+            self.created[row] = self.created[last]
+            self.rows[code] = row
+        self.codes[last] = None
+        self.size = last
+
+    def within(self, bbox: geo.BBox) -> "np.ndarray":
+        min_lon, min_lat, max_lon, max_lat = bbox
+        lats, longs = self.lats[: self.size], self.longs[: self.size]
+        return (
+            (longs >= min_lon)
+            & (longs <= max_lon)
+            & (lats >= min_lat)
+            & (lats <= max_lat)
+        )
+
+    def radius(
+        self, lat: float, long: float, radius_km: float
+    ) -> "np.ndarray":
+        """mask of notes within radius_km of a point
+
+        distances are only computed for notes in the bounding box.
+        """
+
+        import numpy as np
+
+        mask = self.within(geo.bbox_around(lat, long, radius_km))
+        rows = np.flatnonzero(mask)
+        distances = geo.haversine_km_array(
+            lat, long, self.lats[rows], self.longs[rows]
+        )
+        mask[rows] = distances <= radius_km
+        return mask
+
+    def before(self, key: tuple[float, str]) -> "np.ndarray":
+        """mask of notes ordered before a (timestamp, code) key"""
+
+        timestamp, code = key
+        created = self.created[: self.size]
+        return (created < timestamp) | (
+            (created == timestamp) & (self.codes[: self.size] < code)
+        )
+
+    def newest_first(self, masks: list["np.ndarray"]) -> list[str]:
+        """codes of the notes in all masks, newest first"""
+
+        import numpy as np
+
+        rows = np.flatnonzero(np.logical_and.reduce(masks))
+        order = np.lexsort((self.codes[rows], self.created[rows]))
+        return self.codes[rows[order[::-1]]].tolist()
+
+
+# filters answered from the note columns
+LOCATION_FILTERS = ("location__within", "location__radius")
+
+# derived note indexes by name, built on first use and kept up to date
+NOTE_INDEXES = {
+    None: NoteIndex,
+    "clusters": NoteClusters,
+    "columns": NoteColumns,
+}
+NOTE_INDEX_FIELDS = {
+    *NoteIndex.fields,
+    *NoteClusters.fields,
+    *NoteColumns.fields,
+}
 
 
 class MemRepo:
@@ -14,12 +366,125 @@ class MemRepo:
         base_data_path = settings.DATA_BASE_DIR / "data"
         os.makedirs(base_data_path, exist_ok=True)
         self.db_path = base_data_path / "db.json"
+        self.journal_path = base_data_path / "db.journal"
+        self.journal = settings.DB_JOURNAL
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._compacting = False
+        self._indexes = {}
         if data is not None:
             self.data = data
         else:
-            self.data = self._read_data_from_file()
+            self._load()
+
+    @property
+    def data(self) -> dict[str, list[dict]]:
+        return self._data
+
+    @data.setter
+    def data(self, data: dict[str, list[dict]]) -> None:
+        self._data = data
+        self._indexes = {}
+
+    def _index(self, kind: str, field: str) -> dict[str, dict]:
+        """hash index of stored items by field, built on first use"""
+
+        index = self._indexes.get((kind, field))
+        if index is None:
+            with self._lock:
+                index = self._indexes.get((kind, field))
+                if index is None:
+                    # the first stored item wins, like a linear scan would
+                    items = reversed(self.data[kind])
+                    index = {item[field]: item for item in items}
+                    self._indexes[kind, field] = index
+        return index
+
+    def _get(self, kind: str, field: str, value: str) -> Optional[dict]:
+        return self._index(kind, field).get(value)
+
+    def _note_index(self, name: Optional[str] = None) -> Any:
+        """derived note index, built on first use"""
+
+        index = self._indexes.get(("notes", name))
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(("notes", name))
+                if index is None:
+                    index = NOTE_INDEXES[name](self.data["notes"])
+                    self._indexes["notes", name] = index
+        return index
+
+    def _changed_note_indexes(
+        self, kind: str, fields: Optional[tuple]
+    ) -> list[Any]:
+        """built derived note indexes depending on the changed fields"""
+
+        if kind != "notes":
+            return []
+        indexes = []
+        for name, index_class in NOTE_INDEXES.items():
+            index = self._indexes.get(("notes", name))
+            if index is None:
+                continue
+            if fields is None or any(f in index_class.fields for f in fields):
+                indexes.append(index)
+        return indexes
+
+    def _index_item(
+        self, kind: str, item: dict[str, Any], fields: tuple = None
+    ) -> None:
+        for field in INDEXED_FIELDS[kind]:
+            if fields is None or field in fields:
+                self._index(kind, field).setdefault(item[field], item)
+        for index in self._changed_note_indexes(kind, fields):
+            index.add(item)
+
+    def _unindex_item(
+        self, kind: str, item: dict[str, Any], fields: tuple = None
+    ) -> None:
+        for index in self._changed_note_indexes(kind, fields):
+            index.remove(item)
+        for field in INDEXED_FIELDS[kind]:
+            if fields is not None and field not in fields:
+                continue
+            index = self._index(kind, field)
+            if index.get(item[field]) is not item:
+                continue
+            del index[item[field]]
+            for other in self.data[kind]:
+                if other is not item and other[field] == item[field]:
+                    index[item[field]] = other
+                    break
+
+    def _file_stamp(self) -> Optional[tuple[int, int]]:
+        """modification time and size of the db file, None if missing"""
+
+        try:
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _journal_size(self) -> int:
+        try:
+            return os.stat(self.journal_path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def _load(self) -> None:
+        """load the snapshot and replay the journal written after it"""
+
+        self.data = self._read_data_from_file()
+        self._journal_offset = 0
+        self._journal_records = 0
+        if self.journal:
+            self._replay_journal()
 
     def _read_data_from_file(self) -> Optional[list[dict]]:
+        self._stamp = self._file_stamp()
         if not pathlib.Path(self.db_path).is_file():
             return {"notes": [], "users": [], "sessions": []}
 
@@ -30,89 +495,325 @@ class MemRepo:
     def _write_data_to_file(self) -> None:
         with open(self.db_path, "w") as db:
             db.write(json.dumps(self.data))
+        self._stamp = self._file_stamp()
 
-    def list(
-        self, filters: dict = None, limit: int = None, skip: int = 0
-    ) -> list[n.Note]:
-        result = [n.Note.from_dict(d) for d in self.data["notes"]]
+    def _replay_journal(self) -> None:
+        """apply journal records appended since the last replay"""
 
-        if filters is None:
-            sorted_notes = sorted(result, key=lambda n: n.created)[::-1]
-            if limit:
-                return sorted_notes[skip : limit + skip]
-            return sorted_notes[skip:]
+        if self._journal_size() <= self._journal_offset:
+            return
+        with open(self.journal_path, "rb") as journal:
+            journal.seek(self._journal_offset)
+            for line in journal:
+                # a record still being appended by another process
+                if not line.endswith(b"\n"):
+                    break
+                self._apply(json.loads(line))
+                self._journal_offset += len(line)
+                self._journal_records += 1
 
-        if "code__eq" in filters:
-            result = [r for r in result if str(r.code) == filters["code__eq"]]
+    def _append_to_journal(self, record: dict[str, Any]) -> None:
+        line = (json.dumps(record) + "\n").encode()
+        with open(self.journal_path, "ab") as journal:
+            journal.write(line)
+        self._journal_offset += len(line)
+        self._journal_records += 1
 
-        if "creator__eq" in filters:
-            result = [
-                r for r in result if str(r.creator) == filters["creator__eq"]
-            ]
+    def _catch_up(self) -> None:
+        """apply what other processes wrote, under the journal lock
 
-        if "country__eq" in filters:
-            result = [
-                r for r in result if str(r.country) == filters["country__eq"]
-            ]
+        another process may have compacted since, replacing the snapshot
+        and truncating the journal under our offset, so reload then.
+        """
+
+        if (
+            self._file_stamp() != self._stamp
+            or self._journal_size() < self._journal_offset
+        ):
+            self._load()
+        else:
+            self._replay_journal()
 
-        if "url__eq" in filters:
-            result = [r for r in result if r.url == filters["url__eq"]]
+    def _lock_journal(self) -> IO:
+        """open the journal with an exclusive lock shared by all processes"""
 
+        journal = open(self.journal_path, "ab")
+        fcntl.flock(journal, fcntl.LOCK_EX)
+        return journal
+
+    def _commit(self, record: dict[str, Any]) -> None:
+        """apply a mutation record and persist it"""
+
+        if not self.journal:
+            with self._lock:
+                self._apply(record)
+                self._write_data_to_file()
+            return
+
+        with self._lock_journal(), self._lock:
+            self._catch_up()
+            self._apply(record)
+            self._append_to_journal(record)
+        if self._journal_records >= settings.DB_JOURNAL_COMPACT_THRESHOLD:
+            self._start_compaction()
+
+    def _start_compaction(self) -> None:
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+        threading.Thread(target=self.compact, daemon=True).start()
+
+    def compact(self) -> None:
+        """write a new snapshot and truncate the journal"""
+
+        try:
+            with self._lock_journal() as journal:
+                with self._lock:
+                    self._catch_up()
+                    snapshot = json.dumps(self.data)
+                tmp_path = pathlib.Path(f"{self.db_path}.tmp")
+                with open(tmp_path, "w") as db:
+                    db.write(snapshot)
+                    db.flush()
+                    os.fsync(db.fileno())
+                os.replace(tmp_path, self.db_path)
+                journal.truncate(0)
+                with self._lock:
+                    self._stamp = self._file_stamp()
+                    self._journal_offset = 0
+                    self._journal_records = 0
+        finally:
+            self._compacting = False
+
+    def refresh(self) -> None:
+        """reload data if the db file was changed by another process
+
+        a refresh between another process replacing the snapshot and
+        truncating the journal leaves our offset past the new journal end,
+        which _catch_up reloads from.
+        """
+
+        if self._file_stamp() != self._stamp or (
+            self.journal and self._journal_size() != self._journal_offset
+        ):
+            with self._lock:
+                self._catch_up()
+
+    def clusters(
+        self, zoom: int, bbox: Optional[geo.BBox] = None
+    ) -> list[n.NoteCluster]:
+        zoom = min(zoom, geo.CLUSTER_MAX_ZOOM)
+        with self._lock:
+            found = self._note_index("clusters").query(zoom, bbox)
+            clusters = []
+            for cell, count, lat, long in found:
+                if count > 1:
+                    clusters.append(n.NoteCluster(lat, long, count))
+                    continue
+                note = self._note_in_cluster(zoom, cell)
+                # the cluster index and the notes disagree, leave it out
+                # rather than failing the whole tile
+                if note is None:
+                    continue
+                clusters.append(
+                    n.NoteCluster(note["lat"], note["long"], 1, note["code"])
+                )
+        return clusters
+
+    def _note_in_cluster(
+        self, zoom: int, cell: tuple[int, int]
+    ) -> Optional[dict]:
+        codes = self._note_index().within(geo.cluster_cell_bbox(zoom, cell))
+        for code in codes:
+            note = self._get("notes", "code", code)
+            if geo.cluster_cell(zoom, note["lat"], note["long"]) == cell:
+                return note
+        return None
+
+    def _candidate_codes(self, filters: dict) -> Optional[set[str]]:
+        """codes of notes matching the code and tag filters, None if
+        there are none"""
+
+        postings = self._note_index().tags
+        codes = None
+        if "code__eq" in filters:
+            codes = {filters["code__eq"]}
         if "tag__eq" in filters:
-            result = [r for r in result if filters["tag__eq"] in r.tags]
+            posting = postings.get(filters["tag__eq"], set())
+            codes = posting if codes is None else codes & posting
+        if "tag__in" in filters:
+            union = set().union(
+                *(postings.get(tag, ()) for tag in filters["tag__in"])
+            )
+            codes = union if codes is None else codes & union
+        for tag in filters.get("tag__all", ()):
+            posting = postings.get(tag, set())
+            codes = posting if codes is None else codes & posting
+        return codes
+
+    def _candidate_notes(
+        self, filters: dict, after: Optional[tuple[float, str]] = None
+    ) -> Optional[list[dict]]:
+        """candidates for the code, tag and location filters, newest
+        first, None if there are none
+
+        code and tag filters are answered from the hash index and from
+        the tag postings by union (tag__in) and intersection (tag__eq,
+        tag__all) of note codes, which are few enough to sort directly.
+        location filters and the after cursor are masks over the note
+        columns, and the masked rows are sorted by creation time in one
+        go, so only location filters build the columns.
+        """
+
+        codes = self._candidate_codes(filters)
+        if not any(key in filters for key in LOCATION_FILTERS):
+            if codes is None:
+                return None
+            notes = (self._get("notes", "code", code) for code in codes)
+            found = sorted(
+                (note for note in notes if note is not None),
+                key=NoteIndex.key,
+                reverse=True,
+            )
+            if after is None:
+                return found
+            return [note for note in found if NoteIndex.key(note) < after]
+
+        columns = self._note_index("columns")
+        masks = []
+        if "location__within" in filters:
+            masks.append(columns.within(filters["location__within"]))
+        if "location__radius" in filters:
+            masks.append(columns.radius(*filters["location__radius"]))
+        if after is not None:
+            masks.append(columns.before(after))
+        found = columns.newest_first(masks)
+        if codes is not None:
+            found = (code for code in found if code in codes)
+        notes = (self._get("notes", "code", code) for code in found)
+        return [note for note in notes if note is not None]
+
+    def _matching_notes(
+        self, filters: dict, after: Optional[tuple[float, str]] = None
+    ) -> Iterator[dict]:
+        """stored notes matching the filters, newest first"""
+
+        predicates = [
+            (NOTE_FILTERS[key], value)
+            for key, value in filters.items()
+            if key in NOTE_FILTERS
+        ]
+        notes = self._candidate_notes(filters, after)
+        if notes is None:
+            codes = self._note_index().iter_newest_first(after)
+            notes = (self._get("notes", "code", code) for code in codes)
+        return (
+            note
+            for note in notes
+            if all(match(note, value) for match, value in predicates)
+        )
 
-        if "lat__eq" in filters:
-            result = [r for r in result if r.lat == filters["lat__eq"]]
+    def _nearest_notes(self, filters: dict) -> list[dict]:
+        """k nearest notes matching the other filters, nearest first
 
-        if "long__eq" in filters:
-            result = [r for r in result if r.long == filters["long__eq"]]
+        searches circles of growing radius on the location grid until
+        k notes are found, so only notes around the point are checked.
+        """
 
-        sorted_notes = sorted(result, key=lambda n: n.created)[::-1]
-        if limit:
-            return sorted_notes[skip : limit + skip]
-        return sorted_notes[skip:]
+        lat, long, k = filters["location__nearest"]
+        max_radius = geo.MAX_DISTANCE_KM
+        if "location__radius" in filters:
+            max_radius = filters["location__radius"][2]
+        radius = min(NEAREST_START_KM, max_radius)
+        while True:
+            circle = {**filters, "location__radius": (lat, long, radius)}
+            notes = [*self._matching_notes(circle)]
+            if len(notes) >= k or radius >= max_radius:
+                break
+            radius = min(radius * 2, max_radius)
+        notes.sort(
+            key=lambda note: geo.haversine_km(
+                lat, long, note["lat"], note["long"]
+            )
+        )
+        return notes[:k]
+
+    def get_many_by_code(self, codes: Iterable[str]) -> list[n.Note]:
+        notes = [self._get("notes", "code", code) for code in codes]
+        notes = [note for note in notes if note is not None]
+        NoteIndex._normalize(notes)
+        return [n.Note.from_trusted_dict(note) for note in notes]
+
+    def add_many(self, notes: list[n.Note]) -> None:
+        self._commit(
+            {
+                "op": "note_add_many",
+                "notes": [note.to_dict() for note in notes],
+            }
+        )
+
+    def update_many(self, updates: dict[str, dict]) -> list[n.Note]:
+        self._commit({"op": "note_update_many", "updates": updates})
+        return self.get_many_by_code(updates)
+
+    def delete_many_by_code(self, codes: list[str]) -> list[n.Note]:
+        notes = self.get_many_by_code(codes)
+        self._commit({"op": "note_delete_many", "codes": codes})
+        return notes
+
+    def list(
+        self,
+        filters: dict = None,
+        limit: int = None,
+        skip: int = 0,
+        after: Optional[tuple[float, str]] = None,
+    ) -> list[n.Note]:
+        filters = filters or {}
+        end = skip + limit if limit else None
+        with self._lock:
+            if "location__nearest" in filters:
+                notes = self._nearest_notes(filters)[skip:end]
+            elif not filters:
+                codes = self._note_index().newest_first(skip, end, after)
+                notes = [self._get("notes", "code", code) for code in codes]
+            else:
+                matches = self._matching_notes(filters, after)
+                # stop scanning once the requested page is filled
+                notes = [*itertools.islice(matches, skip, end)]
+        return [n.Note.from_trusted_dict(note) for note in notes]
 
     def add(self, note: n.Note) -> None:
-        self.data["notes"].append(note.to_dict())
-        self._write_data_to_file()
+        self._commit({"op": "note_add", "note": note.to_dict()})
 
     def get_by_code(self, code: str) -> Optional[n.Note]:
-        for note in self.data["notes"]:
-            if note["code"] == code:
-                return n.Note.from_dict(note)
-        return None
+        note = self._get("notes", "code", code)
+        if note is None:
+            return None
+        NoteIndex._normalize([note])
+        return n.Note.from_trusted_dict(note)
 
     def delete_by_code(self, code: str) -> Optional[n.Note]:
-        note = None
-        for index, note in enumerate(self.data["notes"]):
-            if note["code"] == code:
-                note = n.Note.from_dict(self.data["notes"].pop(index))
-                break
-        self._write_data_to_file()
+        note = self.get_by_code(code)
+        self._commit({"op": "note_delete", "code": code})
         return note
 
     def update(self, obj: n.Note, data: str) -> n.Note:
-        updated_note = obj
-        for _index, note in enumerate(self.data["notes"]):
-            if note["code"] == str(obj.code):
-                for field in data:
-                    note[field] = data[field]
-                updated_note = n.Note.from_dict(note)
-                break
-        self._write_data_to_file()
-        return updated_note
+        code = str(obj.code)
+        self._commit({"op": "note_update", "code": code, "data": data})
+        return self.get_by_code(code) or obj
 
     def get_user_by_username(self, username: str) -> u.User:
-        for user in self.data["users"]:
-            if user["username"] == username:
-                return u.User.from_dict(user)
-        return None
+        user = self._get("users", "username", username)
+        if user is None:
+            return None
+        return u.User.from_dict(user)
 
     def get_user_by_email(self, email: str) -> u.User:
-        for user in self.data["users"]:
-            if user["email"] == email:
-                return u.User.from_dict(user)
-        return None
+        user = self._get("users", "email", email)
+        if user is None:
+            return None
+        return u.User.from_dict(user)
 
     def create_user(
         self, email: str, username: str, password: str, is_active: bool = False
@@ -123,65 +824,59 @@ class MemRepo:
             password=password,
             is_active=is_active,
         )
-        self.data["users"].append(user.to_dict())
-        self._write_data_to_file()
+        self._commit({"op": "user_add", "user": user.to_dict()})
         return user
 
     def update_user(self, obj: u.User, data: str) -> u.User:
-        updated_user = obj
-        for _index, user in enumerate(self.data["users"]):
-            if user["username"] == str(obj.username):
-                for field in data:
-                    user[field] = data[field]
-                updated_user = u.User.from_dict(user)
-                break
-        self._write_data_to_file()
-        return updated_user
+        username = str(obj.username)
+        self._commit({"op": "user_update", "username": username, "data": data})
+        return self.get_user_by_username(data.get("username", username)) or obj
 
     def delete_user(self, username: str) -> bool:
-        for index, user in enumerate(self.data["users"]):
-            if user["username"] == username:
-                del self.data["users"][index]
-                break
-        self._write_data_to_file()
+        self._commit({"op": "user_delete", "username": username})
         return True
 
     def get_session_by_session_id(self, session_id: str) -> s.Session:
-        for session in self.data["sessions"]:
-            if session["session_id"] == session_id:
-                return s.Session.from_dict(session)
-        return None
+        session = self._get("sessions", "session_id", session_id)
+        if session is None:
+            return None
+        return s.Session.from_dict(session)
 
     def get_session_by_session_id_and_email(
         self, session_id: str, email: str
     ) -> s.Session:
-        for session in self.data["sessions"]:
-            if (
-                session["session_id"] == session_id
-                and session["email"] == email
-            ):
-                return s.Session.from_dict(session)
-        return None
+        session = self._get("sessions", "session_id", session_id)
+        if session is None or session["email"] != email:
+            return None
+        return s.Session.from_dict(session)
 
     def get_session_by_session_id_and_username(
         self, session_id: str, username: str
     ) -> s.Session:
-        for session in self.data["sessions"]:
-            if (
-                session["session_id"] == session_id
-                and session["username"] == username
-            ):
-                return s.Session.from_dict(session)
-        return None
+        session = self._get("sessions", "session_id", session_id)
+        if session is None or session["username"] != username:
+            return None
+        return s.Session.from_dict(session)
 
     def delete_session_by_session_id(self, session_id: str) -> bool:
-        for index, session in enumerate(self.data["sessions"]):
-            if session["session_id"] == session_id:
-                del self.data["sessions"][index]
-                break
-        self._write_data_to_file()
+        self._commit({"op": "session_delete", "session_id": session_id})
         return True
 
+    def delete_expired_sessions(self, now: float) -> int:
+        """delete sessions and activation tokens expired before now"""
+
+        with self._lock:
+            session_ids = [
+                session["session_id"]
+                for session in self.data["sessions"]
+                if session["expire_time"] < now
+            ]
+        if session_ids:
+            self._commit(
+                {"op": "session_delete_many", "session_ids": session_ids}
+            )
+        return len(session_ids)
+
     def create_or_update_session(
         self, email: str, username: str, session_id: str, expire_time: float
     ) -> s.Session:
@@ -191,13 +886,9 @@ class MemRepo:
             session_id=session_id,
             expire_time=expire_time,
         )
-        for session in self.data["sessions"]:
-            if session["email"] == email or session["username"] == username:
-                session["session_id"] = session_id
-                break
-        else:
-            self.data["sessions"].append(new_session.to_dict())
-        self._write_data_to_file()
+        self._commit(
+            {"op": "session_upsert", "session": new_session.to_dict()}
+        )
         return new_session
 
     def create_session(
@@ -209,6 +900,145 @@ class MemRepo:
             session_id=session_id,
             expire_time=expire_time,
         )
-        self.data["sessions"].append(new_session.to_dict())
-        self._write_data_to_file()
+        self._commit({"op": "session_add", "session": new_session.to_dict()})
         return new_session
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """apply a mutation record to the in-memory data
+
+        records are idempotent so a journal can be replayed safely on top
+        of a snapshot that already contains some of them.
+        """
+
+        getattr(self, "_apply_" + record["op"])(record)
+
+    def _find(self, kind: str, **match: str) -> Optional[dict]:
+        field, value = next(iter(match.items()))
+        item = self._get(kind, field, value)
+        if item is not None and all(item[k] == v for k, v in match.items()):
+            return item
+        # the indexed item is a different duplicate of the first field
+        for item in self.data[kind]:
+            if all(item[k] == v for k, v in match.items()):
+                return item
+        return None
+
+    def _put(self, kind: str, item: dict[str, Any], *keys: str) -> None:
+        """add an item, replacing the one with the same identity keys"""
+
+        existing = self._find(kind, **{key: item[key] for key in keys})
+        if existing is None:
+            self.data[kind].append(item)
+            self._index_item(kind, item)
+        else:
+            self._patch_item(kind, existing, item)
+
+    def _patch_item(
+        self, kind: str, item: dict[str, Any], data: dict[str, Any]
+    ) -> None:
+        changed = tuple(
+            field
+            for field in data
+            if field in INDEXED_FIELDS[kind]
+            and data[field] != item[field]
+            or kind == "notes"
+            and field in NOTE_INDEX_FIELDS
+        )
+        self._unindex_item(kind, item, changed)
+        item.update(data)
+        self._index_item(kind, item, changed)
+
+    def _patch(self, kind: str, data: dict, **match: str) -> None:
+        item = self._find(kind, **match)
+        if item is not None:
+            self._patch_item(kind, item, data)
+
+    def _remove(self, kind: str, **match: str) -> None:
+        item = self._find(kind, **match)
+        if item is None:
+            return
+        self._unindex_item(kind, item)
+        for index, other in enumerate(self.data[kind]):
+            if other is item:
+                del self.data[kind][index]
+                break
+
+    def _apply_note_add(self, record: dict[str, Any]) -> None:
+        self._put("notes", record["note"], "code")
+
+    def _apply_note_update(self, record: dict[str, Any]) -> None:
+        self._patch("notes", record["data"], code=record["code"])
+
+    def _apply_note_delete(self, record: dict[str, Any]) -> None:
+        self._remove("notes", code=record["code"])
+
+    def _apply_note_add_many(self, record: dict[str, Any]) -> None:
+        for note in record["notes"]:
+            self._put("notes", note, "code")
+
+    def _apply_note_update_many(self, record: dict[str, Any]) -> None:
+        for code, data in record["updates"].items():
+            self._patch("notes", data, code=code)
+
+    def _apply_note_delete_many(self, record: dict[str, Any]) -> None:
+        items = {}
+        for code in record["codes"]:
+            item = self._find("notes", code=code)
+            if item is not None:
+                items[id(item)] = item
+        if not items:
+            return
+        # drop them in one pass, then unindex so duplicates left behind
+        # take over the index entries
+        notes = self.data["notes"]
+        notes[:] = [note for note in notes if id(note) not in items]
+        for item in items.values():
+            self._unindex_item("notes", item)
+
+    def _apply_user_add(self, record: dict[str, Any]) -> None:
+        self._put("users", record["user"], "username", "email")
+
+    def _apply_user_update(self, record: dict[str, Any]) -> None:
+        self._patch("users", record["data"], username=record["username"])
+
+    def _apply_user_delete(self, record: dict[str, Any]) -> None:
+        self._remove("users", username=record["username"])
+
+    def _apply_session_add(self, record: dict[str, Any]) -> None:
+        self._put("sessions", record["session"], "session_id")
+
+    def _apply_session_upsert(self, record: dict[str, Any]) -> None:
+        new_session = record["session"]
+        for session in self.data["sessions"]:
+            if (
+                session["email"] == new_session["email"]
+                or session["username"] == new_session["username"]
+            ):
+                self._patch_item(
+                    "sessions",
+                    session,
+                    {"session_id": new_session["session_id"]},
+                )
+                break
+        else:
+            self.data["sessions"].append(new_session)
+            self._index_item("sessions", new_session)
+
+    def _apply_session_delete(self, record: dict[str, Any]) -> None:
+        self._remove("sessions", session_id=record["session_id"])
+
+    def _apply_session_delete_many(self, record: dict[str, Any]) -> None:
+        session_ids = set(record["session_ids"])
+        sessions = self.data["sessions"]
+        kept = [
+            session
+            for session in sessions
+            if session["session_id"] not in session_ids
+        ]
+        if len(kept) == len(sessions):
+            return
+        sessions[:] = kept
+        # a sweep drops many sessions, rebuilding the indexes on next use
+        # is cheaper than unindexing them one by one
+        for field in INDEXED_FIELDS["sessions"]:
+            self._indexes.pop(("sessions", field), None)
@@ -0,0 +1,134 @@
+import json
+import math
+from typing import Any, Optional
+
+from jaanevis.config import settings
+from jaanevis.domain import session as s
+
+# repository methods answered by a session store
+SESSION_METHODS = (
+    "get_session_by_session_id",
+    "get_session_by_session_id_and_email",
+    "get_session_by_session_id_and_username",
+    "delete_session_by_session_id",
+    "delete_expired_sessions",
+    "create_session",
+    "create_or_update_session",
+)
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisSessionStore:
+    """sessions kept in redis, expired by redis itself
+
+    every session is a key holding its json that expires at the session
+    expire time, and a username key points at the latest session of a
+    user so logging in again replaces it without a scan.
+    """
+
+    def __init__(self, redis: Any, prefix: str = "session") -> None:
+        self.redis = redis
+        self.prefix = prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+
+    def _user_key(self, username: str) -> str:
+        return f"{self.prefix}:user:{username}"
+
+    def _set(self, pipe: Any, session: s.Session) -> None:
+        expire_at = math.ceil(session.expire_time)
+        pipe.set(
+            self._key(str(session.session_id)),
+            json.dumps(session.to_dict()),
+            exat=expire_at,
+        )
+        pipe.set(
+            self._user_key(session.username),
+            str(session.session_id),
+            exat=expire_at,
+        )
+
+    def get_session_by_session_id(
+        self, session_id: str
+    ) -> Optional[s.Session]:
+        data = self.redis.get(self._key(session_id))
+        if data is None:
+            return None
+        return s.Session.from_dict(json.loads(data))
+
+    def get_session_by_session_id_and_email(
+        self, session_id: str, email: str
+    ) -> Optional[s.Session]:
+        session = self.get_session_by_session_id(session_id)
+        if session is None or session.email != email:
+            return None
+        return session
+
+    def get_session_by_session_id_and_username(
+        self, session_id: str, username: str
+    ) -> Optional[s.Session]:
+        session = self.get_session_by_session_id(session_id)
+        if session is None or session.username != username:
+            return None
+        return session
+
+    def delete_session_by_session_id(self, session_id: str) -> bool:
+        session = self.get_session_by_session_id(session_id)
+        pipe = self.redis.pipeline()
+        pipe.delete(self._key(session_id))
+        if session is not None:
+            # keep the index if the user logged in again since
+            user_key = self._user_key(session.username)
+            latest = self.redis.get(user_key)
+            if latest is not None and _text(latest) == session_id:
+                pipe.delete(user_key)
+        pipe.execute()
+        return True
+
+    def delete_expired_sessions(self, now: float) -> int:
+        """nothing to delete, redis expires the keys of sessions itself"""
+
+        return 0
+
+    def create_session(
+        self, email: str, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        session = s.Session(
+            email=email,
+            username=username,
+            session_id=session_id,
+            expire_time=expire_time,
+        )
+        pipe = self.redis.pipeline()
+        self._set(pipe, session)
+        pipe.execute()
+        return session
+
+    def create_or_update_session(
+        self, email: str, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        """replace the session of the user with a new one"""
+
+        session = s.Session(
+            email=email,
+            username=username,
+            session_id=session_id,
+            expire_time=expire_time,
+        )
+        old_session_id = self.redis.get(self._user_key(username))
+        pipe = self.redis.pipeline()
+        if old_session_id is not None:
+            pipe.delete(self._key(_text(old_session_id)))
+        self._set(pipe, session)
+        pipe.execute()
+        return session
+
+
+def redis_session_store() -> RedisSessionStore:
+    from redis import Redis
+
+    return RedisSessionStore(Redis.from_url(settings.REDIS_DSN))
@@ -0,0 +1,648 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable, Optional
+
+from jaanevis.config import settings
+from jaanevis.domain import note as n
+from jaanevis.domain import session as s
+from jaanevis.domain import user as u
+from jaanevis.utils import geo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    code TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    lat REAL NOT NULL,
+    long REAL NOT NULL,
+    country TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT '',
+    creator_id TEXT,
+    creator TEXT,
+    created TEXT NOT NULL,
+    created_ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notes_creator ON notes (creator);
+CREATE INDEX IF NOT EXISTS idx_notes_country ON notes (country);
+CREATE INDEX IF NOT EXISTS idx_notes_url ON notes (url);
+CREATE INDEX IF NOT EXISTS idx_notes_created ON notes (created_ts);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS note_locations USING rtree (
+    id, min_long, max_long, min_lat, max_lat
+);
+CREATE TRIGGER IF NOT EXISTS note_locations_insert AFTER INSERT ON notes
+BEGIN
+    INSERT INTO note_locations
+    VALUES (new.rowid, new.long, new.long, new.lat, new.lat);
+END;
+CREATE TRIGGER IF NOT EXISTS note_locations_update
+AFTER UPDATE OF lat, long ON notes
+BEGIN
+    UPDATE note_locations
+    SET min_long = new.long, max_long = new.long,
+        min_lat = new.lat, max_lat = new.lat
+    WHERE id = new.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS note_locations_delete AFTER DELETE ON notes
+BEGIN
+    DELETE FROM note_locations WHERE id = old.rowid;
+END;
+INSERT INTO note_locations
+SELECT rowid, long, long, lat, lat FROM notes
+WHERE NOT EXISTS (SELECT 1 FROM note_locations);
+
+CREATE TABLE IF NOT EXISTS cluster_zooms (
+    zoom INTEGER PRIMARY KEY,
+    size REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS note_clusters (
+    zoom INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum_lat REAL NOT NULL,
+    sum_long REAL NOT NULL,
+    PRIMARY KEY (zoom, x, y)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS note_clusters_insert AFTER INSERT ON notes
+BEGIN
+    INSERT INTO note_clusters
+    SELECT zoom, CAST((new.long + 180) / size AS INTEGER),
+        CAST((new.lat + 90) / size AS INTEGER), 1, new.lat, new.long
+    FROM cluster_zooms WHERE true
+    ON CONFLICT (zoom, x, y) DO UPDATE SET
+        count = count + 1,
+        sum_lat = sum_lat + excluded.sum_lat,
+        sum_long = sum_long + excluded.sum_long;
+END;
+CREATE TRIGGER IF NOT EXISTS note_clusters_delete AFTER DELETE ON notes
+BEGIN
+    UPDATE note_clusters SET
+        count = count - 1,
+        sum_lat = sum_lat - old.lat,
+        sum_long = sum_long - old.long
+    WHERE (zoom, x, y) IN (
+        SELECT zoom, CAST((old.long + 180) / size AS INTEGER),
+            CAST((old.lat + 90) / size AS INTEGER)
+        FROM cluster_zooms
+    );
+    DELETE FROM note_clusters WHERE count = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS note_clusters_update
+AFTER UPDATE OF lat, long ON notes
+BEGIN
+    UPDATE note_clusters SET
+        count = count - 1,
+        sum_lat = sum_lat - old.lat,
+        sum_long = sum_long - old.long
+    WHERE (zoom, x, y) IN (
+        SELECT zoom, CAST((old.long + 180) / size AS INTEGER),
+            CAST((old.lat + 90) / size AS INTEGER)
+        FROM cluster_zooms
+    );
+    DELETE FROM note_clusters WHERE count = 0;
+    INSERT INTO note_clusters
+    SELECT zoom, CAST((new.long + 180) / size AS INTEGER),
+        CAST((new.lat + 90) / size AS INTEGER), 1, new.lat, new.long
+    FROM cluster_zooms WHERE true
+    ON CONFLICT (zoom, x, y) DO UPDATE SET
+        count = count + 1,
+        sum_lat = sum_lat + excluded.sum_lat,
+        sum_long = sum_long + excluded.sum_long;
+END;
+
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_code TEXT NOT NULL REFERENCES notes (code) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (note_code, position)
+);
+CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags (tag, note_code);
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT NOT NULL,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users (username);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT NOT NULL,
+    email TEXT NOT NULL,
+    username TEXT NOT NULL,
+    expire_time REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_session_id
+    ON sessions (session_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_email ON sessions (email);
+CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username);
+CREATE INDEX IF NOT EXISTS idx_sessions_expire_time
+    ON sessions (expire_time);
+"""
+
+NOTE_COLUMNS = (
+    "code",
+    "url",
+    "lat",
+    "long",
+    "country",
+    "text",
+    "creator_id",
+    "creator",
+    "created",
+)
+USER_COLUMNS = ("username", "email", "password", "is_active")
+# first radius searched for nearest notes, doubled until k notes are found
+NEAREST_START_KM = 10.0
+# codes looked up per statement, below the default sqlite variable limit
+MAX_VARIABLES = 500
+
+# filter key -> sql condition on the notes table
+NOTE_FILTERS = {
+    "code__eq": "code = ?",
+    "url__eq": "url = ?",
+    "lat__eq": "lat = ?",
+    "long__eq": "long = ?",
+    "creator__eq": "creator = ?",
+    "country__eq": "country = ?",
+    "tag__eq": "code IN (SELECT note_code FROM note_tags WHERE tag = ?)",
+}
+
+
+def note_condition(key: str, value: Any) -> tuple[str, list]:
+    """sql condition and its parameters for a note list filter"""
+
+    if key == "code__in":
+        return f"code IN ({','.join('?' * len(value))})", list(value)
+    if key == "tag__in":
+        placeholders = ",".join("?" * len(value))
+        return (
+            "code IN (SELECT note_code FROM note_tags"
+            f" WHERE tag IN ({placeholders}))",
+            list(value),
+        )
+    if key == "tag__all":
+        placeholders = ",".join("?" * len(value))
+        return (
+            "code IN (SELECT note_code FROM note_tags"
+            f" WHERE tag IN ({placeholders}) GROUP BY note_code"
+            " HAVING COUNT(DISTINCT tag) = ?)",
+            [*value, len(set(value))],
+        )
+    if key == "location__within":
+        # the rtree stores rounded coordinates, so it only narrows down
+        # the candidates and the exact bounds are checked on notes
+        min_long, min_lat, max_long, max_lat = value
+        return (
+            "rowid IN (SELECT id FROM note_locations"
+            " WHERE max_long >= ? AND min_long <= ?"
+            " AND max_lat >= ? AND min_lat <= ?)"
+            " AND long BETWEEN ? AND ? AND lat BETWEEN ? AND ?",
+            [min_long, max_long, min_lat, max_lat] * 2,
+        )
+    if key == "location__radius":
+        lat, long, radius_km = value
+        condition, params = note_condition(
+            "location__within", geo.bbox_around(lat, long, radius_km)
+        )
+        return (
+            f"{condition} AND haversine_km(lat, long, ?, ?) <= ?",
+            [*params, lat, long, radius_km],
+        )
+    return NOTE_FILTERS[key], [value]
+
+
+class SQLiteRepo:
+    """repository backed by a sqlite database in WAL mode
+
+    each thread gets its own connection so the repository can be shared
+    by the whole process, and WAL lets several processes read while one
+    of them writes.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        if db_path is None:
+            base_data_path = settings.DATA_BASE_DIR / "data"
+            os.makedirs(base_data_path, exist_ok=True)
+            db_path = base_data_path / "db.sqlite3"
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._init_clusters(conn)
+
+    def _init_clusters(self, conn: sqlite3.Connection) -> None:
+        """fill the cluster zoom levels and clusters of existing notes"""
+
+        zooms = range(geo.CLUSTER_MAX_ZOOM + 1)
+        (count,) = conn.execute(
+            "SELECT COUNT(*) FROM cluster_zooms"
+        ).fetchone()
+        if count == len(zooms):
+            return
+        conn.execute("DELETE FROM cluster_zooms")
+        conn.execute("DELETE FROM note_clusters")
+        conn.executemany(
+            "INSERT INTO cluster_zooms (zoom, size) VALUES (?, ?)",
+            [(zoom, geo.cluster_cell_size(zoom)) for zoom in zooms],
+        )
+        conn.execute(
+            "INSERT INTO note_clusters"
+            " SELECT zoom, CAST((long + 180) / size AS INTEGER) AS x,"
+            " CAST((lat + 90) / size AS INTEGER) AS y,"
+            " COUNT(*), SUM(lat), SUM(long)"
+            " FROM notes, cluster_zooms GROUP BY zoom, x, y"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function(
+                "haversine_km", 4, geo.haversine_km, deterministic=True
+            )
+            self._local.conn = conn
+        return conn
+
+    def refresh(self) -> None:
+        """nothing to reload, every query reads the database"""
+
+    def _notes_from_rows(self, rows: Iterable[sqlite3.Row]) -> list[n.Note]:
+        notes = [dict(row) for row in rows]
+        if not notes:
+            return []
+        tags: dict[str, list[str]] = {note["code"]: [] for note in notes}
+        placeholders = ",".join("?" * len(tags))
+        tag_rows = self._connection().execute(
+            "SELECT note_code, tag FROM note_tags"
+            f" WHERE note_code IN ({placeholders})"
+            " ORDER BY note_code, position",
+            list(tags),
+        )
+        for row in tag_rows:
+            tags[row["note_code"]].append(row["tag"])
+        return [
+            n.Note.from_trusted_dict({**note, "tags": tags[note["code"]]})
+            for note in notes
+        ]
+
+    def _insert_tags(
+        self, conn: sqlite3.Connection, code: str, tags: list[str]
+    ) -> None:
+        conn.executemany(
+            "INSERT INTO note_tags (note_code, position, tag) VALUES (?, ?, ?)",
+            [(code, position, tag) for position, tag in enumerate(tags)],
+        )
+
+    def clusters(
+        self, zoom: int, bbox: Optional[geo.BBox] = None
+    ) -> list[n.NoteCluster]:
+        zoom = min(zoom, geo.CLUSTER_MAX_ZOOM)
+        min_lon, min_lat, max_lon, max_lat = bbox or (-180, -90, 180, 90)
+        min_x, min_y = geo.cluster_cell(zoom, min_lat, min_lon)
+        max_x, max_y = geo.cluster_cell(zoom, max_lat, max_lon)
+        conn = self._connection()
+        params = [zoom, min_x, max_x, min_y, max_y]
+        rows = conn.execute(
+            "SELECT x, y, count, sum_lat / count AS lat,"
+            " sum_long / count AS long FROM note_clusters"
+            " WHERE zoom = ? AND x BETWEEN ? AND ? AND y BETWEEN ? AND ?",
+            params,
+        ).fetchall()
+        # notes of the single note clusters, found in one go through the
+        # rtree and checked against the cell the triggers put them in
+        singles = {
+            (row["x"], row["y"]): row
+            for row in conn.execute(
+                "SELECT c.x, c.y, notes.code, notes.lat, notes.long"
+                " FROM note_clusters AS c"
+                " JOIN cluster_zooms AS z ON z.zoom = c.zoom"
+                " JOIN note_locations AS l"
+                " ON l.max_long >= c.x * z.size - 180"
+                " AND l.min_long <= (c.x + 1) * z.size - 180"
+                " AND l.max_lat >= c.y * z.size - 90"
+                " AND l.min_lat <= (c.y + 1) * z.size - 90"
+                " JOIN notes ON notes.rowid = l.id"
+                " WHERE c.zoom = ? AND c.x BETWEEN ? AND ?"
+                " AND c.y BETWEEN ? AND ? AND c.count = 1"
+                " AND CAST((notes.long + 180) / z.size AS INTEGER) = c.x"
+                " AND CAST((notes.lat + 90) / z.size AS INTEGER) = c.y",
+                params,
+            )
+        }
+        clusters = []
+        for row in rows:
+            if row["count"] > 1:
+                clusters.append(
+                    n.NoteCluster(row["lat"], row["long"], row["count"])
+                )
+                continue
+            single = singles.get((row["x"], row["y"]))
+            if single is not None:
+                clusters.append(
+                    n.NoteCluster(
+                        single["lat"], single["long"], 1, single["code"]
+                    )
+                )
+        return clusters
+
+    def _where(self, filters: dict) -> tuple[str, list]:
+        conditions, params = [], []
+        for key, value in filters.items():
+            condition, condition_params = note_condition(key, value)
+            conditions.append(condition)
+            params.extend(condition_params)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def _nearest(
+        self, filters: dict, limit: Optional[int], skip: int
+    ) -> list[n.Note]:
+        """k nearest notes, searching circles of growing radius so only
+        notes around the point are checked"""
+
+        lat, long, k = filters.pop("location__nearest")
+        max_radius = geo.MAX_DISTANCE_KM
+        if "location__radius" in filters:
+            max_radius = filters["location__radius"][2]
+        radius = min(NEAREST_START_KM, max_radius)
+        while True:
+            circle = {**filters, "location__radius": (lat, long, radius)}
+            where, params = self._where(circle)
+            (count,) = (
+                self._connection()
+                .execute(f"SELECT COUNT(*) FROM notes{where}", params)
+                .fetchone()
+            )
+            if count >= k or radius >= max_radius:
+                break
+            radius = min(radius * 2, max_radius)
+        limit = max(k - skip, 0) if limit is None else min(limit, k - skip)
+        rows = self._connection().execute(
+            f"SELECT {', '.join(NOTE_COLUMNS)} FROM notes{where}"
+            " ORDER BY haversine_km(lat, long, ?, ?), created_ts DESC"
+            " LIMIT ? OFFSET ?",
+            [*params, lat, long, max(limit, 0), skip],
+        )
+        return self._notes_from_rows(rows)
+
+    def _note_row(self, note: n.Note) -> list[Any]:
+        data = note.to_dict()
+        return [data[column] for column in NOTE_COLUMNS] + [
+            note.created.timestamp()
+        ]
+
+    def get_many_by_code(self, codes: Iterable[str]) -> list[n.Note]:
+        codes = list(codes)
+        notes = []
+        for start in range(0, len(codes), MAX_VARIABLES):
+            chunk = codes[start : start + MAX_VARIABLES]
+            notes.extend(self.list(filters={"code__in": chunk}))
+        return notes
+
+    def add_many(self, notes: list[n.Note]) -> None:
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT INTO notes ({', '.join(NOTE_COLUMNS)}, created_ts)"
+                f" VALUES ({', '.join('?' * len(NOTE_COLUMNS))}, ?)",
+                [self._note_row(note) for note in notes],
+            )
+            conn.executemany(
+                "INSERT INTO note_tags (note_code, position, tag)"
+                " VALUES (?, ?, ?)",
+                [
+                    (str(note.code), position, tag)
+                    for note in notes
+                    for position, tag in enumerate(note.tags)
+                ],
+            )
+
+    def update_many(self, updates: dict[str, dict]) -> list[n.Note]:
+        with self._connection() as conn:
+            for code, data in updates.items():
+                self._update(conn, code, data)
+        return self.get_many_by_code(updates)
+
+    def delete_many_by_code(self, codes: list[str]) -> list[n.Note]:
+        notes = self.get_many_by_code(codes)
+        with self._connection() as conn:
+            conn.executemany(
+                "DELETE FROM notes WHERE code = ?", [(code,) for code in codes]
+            )
+        return notes
+
+    def list(
+        self,
+        filters: dict = None,
+        limit: int = None,
+        skip: int = 0,
+        after: Optional[tuple[float, str]] = None,
+    ) -> list[n.Note]:
+        filters = dict(filters or {})
+        if "location__nearest" in filters:
+            return self._nearest(filters, limit, skip)
+        where, params = self._where(filters)
+        if after is not None:
+            where += " AND" if where else " WHERE"
+            where += " (created_ts, code) < (?, ?)"
+            params.extend(after)
+        rows = self._connection().execute(
+            f"SELECT {', '.join(NOTE_COLUMNS)} FROM notes{where}"
+            " ORDER BY created_ts DESC, code DESC LIMIT ? OFFSET ?",
+            [*params, limit or -1, skip],
+        )
+        return self._notes_from_rows(rows)
+
+    def add(self, note: n.Note) -> None:
+        data = note.to_dict()
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT INTO notes ({', '.join(NOTE_COLUMNS)}, created_ts)"
+                f" VALUES ({', '.join('?' * len(NOTE_COLUMNS))}, ?)",
+                self._note_row(note),
+            )
+            self._insert_tags(conn, data["code"], data["tags"])
+
+    def get_by_code(self, code: str) -> Optional[n.Note]:
+        notes = self.list(filters={"code__eq": code})
+        return notes[0] if notes else None
+
+    def delete_by_code(self, code: str) -> Optional[n.Note]:
+        note = self.get_by_code(code)
+        with self._connection() as conn:
+            conn.execute("DELETE FROM notes WHERE code = ?", [code])
+        return note
+
+    def _update(self, conn: sqlite3.Connection, code: str, data: dict) -> None:
+        columns = [column for column in data if column in NOTE_COLUMNS]
+        if columns:
+            conn.execute(
+                "UPDATE notes SET"
+                f" {', '.join(f'{column} = ?' for column in columns)}"
+                " WHERE code = ?",
+                [data[column] for column in columns] + [code],
+            )
+        if "tags" in data:
+            conn.execute("DELETE FROM note_tags WHERE note_code = ?", [code])
+            self._insert_tags(conn, code, data["tags"])
+
+    def update(self, obj: n.Note, data: dict) -> n.Note:
+        code = str(obj.code)
+        with self._connection() as conn:
+            self._update(conn, code, data)
+        return self.get_by_code(code) or obj
+
+    def _get_user(self, column: str, value: str) -> Optional[u.User]:
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {', '.join(USER_COLUMNS)} FROM users"
+                f" WHERE {column} = ?",
+                [value],
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return u.User.from_dict({**row, "is_active": bool(row["is_active"])})
+
+    def get_user_by_username(self, username: str) -> Optional[u.User]:
+        return self._get_user("username", username)
+
+    def get_user_by_email(self, email: str) -> Optional[u.User]:
+        return self._get_user("email", email)
+
+    def create_user(
+        self, email: str, username: str, password: str, is_active: bool = False
+    ) -> u.User:
+        user = u.User(
+            email=email,
+            username=username,
+            password=password,
+            is_active=is_active,
+        )
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO users (username, email, password, is_active)"
+                " VALUES (?, ?, ?, ?)",
+                [username, email, password, is_active],
+            )
+        return user
+
+    def update_user(self, obj: u.User, data: dict[str, Any]) -> u.User:
+        username = str(obj.username)
+        columns = [column for column in data if column in USER_COLUMNS]
+        if columns:
+            with self._connection() as conn:
+                conn.execute(
+                    "UPDATE users SET"
+                    f" {', '.join(f'{column} = ?' for column in columns)}"
+                    " WHERE username = ?",
+                    [data[column] for column in columns] + [username],
+                )
+        return self.get_user_by_username(data.get("username", username)) or obj
+
+    def delete_user(self, username: str) -> bool:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM users WHERE username = ?", [username])
+        return True
+
+    def _get_session(self, where: str, params: list) -> Optional[s.Session]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT email, username, expire_time, session_id"
+                f" FROM sessions WHERE {where}",
+                params,
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return s.Session.from_dict(dict(row))
+
+    def get_session_by_session_id(
+        self, session_id: str
+    ) -> Optional[s.Session]:
+        return self._get_session("session_id = ?", [session_id])
+
+    def get_session_by_session_id_and_email(
+        self, session_id: str, email: str
+    ) -> Optional[s.Session]:
+        return self._get_session(
+            "session_id = ? AND email = ?", [session_id, email]
+        )
+
+    def get_session_by_session_id_and_username(
+        self, session_id: str, username: str
+    ) -> Optional[s.Session]:
+        return self._get_session(
+            "session_id = ? AND username = ?", [session_id, username]
+        )
+
+    def delete_session_by_session_id(self, session_id: str) -> bool:
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", [session_id]
+            )
+        return True
+
+    def delete_expired_sessions(self, now: float) -> int:
+        """delete sessions and activation tokens expired before now"""
+
+        with self._connection() as conn:
+            deleted = conn.execute(
+                "DELETE FROM sessions WHERE expire_time < ?", [now]
+            )
+        return deleted.rowcount
+
+    def create_or_update_session(
+        self, email: str, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        new_session = s.Session(
+            email=email,
+            username=username,
+            session_id=session_id,
+            expire_time=expire_time,
+        )
+        with self._connection() as conn:
+            updated = conn.execute(
+                "UPDATE sessions SET session_id = ? WHERE rowid = ("
+                " SELECT rowid FROM sessions WHERE email = ?"
+                " UNION ALL"
+                " SELECT rowid FROM sessions WHERE username = ?"
+                " LIMIT 1)",
+                [session_id, email, username],
+            )
+            if not updated.rowcount:
+                conn.execute(
+                    "INSERT INTO sessions"
+                    " (session_id, email, username, expire_time)"
+                    " VALUES (?, ?, ?, ?)",
+                    [session_id, email, username, expire_time],
+                )
+        return new_session
+
+    def create_session(
+        self, email: str, username: str, session_id: str, expire_time: float
+    ) -> s.Session:
+        new_session = s.Session(
+            email=email,
+            username=username,
+            session_id=session_id,
+            expire_time=expire_time,
+        )
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions"
+                " (session_id, email, username, expire_time)"
+                " VALUES (?, ?, ?, ?)",
+                [session_id, email, username, expire_time],
+            )
+        return new_session
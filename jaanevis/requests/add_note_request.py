@@ -17,7 +17,6 @@ class AddNoteRequest(ValidRequestObject):
 
     @classmethod
     def build(cls, note: Note, user: User) -> RequestObject:
-
         invalid_req = InvalidRequestObject()
 
         if not isinstance(note, Note):
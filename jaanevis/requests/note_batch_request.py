@@ -0,0 +1,99 @@
+from typing import Optional
+
+from jaanevis.config import settings
+from jaanevis.domain.note import Note, NoteBatchUpdateApi
+from jaanevis.domain.user import User
+from jaanevis.i18n import gettext as _
+from jaanevis.requests import (
+    InvalidRequestObject,
+    RequestObject,
+    ValidRequestObject,
+)
+
+
+def _check_batch(
+    invalid_req: InvalidRequestObject, items: list, user: Optional[User]
+) -> None:
+    """add the errors shared by batch requests"""
+
+    if not items:
+        invalid_req.add_error("body", _("Empty batch"))
+    elif len(items) > settings.NOTE_BATCH_MAX_SIZE:
+        invalid_req.add_error("body", _("Too many notes in batch"))
+    elif not user or not isinstance(user, User):
+        invalid_req.add_error("user", _("Invalid user"))
+
+
+def _has_duplicates(codes: list[str]) -> bool:
+    return len(set(codes)) != len(codes)
+
+
+class AddNotesRequest(ValidRequestObject):
+    """request object for adding many notes"""
+
+    def __init__(self, notes: list[Note], user: User) -> None:
+        self.notes = notes
+        self.user = user
+
+    @classmethod
+    def build(cls, notes: list[Note], user: User) -> RequestObject:
+        invalid_req = InvalidRequestObject()
+        _check_batch(invalid_req, notes, user)
+        if invalid_req.has_errors():
+            return invalid_req
+        if not all(isinstance(note, Note) for note in notes):
+            invalid_req.add_error("body", _("Invalid note type"))
+            return invalid_req
+        if _has_duplicates([str(note.code) for note in notes]):
+            invalid_req.add_error("body", _("Duplicate note codes"))
+            return invalid_req
+
+        return cls(notes=notes, user=user)
+
+
+class UpdateNotesRequest(ValidRequestObject):
+    """request object to update many notes"""
+
+    def __init__(self, notes: list[NoteBatchUpdateApi], user: User) -> None:
+        self.notes = notes
+        self.user = user
+
+    @classmethod
+    def build(
+        cls, notes: list[NoteBatchUpdateApi], user: User
+    ) -> RequestObject:
+        invalid_req = InvalidRequestObject()
+        _check_batch(invalid_req, notes, user)
+        if invalid_req.has_errors():
+            return invalid_req
+        if not all(isinstance(note, NoteBatchUpdateApi) for note in notes):
+            invalid_req.add_error("body", _("Invalid note type"))
+            return invalid_req
+        if _has_duplicates([note.code for note in notes]):
+            invalid_req.add_error("body", _("Duplicate note codes"))
+            return invalid_req
+
+        return cls(notes=notes, user=user)
+
+
+class DeleteNotesRequest(ValidRequestObject):
+    """request to delete many notes by their codes"""
+
+    def __init__(self, codes: list[str], user: User) -> None:
+        self.codes = codes
+        self.user = user
+
+    @classmethod
+    def build(cls, codes: list[str], user: User) -> RequestObject:
+        invalid_req = InvalidRequestObject()
+        _check_batch(invalid_req, codes, user)
+        if invalid_req.has_errors():
+            return invalid_req
+        if not all(codes):
+            invalid_req.add_error("code", _("Invalid code value"))
+            return invalid_req
+        if _has_duplicates(codes):
+            invalid_req.add_error("code", _("Duplicate note codes"))
+            return invalid_req
+
+        return cls(codes=codes, user=user)
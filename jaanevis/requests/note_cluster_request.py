@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from jaanevis.requests import (
+    InvalidRequestObject,
+    RequestObject,
+    ValidRequestObject,
+)
+from jaanevis.utils import geo
+
+
+class NoteClusterRequest(ValidRequestObject):
+    """request for note clusters of a map zoom level"""
+
+    def __init__(self, zoom: int, bbox: Optional[geo.BBox] = None) -> None:
+        self.zoom = zoom
+        self.bbox = bbox
+
+    @classmethod
+    def build(cls, zoom: int, bbox: Any = None) -> RequestObject:
+        invalid_req = InvalidRequestObject()
+
+        if not isinstance(zoom, int) or zoom < 0:
+            invalid_req.add_error("zoom", "zoom must be a positive integer")
+        if bbox is not None:
+            try:
+                bbox = geo.parse_bbox(bbox)
+            except ValueError:
+                invalid_req.add_error(
+                    "bbox", "bbox must be min_lon,min_lat,max_lon,max_lat"
+                )
+
+        if invalid_req.has_errors():
+            return invalid_req
+
+        return cls(zoom=zoom, bbox=bbox)
@@ -0,0 +1,37 @@
+from typing import Any, Optional
+
+from jaanevis.i18n import gettext as _
+from jaanevis.requests import (
+    InvalidRequestObject,
+    RequestObject,
+    ValidRequestObject,
+)
+from jaanevis.requests.note_list_request import NoteListRequest
+
+
+class NoteExportRequest(ValidRequestObject):
+    """request object to export all notes matching filters"""
+
+    formats = ["ndjson", "geojson", "csv"]
+
+    def __init__(
+        self, format: str, filters: Optional[dict[str, Any]] = None
+    ) -> None:
+        self.format = format
+        self.filters = filters
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RequestObject:
+        # filters are validated like the ones of note lists
+        list_request = NoteListRequest.from_dict(
+            {"filters": data.get("filters", {})}
+        )
+        if not list_request:
+            return list_request
+
+        if data.get("format") not in cls.formats:
+            invalid_req = InvalidRequestObject()
+            invalid_req.add_error("format", _("Invalid export format"))
+            return invalid_req
+
+        return cls(format=data["format"], filters=list_request.filters)
@@ -6,6 +6,8 @@ from jaanevis.requests import (
     RequestObject,
     ValidRequestObject,
 )
+from jaanevis.utils import geo
+from jaanevis.utils.cursor import decode_cursor
 
 
 class NoteListRequest(ValidRequestObject):
@@ -19,17 +21,62 @@ class NoteListRequest(ValidRequestObject):
         "creator__eq",
         "country__eq",
         "tag__eq",
+        "tag__in",
+        "tag__all",
+        "location__within",
+        "location__radius",
+        "location__nearest",
     ]
+    list_filters = ["tag__in", "tag__all"]
+    # filter key -> (parser, expected format)
+    location_filters = {
+        "location__within": (
+            geo.parse_bbox,
+            "min_lon,min_lat,max_lon,max_lat",
+        ),
+        "location__radius": (geo.parse_circle, "lat,long,radius_km"),
+        "location__nearest": (geo.parse_nearest, "lat,long,k"),
+    }
 
     def __init__(
         self,
         filters: Optional[dict[str, Any]] = None,
         limit: int = None,
         skip: int = 0,
+        after: Optional[tuple[float, str]] = None,
     ) -> None:
         self.filters = filters
         self.limit = limit
         self.skip = skip
+        self.after = after
+
+    @classmethod
+    def _validate_filter(
+        cls,
+        filters: dict[str, Any],
+        key: str,
+        value: Any,
+        invalid_req: InvalidRequestObject,
+    ) -> None:
+        """check a filter, dropping empty ones and parsing locations"""
+
+        if key not in cls.accepted_filters:
+            invalid_req.add_error("filters", f"key {key} cannot be used")
+        if value is None:
+            filters.pop(key)
+        elif key in cls.list_filters:
+            if not isinstance(value, (list, tuple)):
+                invalid_req.add_error("filters", f"key {key} must be a list")
+            elif not value:
+                filters.pop(key)
+        elif key in cls.location_filters:
+            parse, expected = cls.location_filters[key]
+            try:
+                filters[key] = parse(value)
+            except ValueError:
+                invalid_req.add_error(
+                    "filters", f"key {key} must be {expected}"
+                )
 
     @classmethod
     def from_dict(cls, data: dict) -> RequestObject:
@@ -40,15 +87,15 @@ class NoteListRequest(ValidRequestObject):
                 invalid_req.add_error("filters", _("Invalid filters type"))
                 return invalid_req
 
-            filters_copy = data["filters"].copy()
-            for key, _value in filters_copy.items():
-                if key not in cls.accepted_filters:
-                    invalid_req.add_error(
-                        "filters",
-                        f"key {key} cannot be used",
-                    )
-                if _value is None:
-                    data["filters"].pop(key)
+            for key, value in data["filters"].copy().items():
+                cls._validate_filter(data["filters"], key, value, invalid_req)
+
+        after = None
+        if data.get("cursor") is not None:
+            try:
+                after = decode_cursor(data["cursor"])
+            except ValueError:
+                invalid_req.add_error("cursor", _("Invalid cursor"))
 
         if invalid_req.has_errors():
             return invalid_req
@@ -57,4 +104,5 @@ class NoteListRequest(ValidRequestObject):
             filters=data.get("filters", None),
             limit=data.get("limit"),
             skip=data.get("skip", 0),
+            after=after,
         )
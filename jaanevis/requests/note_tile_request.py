@@ -0,0 +1,33 @@
+from jaanevis.requests import (
+    InvalidRequestObject,
+    RequestObject,
+    ValidRequestObject,
+)
+from jaanevis.utils import mvt
+
+
+class NoteTileRequest(ValidRequestObject):
+    """request for the vector tile of notes at zoom, x, y"""
+
+    def __init__(self, zoom: int, x: int, y: int) -> None:
+        self.zoom = zoom
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def build(cls, zoom: int, x: int, y: int) -> RequestObject:
+        invalid_req = InvalidRequestObject()
+
+        if not 0 <= zoom <= mvt.MAX_TILE_ZOOM:
+            invalid_req.add_error(
+                "zoom", f"zoom must be between 0 and {mvt.MAX_TILE_ZOOM}"
+            )
+            return invalid_req
+        count = mvt.tile_count(zoom)
+        if not (0 <= x < count and 0 <= y < count):
+            invalid_req.add_error(
+                "tile", f"x and y must be between 0 and {count - 1}"
+            )
+            return invalid_req
+
+        return cls(zoom=zoom, x=x, y=y)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 
 class StatusCode:
@@ -13,6 +13,7 @@ class StatusCode:
     invalid_password = 8
     user_exists = 9
     invalid_username = 10
+    permission_denied = 11
 
 
 class ResponseSuccess:
@@ -21,11 +22,15 @@ class ResponseSuccess:
     SUCCESS = "Success"
 
     def __init__(
-        self, value: Any = None, code: StatusCode = StatusCode.success
+        self,
+        value: Any = None,
+        code: StatusCode = StatusCode.success,
+        meta: Optional[dict[str, Any]] = None,
     ) -> None:
         self.type = self.SUCCESS
         self.code = code
         self.value = value
+        self.meta = meta or {}
 
     def __bool__(self) -> bool:
         return True
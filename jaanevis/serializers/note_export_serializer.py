@@ -0,0 +1,95 @@
+"""streaming notes as ndjson, geojson or csv text chunks"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable
+
+from jaanevis.domain import note as n
+
+# public note fields, like NoteRead
+EXPORT_FIELDS = (
+    "code",
+    "url",
+    "lat",
+    "long",
+    "country",
+    "text",
+    "tags",
+    "creator",
+    "created",
+)
+
+NotePages = AsyncIterator[list[n.Note]]
+
+
+def note_to_export_dict(note: n.Note) -> dict[str, Any]:
+    return {
+        "code": str(note.code),
+        "url": str(note.url),
+        "lat": note.lat,
+        "long": note.long,
+        "country": note.country,
+        "text": note.text,
+        "tags": note.tags,
+        "creator": note.creator,
+        "created": note.created.isoformat(),
+    }
+
+
+def note_to_geojson_feature(note: n.Note) -> dict[str, Any]:
+    properties = note_to_export_dict(note)
+    del properties["lat"], properties["long"]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [note.long, note.lat]},
+        "properties": properties,
+    }
+
+
+async def ndjson_chunks(pages: NotePages) -> AsyncIterator[str]:
+    """one json object per line"""
+
+    async for notes in pages:
+        yield "".join(
+            json.dumps(note_to_export_dict(note)) + "\n" for note in notes
+        )
+
+
+async def geojson_chunks(pages: NotePages) -> AsyncIterator[str]:
+    """a single geojson feature collection"""
+
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = ""
+    async for notes in pages:
+        if not notes:
+            continue
+        features = (note_to_geojson_feature(note) for note in notes)
+        yield separator + ", ".join(json.dumps(f) for f in features)
+        separator = ", "
+    yield "]}\n"
+
+
+async def csv_chunks(pages: NotePages) -> AsyncIterator[str]:
+    """csv with a header row, tags are separated by spaces"""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    async for notes in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        for note in notes:
+            data = note_to_export_dict(note)
+            data["tags"] = " ".join(note.tags)
+            writer.writerow(data[field] for field in EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+
+# export format -> (media type, file extension, chunks of note pages)
+EXPORT_FORMATS: dict[str, tuple[str, str, Callable]] = {
+    "ndjson": ("application/x-ndjson", "ndjson", ndjson_chunks),
+    "geojson": ("application/geo+json", "geojson", geojson_chunks),
+    "csv": ("text/csv", "csv", csv_chunks),
+}
@@ -5,27 +5,29 @@ from jaanevis.domain import note as n
 
 
 def notes_to_geojson(notes: list[n.Note]) -> list[dict]:
-    """convert note model list to list of geojson features"""
+    """convert note model list to list of json ready geojson features
 
-    geojson_notes = []
-    for note in notes:
-        geojson_notes.append(
-            {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [note.long, note.lat],
-                },
-                "properties": {
-                    "code": note.code,
-                    "creator": note.creator,
-                    "text": note.text,
-                    "country": note.country,
-                    "url": note.url,
-                },
-            }
-        )
-    return geojson_notes
+    plain dicts skip building and validating a model per note, which
+    dominates the cost of large responses.
+    """
+
+    return [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [note.long, note.lat],
+            },
+            "properties": {
+                "code": str(note.code),
+                "creator": note.creator,
+                "text": note.text,
+                "country": note.country,
+                "url": str(note.url),
+            },
+        }
+        for note in notes
+    ]
 
 
 def notes_to_geojson_features(
@@ -47,3 +49,19 @@ def notes_to_geojson_features(
             n.NoteGeoJsonFeature(geometry=geometry, properties=properties)
         )
     return geojson_notes
+
+
+def clusters_to_geojson_features(
+    clusters: list[n.NoteCluster],
+) -> list[n.NoteClusterFeature]:
+    """convert note cluster list to cluster geojson feature model list"""
+
+    return [
+        n.NoteClusterFeature(
+            geometry=geo.GeoJsonPoint(coordinates=[cluster.long, cluster.lat]),
+            properties=n.NoteClusterProperties(
+                count=cluster.count, code=cluster.code
+            ),
+        )
+        for cluster in clusters
+    ]
@@ -1,4 +1,7 @@
 import json
+from typing import Any
+
+from jaanevis.domain import note as n
 
 
 class NoteJsonEncoder(json.JSONEncoder):
@@ -35,3 +38,31 @@ class NoteGeoJsonEncoder(json.JSONEncoder):
             return to_serialize
         except AttributeError:
             return super().default(0)
+
+
+def note_to_read_dict(note: n.Note) -> dict[str, Any]:
+    """json ready note without private fields, like NoteRead"""
+
+    return {
+        "url": str(note.url),
+        "lat": note.lat,
+        "long": note.long,
+        "country": note.country,
+        "text": note.text,
+        "tags": note.tags,
+        "code": str(note.code),
+        "creator": note.creator,
+        "created": note.created.isoformat(),
+    }
+
+
+def notes_to_read_dicts(notes: list[n.Note]) -> list[dict[str, Any]]:
+    return [note_to_read_dict(note) for note in notes]
+
+
+def dumps(data: Any) -> bytes:
+    """compact utf-8 json of json ready data"""
+
+    return json.dumps(
+        data, ensure_ascii=False, check_circular=False, separators=(",", ":")
+    ).encode()
@@ -0,0 +1,20 @@
+"""background jobs run by rq workers
+
+the redis connection and queue live in jaanevis.tasks.core, which is
+only imported on the first enqueue, so the api and the cli start
+without loading or connecting the task stack.
+"""
+
+from typing import Any
+
+
+def enqueue(func: str, *args: Any, **kwargs: Any) -> Any:
+    """queue a job by the dotted path of its function
+
+    workers import the function when they run the job, so callers do
+    not import the modules of their jobs either.
+    """
+
+    from jaanevis.tasks.core import q
+
+    return q.enqueue(func, *args, **kwargs)
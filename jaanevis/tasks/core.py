@@ -2,17 +2,20 @@ from redis import Redis
 from rq import Queue, Worker
 
 from jaanevis.config import settings
+from jaanevis.utils import geo
 
 redis_connection = Redis(
     host=settings.REDIS_DSN.host,
     port=settings.REDIS_DSN.port,
 )
 q = Queue(connection=redis_connection)
-w = Worker([q], connection=redis_connection)
 
 
 def run_worker() -> None:
-    w.work()
+    # jobs run in processes forked from the worker, so the index built
+    # here before working is shared by all of them
+    geo.warm_up_geocoder()
+    Worker([q], connection=redis_connection).work()
 
 
 def send_test_email() -> None:
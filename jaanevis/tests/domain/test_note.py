@@ -1,5 +1,8 @@
 import uuid
 from datetime import datetime
+from unittest import mock
+
+import pytest
 
 from jaanevis.domain import note as n
 
@@ -73,6 +76,66 @@ def test_note_model_from_dict() -> None:
     assert note.country == COUNTRY
 
 
+def test_note_model_from_trusted_dict_round_trips_to_dict() -> None:
+    note = n.Note(
+        creator="default",
+        url="http://example.com",
+        text="some #text",
+        lat=LAT,
+        long=LONG,
+    )
+
+    with mock.patch.object(n.geo, "get_country_from_latlong") as geocode:
+        trusted = n.Note.from_trusted_dict(note.to_dict())
+
+    geocode.assert_not_called()
+    assert trusted == n.Note.from_dict(note.to_dict())
+    assert trusted.to_dict() == note.to_dict()
+
+
+def test_note_model_from_trusted_dict_fills_missing_fields() -> None:
+    note = n.Note.from_trusted_dict(
+        {"url": "http://example.com", "text": "#a", "lat": LAT, "long": LONG}
+    )
+
+    assert str(note.code)
+    assert note.created
+    assert note.tags == ["a"]
+
+
+@pytest.mark.parametrize("country", ["", None])
+def test_note_model_from_trusted_dict_does_not_geocode(country) -> None:
+    data = n.Note(
+        url="http://example.com", text="#a", lat=LAT, long=LONG
+    ).to_dict()
+    data["country"] = country
+
+    with mock.patch.object(n.geo, "get_country_from_latlong") as geocode:
+        note = n.Note.from_trusted_dict(data)
+
+    geocode.assert_not_called()
+    assert note.country == country
+    assert note.tags == ["a"]
+
+
+def test_note_model_from_trusted_dict_validates_unknown_data() -> None:
+    data = {
+        "url": "http://example.com",
+        "lat": LAT,
+        "long": LONG,
+        "created": "1672531200",
+    }
+
+    with mock.patch.object(n.Note, "from_dict") as from_dict:
+        n.Note.from_trusted_dict(data)
+        n.Note.from_trusted_dict({"lat": LAT, "long": LONG})
+
+    assert from_dict.call_args_list == [
+        mock.call(data),
+        mock.call({"lat": LAT, "long": LONG}),
+    ]
+
+
 def test_note_model_to_dict() -> None:
     created = datetime.now()
     note = n.Note(
@@ -0,0 +1,36 @@
+import asyncio
+import threading
+from unittest import mock
+
+from jaanevis.repository import asyncrepo
+
+
+def test_async_repo_delegates_calls_to_repository() -> None:
+    repo = mock.Mock()
+    repo.list.return_value = ["note"]
+
+    result = asyncio.run(asyncrepo.AsyncRepo(repo).list(filters={}, limit=2))
+
+    assert result == ["note"]
+    repo.list.assert_called_once_with(filters={}, limit=2)
+
+
+def test_async_repo_runs_calls_off_the_event_loop_thread() -> None:
+    repo = mock.Mock()
+    repo.get_by_code.side_effect = lambda code: threading.get_ident()
+
+    async def call() -> tuple[int, int]:
+        worker = await asyncrepo.AsyncRepo(repo).get_by_code("code")
+        return threading.get_ident(), worker
+
+    loop_thread, worker_thread = asyncio.run(call())
+
+    assert loop_thread != worker_thread
+
+
+@mock.patch("jaanevis.repository.asyncrepo.repository")
+def test_async_repository_wraps_shared_repository(mock_repository) -> None:
+    repo = asyncio.run(asyncrepo.async_repository())
+
+    assert isinstance(repo, asyncrepo.AsyncRepo)
+    assert repo.repo is mock_repository()
@@ -1,9 +1,11 @@
 import json
+import os
 import uuid
 from datetime import datetime, timedelta
 from typing import Any
 from unittest import mock
 
+import numpy as np
 import pytest
 from pytz import timezone
 
@@ -13,6 +15,7 @@ from jaanevis.domain import session as s
 from jaanevis.domain import user as u
 from jaanevis.repository import memrepo
 from jaanevis.serializers import note_json_serializer as ser
+from jaanevis.utils import geo
 
 uuid_session = "554f8c37-b3a1-4846-a1b6-02cc4d158646"
 LAT, LONG = 30.0, 50.0
@@ -153,6 +156,39 @@ def test_repository_list_with_country_equal_filter(note_dicts) -> None:
     assert repo_notes[0].country == COUNTRY
 
 
+@pytest.fixture
+def geocode_cache():
+    geo.clear_geocode_cache()
+    yield
+    geo.clear_geocode_cache()
+
+
+def test_note_index_geocodes_stored_notes_at_once(
+    note_dicts, geocode_cache
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    with mock.patch(
+        "reverse_geocode.search",
+        return_value=[{"country_code": "IR"}, {"country_code": "TR"}],
+    ) as search:
+        repo_notes = repo.list(filters={"country__eq": "TR"})
+
+    search.assert_called_once_with([(LAT, LONG), (LAT + 1, LONG + 1)])
+    assert [note.lat for note in repo_notes] == [LAT + 1]
+
+
+def test_note_index_does_not_geocode_stored_notes_again(
+    note_dicts, geocode_cache
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    with mock.patch("reverse_geocode.search", return_value=[]) as search:
+        repo.list(filters={"tag__eq": "text"})
+
+    search.assert_called_once()
+
+
 def test_repository_list_with_tag_equal_filter(note_dicts) -> None:
     repo = memrepo.MemRepo(note_dicts)
 
@@ -221,7 +257,7 @@ def test_repository_update(note_dicts) -> None:
         created=CREATED,
         code=notes[0].code,
         creator=notes[0].creator,
-        **update_data
+        **update_data,
     )
 
     updated_note = repo.update(obj=notes[0], data=update_data)
@@ -385,6 +421,28 @@ def test_delete_session_by_session_id(mock_open, note_dicts) -> None:
     )
 
 
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_delete_expired_sessions(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    expired = [
+        repo.create_session(
+            email="test@test.com",
+            username="username",
+            session_id=str(uuid.uuid4()),
+            expire_time=(datetime.now() - timedelta(days=1)).timestamp(),
+        )
+        for _ in range(2)
+    ]
+
+    assert repo.delete_expired_sessions(datetime.now().timestamp()) == 2
+    assert repo.delete_expired_sessions(datetime.now().timestamp()) == 0
+
+    for session in expired:
+        assert repo.get_session_by_session_id(session.session_id) is None
+    assert repo.get_session_by_session_id(uuid_session) is not None
+    assert len(repo.data["sessions"]) == 1
+
+
 @mock.patch("jaanevis.repository.memrepo.open")
 def test_create_or_update_creates_new_session(mock_open, note_dicts) -> None:
     repo = memrepo.MemRepo(note_dicts)
@@ -565,3 +623,691 @@ def test_write_db_to_file_after_user_delete(path, note_dicts) -> None:
         repo.delete_user(username=username)
 
     mock_open.assert_called_with(DB_PATH, "w")
+
+
+@pytest.fixture
+def tmp_data_dir(tmp_path):
+    with mock.patch.object(settings, "DATA_BASE_DIR", tmp_path):
+        yield tmp_path
+
+
+def test_refresh_reloads_data_changed_by_another_process(
+    tmp_data_dir, note_dicts
+) -> None:
+    db_path = tmp_data_dir / "data/db.json"
+    repo = memrepo.MemRepo()
+
+    db_path.write_text(json.dumps(note_dicts))
+    repo.refresh()
+
+    assert repo.data == note_dicts
+
+
+def test_refresh_keeps_data_when_db_file_is_unchanged(
+    tmp_data_dir, note_dicts
+) -> None:
+    db_path = tmp_data_dir / "data/db.json"
+    db_path.parent.mkdir(parents=True)
+    db_path.write_text(json.dumps(note_dicts))
+    repo = memrepo.MemRepo()
+
+    with mock.patch.object(repo, "_read_data_from_file") as read_data:
+        repo.refresh()
+
+    read_data.assert_not_called()
+
+
+def test_refresh_does_not_reload_own_writes(tmp_data_dir) -> None:
+    repo = memrepo.MemRepo()
+    repo.create_user(email="a@a.com", username="username", password="pass")
+
+    with mock.patch.object(repo, "_read_data_from_file") as read_data:
+        repo.refresh()
+
+    read_data.assert_not_called()
+
+
+@pytest.fixture
+def journal_repo(tmp_data_dir):
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        yield memrepo.MemRepo()
+
+
+def test_journal_mode_appends_mutations_instead_of_rewriting_db(
+    journal_repo,
+) -> None:
+    note = n.Note(creator="default", url="https://example.com", lat=1, long=1)
+
+    journal_repo.add(note)
+    journal_repo.delete_by_code(code=str(note.code))
+
+    records = [
+        json.loads(line)
+        for line in journal_repo.journal_path.read_text().splitlines()
+    ]
+    assert [r["op"] for r in records] == ["note_add", "note_delete"]
+    assert not journal_repo.db_path.exists()
+
+
+def test_journal_is_replayed_on_startup(journal_repo) -> None:
+    note = n.Note(creator="default", url="https://example.com", lat=1, long=1)
+    journal_repo.add(note)
+    journal_repo.create_user(
+        email="a@a.com", username="username", password="pass"
+    )
+
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        repo = memrepo.MemRepo()
+
+    assert repo.get_by_code(code=str(note.code)).url == note.url
+    assert repo.get_user_by_username(username="username").email == "a@a.com"
+
+
+def test_journal_compaction_writes_snapshot_and_truncates_journal(
+    journal_repo,
+) -> None:
+    note = n.Note(creator="default", url="https://example.com", lat=1, long=1)
+    journal_repo.add(note)
+
+    journal_repo.compact()
+
+    assert journal_repo.journal_path.read_text() == ""
+    assert json.loads(journal_repo.db_path.read_text()) == journal_repo.data
+
+
+def test_journal_replay_on_top_of_compacted_snapshot_is_idempotent(
+    journal_repo,
+) -> None:
+    note = n.Note(creator="default", url="https://example.com", lat=1, long=1)
+    journal_repo.add(note)
+    journal = journal_repo.journal_path.read_text()
+    journal_repo.compact()
+    # crash between writing the snapshot and truncating the journal
+    journal_repo.journal_path.write_text(journal)
+
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        repo = memrepo.MemRepo()
+
+    assert len(repo.data["notes"]) == 1
+
+
+def test_journal_compaction_starts_in_background_after_threshold(
+    journal_repo,
+) -> None:
+    with mock.patch.object(
+        settings, "DB_JOURNAL_COMPACT_THRESHOLD", 2
+    ), mock.patch("jaanevis.repository.memrepo.threading.Thread") as thread:
+        journal_repo.delete_user(username="a")
+        thread.assert_not_called()
+        journal_repo.delete_user(username="b")
+
+    thread.assert_called_once_with(target=journal_repo.compact, daemon=True)
+    thread().start.assert_called_once()
+
+
+def test_refresh_replays_records_journaled_by_another_process(
+    journal_repo,
+) -> None:
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        other = memrepo.MemRepo()
+    other.create_user(email="a@a.com", username="username", password="pass")
+
+    journal_repo.refresh()
+
+    assert journal_repo.get_user_by_username(username="username")
+
+
+def test_commit_after_compaction_by_another_process(journal_repo) -> None:
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        other = memrepo.MemRepo()
+    for repo, username in ((journal_repo, "a"), (other, "b")):
+        repo.create_user(
+            email=f"{username}@a.com", username=username, password="pass"
+        )
+
+    journal_repo.compact()
+    other.create_user(email="c@a.com", username="c", password="pass")
+    journal_repo.create_user(email="d@a.com", username="d", password="pass")
+    other.create_user(email="e@a.com", username="e", password="pass")
+    journal_repo.refresh()
+
+    for repo in (journal_repo, other):
+        assert [user["username"] for user in repo.data["users"]] == [
+            "a",
+            "b",
+            "c",
+            "d",
+            "e",
+        ]
+
+
+def test_refresh_during_compaction_by_another_process(journal_repo) -> None:
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        other = memrepo.MemRepo()
+    for username in ("a", "b", "c"):
+        journal_repo.create_user(
+            email=f"{username}@a.com", username=username, password="pass"
+        )
+    replace = os.replace
+
+    def replace_then_refresh(src, dst) -> None:
+        replace(src, dst)
+        # the snapshot is in place but the journal is not truncated yet
+        other.refresh()
+
+    with mock.patch(
+        "jaanevis.repository.memrepo.os.replace", replace_then_refresh
+    ):
+        journal_repo.compact()
+    journal_repo.create_user(email="d@a.com", username="d", password="pass")
+    other.refresh()
+    assert other.get_user_by_username(username="d")
+
+    for username in ("e", "f", "g", "h"):
+        journal_repo.create_user(
+            email=f"{username}@a.com", username=username, password="pass"
+        )
+    other.refresh()
+
+    assert [user["username"] for user in other.data["users"]] == list(
+        "abcdefgh"
+    )
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_user_index_follows_username_change(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    user = repo.get_user_by_username(username="username")
+
+    repo.update_user(obj=user, data={"username": "newname"})
+
+    assert repo.get_user_by_username(username="username") is None
+    assert repo.get_user_by_username(username="newname").email == user.email
+    assert repo.get_user_by_email(email=user.email).username == "newname"
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_session_index_follows_session_update(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    new_session_id = str(uuid.uuid4())
+
+    repo.create_or_update_session(
+        email="test@test.com",
+        username="username",
+        session_id=new_session_id,
+        expire_time=0.0,
+    )
+
+    assert repo.get_session_by_session_id(session_id=uuid_session) is None
+    assert repo.get_session_by_session_id_and_email(
+        session_id=new_session_id, email="test@test.com"
+    )
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_note_index_follows_add_and_delete(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    new_note = n.Note(
+        creator="default", url="https://example.com", lat=1, long=1
+    )
+
+    repo.add(new_note)
+    assert repo.get_by_code(code=str(new_note.code)).url == new_note.url
+
+    repo.delete_by_code(code=str(new_note.code))
+    assert repo.get_by_code(code=str(new_note.code)) is None
+
+
+def test_lookups_do_not_scan_stored_items(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    repo.get_user_by_email(email="test@test.com")
+    repo.get_session_by_session_id(session_id=uuid_session)
+    repo.get_by_code(code=note_dicts["notes"][0]["code"])
+
+    repo._data = mock.MagicMock()
+
+    assert repo.get_user_by_email(email="test@test.com")
+    assert repo.get_session_by_session_id(session_id=uuid_session)
+    assert repo.get_by_code(code=note_dicts["notes"][0]["code"])
+    repo._data.__getitem__.assert_not_called()
+
+
+def test_repository_list_with_tag_in_filter(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    repo_notes = repo.list(filters={"tag__in": ["text", "some", "none"]})
+
+    assert len(repo_notes) == 2
+
+
+def test_repository_list_with_tag_all_filter(note_dicts) -> None:
+    note_dicts["notes"][0]["tags"] = ["text", "some"]
+    repo = memrepo.MemRepo(note_dicts)
+
+    repo_notes = repo.list(filters={"tag__all": ["text", "some"]})
+
+    assert [str(note.code) for note in repo_notes] == [
+        note_dicts["notes"][0]["code"]
+    ]
+
+
+def test_tag_filters_do_not_materialize_untagged_notes(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    with mock.patch.object(
+        n.Note, "from_trusted_dict", wraps=n.Note.from_trusted_dict
+    ) as from_dict:
+        repo.list(filters={"tag__eq": "text"})
+
+    assert from_dict.call_count == 1
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_tag_index_follows_note_changes(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    notes = repo.list(filters={"tag__eq": "text"})
+
+    repo.update(obj=notes[0], data={"tags": ["other"]})
+    assert repo.list(filters={"tag__eq": "text"}) == []
+    assert len(repo.list(filters={"tag__eq": "other"})) == 1
+
+    repo.delete_by_code(code=str(notes[0].code))
+    assert repo.list(filters={"tag__eq": "other"}) == []
+
+
+def test_unfiltered_page_only_materializes_page_notes(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    with mock.patch.object(
+        n.Note, "from_trusted_dict", wraps=n.Note.from_trusted_dict
+    ) as from_dict:
+        repo_notes = repo.list(limit=1, skip=1)
+
+    assert from_dict.call_count == 1
+    assert str(repo_notes[0].code) == note_dicts["notes"][0]["code"]
+
+
+def test_filtered_page_stops_scanning_when_filled(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    predicate = mock.Mock(return_value=True)
+
+    with mock.patch.dict(memrepo.NOTE_FILTERS, {"creator__eq": predicate}):
+        repo_notes = repo.list(filters={"creator__eq": "any"}, limit=1)
+
+    assert predicate.call_count == 1
+    assert str(repo_notes[0].code) == note_dicts["notes"][1]["code"]
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_note_timeline_follows_note_changes(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    older, newer = repo.list()[::-1]
+
+    repo.update(obj=older, data={"created": str(CREATED + timedelta(days=2))})
+    assert [note.code for note in repo.list()] == [older.code, newer.code]
+
+    repo.add(n.Note(url="https://example.com", lat=LAT, long=LONG))
+    repo.delete_by_code(code=str(older.code))
+    repo_notes = repo.list()
+    assert len(repo_notes) == 2
+    assert repo_notes[0].code == newer.code
+
+
+@pytest.mark.parametrize("filters", [None, {"creator__eq": "default"}])
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_list_after_cursor_is_stable_under_inserts(
+    mock_open, note_dicts, filters
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    newest = repo.list(limit=1)[0]
+    after = (newest.created.timestamp(), str(newest.code))
+
+    repo.add(
+        n.Note(
+            created=CREATED + timedelta(days=2),
+            creator="default",
+            url="https://example.com",
+            lat=LAT,
+            long=LONG,
+        )
+    )
+    repo_notes = repo.list(filters=filters, limit=1, after=after)
+
+    assert [str(note.code) for note in repo_notes] == [
+        note_dicts["notes"][0]["code"]
+    ]
+
+
+def test_list_after_cursor_with_tag_filter(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    newest = repo.list(limit=1)[0]
+    after = (newest.created.timestamp(), str(newest.code))
+
+    assert (
+        len(repo.list(filters={"tag__in": ["text", "some"]}, after=after)) == 1
+    )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"creator__eq": "default"},
+        {"tag__in": ["text", "some"]},
+        {"tag__eq": "text", "creator__eq": "default"},
+    ],
+)
+def test_list_without_location_filter_does_not_build_columns(
+    note_dicts, filters
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    newest = repo.list(limit=1)[0]
+    after = (newest.created.timestamp(), str(newest.code))
+
+    assert repo.list(filters=filters)
+    repo.list(filters=filters, after=after)
+
+    assert ("notes", "columns") not in repo._indexes
+
+
+@pytest.mark.parametrize(
+    "bbox, count",
+    [
+        ((LONG - 0.5, LAT - 0.5, LONG + 0.5, LAT + 0.5), 1),
+        ((LONG - 0.5, LAT - 0.5, LONG + 1, LAT + 1), 2),
+        ((LONG + 0.1, LAT + 0.1, LONG + 0.9, LAT + 0.9), 0),
+        ((-180, -90, 180, 90), 2),
+    ],
+)
+def test_repository_list_with_location_within_filter(
+    note_dicts, bbox, count
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    repo_notes = repo.list(filters={"location__within": bbox})
+
+    assert len(repo_notes) == count
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_location_grid_follows_note_changes(mock_open, note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    bbox = (9, 9, 11, 11)
+    note = repo.get_by_code(note_dicts["notes"][0]["code"])
+
+    assert repo.list(filters={"location__within": bbox}) == []
+    repo.update(obj=note, data={"lat": 10.0, "long": 10.0})
+    assert len(repo.list(filters={"location__within": bbox})) == 1
+
+    repo.delete_by_code(code=str(note.code))
+    assert repo.list(filters={"location__within": bbox}) == []
+
+
+@pytest.fixture
+def spread_note_dicts(note_dicts) -> dict[str, list[Any]]:
+    # notes about 0, 111, 222 and 1100 km north of LAT, LONG
+    template = note_dicts["notes"][0]
+    note_dicts["notes"] = [
+        {
+            **template,
+            "created": str(CREATED + timedelta(hours=i)),
+            "code": str(uuid.uuid4()),
+            "url": f"http://example.com/spread/{i}",
+            "lat": LAT + lat_offset,
+        }
+        for i, lat_offset in enumerate([0, 1, 2, 10])
+    ]
+    return note_dicts
+
+
+@pytest.mark.parametrize("radius_km, count", [(50, 1), (150, 2), (2000, 4)])
+def test_repository_list_with_location_radius_filter(
+    spread_note_dicts, radius_km, count
+) -> None:
+    repo = memrepo.MemRepo(spread_note_dicts)
+
+    repo_notes = repo.list(
+        filters={"location__radius": (LAT, LONG, radius_km)}
+    )
+
+    assert len(repo_notes) == count
+
+
+def test_repository_list_nearest_notes(spread_note_dicts) -> None:
+    repo = memrepo.MemRepo(spread_note_dicts)
+
+    repo_notes = repo.list(filters={"location__nearest": (LAT + 11, LONG, 2)})
+
+    assert [note.lat for note in repo_notes] == [LAT + 10, LAT + 2]
+
+
+def test_repository_list_nearest_notes_within_radius(
+    spread_note_dicts,
+) -> None:
+    repo = memrepo.MemRepo(spread_note_dicts)
+
+    repo_notes = repo.list(
+        filters={
+            "location__nearest": (LAT, LONG, 3),
+            "location__radius": (LAT, LONG, 150),
+        }
+    )
+
+    assert [note.lat for note in repo_notes] == [LAT, LAT + 1]
+
+
+def test_location_filters_combine_with_tags_and_cursor(
+    spread_note_dicts,
+) -> None:
+    spread_note_dicts["notes"][1]["tags"] = ["other"]
+    repo = memrepo.MemRepo(spread_note_dicts)
+    filters = {"location__radius": (LAT, LONG, 300), "tag__eq": "text"}
+
+    newest, oldest = repo.list(filters=filters)
+    after = (newest.created.timestamp(), str(newest.code))
+
+    assert (newest.lat, oldest.lat) == (LAT + 2, LAT)
+    assert repo.list(filters=filters, after=after) == [oldest]
+
+
+def test_location_filters_do_not_check_notes_one_by_one(
+    spread_note_dicts,
+) -> None:
+    repo = memrepo.MemRepo(spread_note_dicts)
+
+    with mock.patch.object(memrepo.geo, "haversine_km") as haversine_km:
+        repo_notes = repo.list(filters={"location__radius": (LAT, LONG, 150)})
+
+    haversine_km.assert_not_called()
+    assert [note.lat for note in repo_notes] == [LAT + 1, LAT]
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_note_columns_follow_note_changes(
+    mock_open, spread_note_dicts
+) -> None:
+    repo = memrepo.MemRepo(spread_note_dicts)
+    codes = [note["code"] for note in spread_note_dicts["notes"]]
+    bbox = (LONG - 1, LAT + 5, LONG + 1, LAT + 15)
+    assert [
+        str(note.code)
+        for note in repo.list(filters={"location__within": bbox})
+    ] == [codes[3]]
+
+    # deleting a row moves the last one into its place
+    repo.delete_by_code(code=codes[0])
+    repo.update(obj=repo.get_by_code(codes[1]), data={"lat": LAT + 6})
+    repo.add(
+        n.Note(
+            created=CREATED + timedelta(hours=5),
+            url="https://example.com",
+            lat=LAT + 7,
+            long=LONG,
+        )
+    )
+
+    repo_notes = repo.list(filters={"location__within": bbox})
+    assert [note.lat for note in repo_notes] == [LAT + 7, LAT + 10, LAT + 6]
+    columns = repo._note_index("columns")
+    assert columns.size == 4
+    assert {columns.codes[row]: row for row in range(4)} == columns.rows
+
+
+def test_haversine_km_array_matches_haversine_km() -> None:
+    lats, longs = np.array([LAT, -LAT, 0.0]), np.array([LONG, 170.0, -170])
+
+    distances = geo.haversine_km_array(LAT + 1, LONG, lats, longs)
+
+    assert distances == pytest.approx(
+        [
+            geo.haversine_km(LAT + 1, LONG, lat, long)
+            for lat, long in zip(lats, longs, strict=True)
+        ]
+    )
+
+
+def test_repository_clusters_group_notes_by_zoom(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    (cluster,) = repo.clusters(zoom=0)
+    assert cluster.count == 2
+    assert (cluster.lat, cluster.long) == (LAT + 0.5, LONG + 0.5)
+    assert cluster.code is None
+
+    clusters = sorted(repo.clusters(zoom=10), key=lambda c: c.lat)
+    assert [c.count for c in clusters] == [1, 1]
+    assert [c.code for c in clusters] == [
+        note["code"] for note in note_dicts["notes"]
+    ]
+    assert (clusters[0].lat, clusters[0].long) == (LAT, LONG)
+
+
+def test_repository_clusters_within_bbox(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    clusters = repo.clusters(
+        zoom=10, bbox=(LONG - 0.1, LAT - 0.1, LONG + 0.1, LAT + 0.1)
+    )
+
+    assert [c.code for c in clusters] == [note_dicts["notes"][0]["code"]]
+
+
+def test_repository_clusters_skip_single_cluster_without_note(
+    note_dicts,
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+
+    with mock.patch.object(repo, "_note_in_cluster", return_value=None):
+        assert repo.clusters(zoom=10) == []
+    assert repo.clusters(zoom=0)[0].count == 2
+
+
+@mock.patch("jaanevis.repository.memrepo.open")
+def test_repository_clusters_follow_note_changes(
+    mock_open, note_dicts
+) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    assert repo.clusters(zoom=0)[0].count == 2
+
+    repo.add(n.Note(url="https://example.com", lat=LAT, long=LONG))
+    assert repo.clusters(zoom=0)[0].count == 3
+
+    note = repo.get_by_code(note_dicts["notes"][0]["code"])
+    repo.update(obj=note, data={"lat": -LAT, "long": -LONG})
+    assert sorted(c.count for c in repo.clusters(zoom=0)) == [1, 2]
+
+    repo.delete_by_code(code=str(note.code))
+    assert [c.count for c in repo.clusters(zoom=0)] == [2]
+
+
+def test_repository_get_many_by_code(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    codes = [note["code"] for note in note_dicts["notes"]]
+
+    notes = repo.get_many_by_code([codes[1], "missing", codes[0]])
+
+    assert [str(note.code) for note in notes] == [codes[1], codes[0]]
+
+
+def test_repository_add_many_writes_db_once(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    repo._write_data_to_file = mock.Mock()
+    new_notes = [
+        n.Note(url=f"https://example.com/{i}", lat=i, long=i) for i in range(3)
+    ]
+
+    repo.add_many(new_notes)
+
+    repo._write_data_to_file.assert_called_once()
+    assert len(repo.list()) == 5
+    assert repo.get_by_code(str(new_notes[2].code)).url == new_notes[2].url
+    assert len(repo.list(filters={"location__within": (-1, -1, 1, 1)})) == 2
+
+
+def test_repository_update_many(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    repo._write_data_to_file = mock.Mock()
+    codes = [note["code"] for note in note_dicts["notes"]]
+
+    updated = repo.update_many(
+        {codes[0]: {"text": "#new"}, codes[1]: {"lat": -LAT}}
+    )
+
+    repo._write_data_to_file.assert_called_once()
+    assert [note.text for note in updated] == ["#new", "#some text"]
+    assert repo.get_by_code(codes[1]).lat == -LAT
+
+
+def test_repository_delete_many_by_code(note_dicts) -> None:
+    repo = memrepo.MemRepo(note_dicts)
+    repo._write_data_to_file = mock.Mock()
+    codes = [note["code"] for note in note_dicts["notes"]]
+
+    deleted = repo.delete_many_by_code(codes)
+
+    repo._write_data_to_file.assert_called_once()
+    assert [str(note.code) for note in deleted] == codes
+    assert repo.list() == []
+    assert repo.get_by_code(codes[0]) is None
+    assert repo.clusters(zoom=0) == []
+
+
+def test_journal_records_batches_as_single_records(journal_repo) -> None:
+    notes = [
+        n.Note(url=f"https://example.com/{i}", lat=i, long=i) for i in range(3)
+    ]
+    codes = [str(note.code) for note in notes]
+
+    journal_repo.add_many(notes)
+    journal_repo.update_many({code: {"text": "text"} for code in codes})
+    journal_repo.delete_many_by_code(codes[:2])
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        repo = memrepo.MemRepo()
+
+    records = journal_repo.journal_path.read_text().splitlines()
+    assert [json.loads(r)["op"] for r in records] == [
+        "note_add_many",
+        "note_update_many",
+        "note_delete_many",
+    ]
+    assert [str(note.code) for note in repo.list()] == codes[2:]
+    assert repo.list()[0].text == "text"
+
+
+def test_journal_records_expired_sessions_as_single_record(
+    journal_repo,
+) -> None:
+    for expire_time in (1.0, 2.0, 4102444800.0):
+        journal_repo.create_session(
+            email="a@a.com",
+            username="username",
+            session_id=str(uuid.uuid4()),
+            expire_time=expire_time,
+        )
+
+    assert journal_repo.delete_expired_sessions(3.0) == 2
+    with mock.patch.object(settings, "DB_JOURNAL", True):
+        repo = memrepo.MemRepo()
+
+    records = journal_repo.journal_path.read_text().splitlines()
+    assert json.loads(records[-1])["op"] == "session_delete_many"
+    assert [s["expire_time"] for s in repo.data["sessions"]] == [4102444800.0]
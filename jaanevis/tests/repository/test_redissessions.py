@@ -0,0 +1,109 @@
+import uuid
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from jaanevis.repository import redissessions
+
+EMAIL, USERNAME = "test@test.com", "username"
+
+
+@pytest.fixture
+def store() -> redissessions.RedisSessionStore:
+    return redissessions.RedisSessionStore(fakeredis.FakeRedis())
+
+
+def expire_in(**delta: float) -> float:
+    return (datetime.now() + timedelta(**delta)).timestamp()
+
+
+def test_create_and_get_session(store) -> None:
+    session_id = str(uuid.uuid4())
+
+    session = store.create_session(
+        email=EMAIL,
+        username=USERNAME,
+        session_id=session_id,
+        expire_time=expire_in(days=1),
+    )
+
+    assert store.get_session_by_session_id(session_id) == session
+    assert store.get_session_by_session_id_and_email(session_id, EMAIL)
+    assert store.get_session_by_session_id_and_username(session_id, USERNAME)
+    assert (
+        store.get_session_by_session_id_and_email(session_id, "a@a.com")
+        is None
+    )
+    assert store.get_session_by_session_id(str(uuid.uuid4())) is None
+
+
+def test_sessions_expire_at_their_expire_time(store) -> None:
+    session_id = str(uuid.uuid4())
+
+    store.create_session(
+        email=EMAIL,
+        username=USERNAME,
+        session_id=session_id,
+        expire_time=expire_in(hours=1),
+    )
+
+    assert 3500 < store.redis.ttl(store._key(session_id)) <= 3601
+    assert 3500 < store.redis.ttl(store._user_key(USERNAME)) <= 3601
+
+
+def test_create_or_update_session_replaces_session_of_user(store) -> None:
+    old_id, new_id = str(uuid.uuid4()), str(uuid.uuid4())
+    store.create_or_update_session(
+        email=EMAIL,
+        username=USERNAME,
+        session_id=old_id,
+        expire_time=expire_in(days=1),
+    )
+
+    store.create_or_update_session(
+        email=EMAIL,
+        username=USERNAME,
+        session_id=new_id,
+        expire_time=expire_in(days=1),
+    )
+
+    assert store.get_session_by_session_id(old_id) is None
+    assert store.get_session_by_session_id(new_id).username == USERNAME
+    assert store.redis.get(store._user_key(USERNAME)) == new_id.encode()
+
+
+def test_delete_session(store) -> None:
+    session_id = str(uuid.uuid4())
+    store.create_session(
+        email=EMAIL,
+        username=USERNAME,
+        session_id=session_id,
+        expire_time=expire_in(days=1),
+    )
+
+    assert store.delete_session_by_session_id(session_id)
+    assert store.get_session_by_session_id(session_id) is None
+    assert store.redis.get(store._user_key(USERNAME)) is None
+    assert store.delete_session_by_session_id(session_id)
+
+
+def test_delete_old_session_keeps_latest_session_of_user(store) -> None:
+    old_id, new_id = str(uuid.uuid4()), str(uuid.uuid4())
+    for session_id in (old_id, new_id):
+        store.create_session(
+            email=EMAIL,
+            username=USERNAME,
+            session_id=session_id,
+            expire_time=expire_in(days=1),
+        )
+
+    store.delete_session_by_session_id(old_id)
+
+    assert store.redis.get(store._user_key(USERNAME)) == new_id.encode()
+
+
+def test_delete_expired_sessions_is_left_to_redis(store) -> None:
+    store.create_session(EMAIL, USERNAME, str(uuid.uuid4()), expire_in(days=1))
+
+    assert store.delete_expired_sessions(expire_in(days=2)) == 0
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from jaanevis.repository import base
+
+
+@mock.patch.object(base, "_shared_repository", None)
+@mock.patch("jaanevis.repository.memrepo.MemRepo")
+def test_repository_is_shared_between_calls(mock_repo) -> None:
+    first = base.repository()
+    second = base.repository()
+
+    assert first is second
+    mock_repo.assert_called_once()
+
+
+@mock.patch.object(base, "_shared_repository", None)
+@mock.patch("jaanevis.repository.memrepo.MemRepo")
+def test_repository_is_refreshed_on_every_call(mock_repo) -> None:
+    base.repository()
+    base.repository()
+
+    assert mock_repo().refresh.call_count == 2
+
+
+@mock.patch.object(base, "_shared_repository", None)
+@mock.patch.object(base.settings, "REPOSITORY", "sqlite")
+@mock.patch("jaanevis.repository.sqliterepo.SQLiteRepo")
+def test_repository_selected_through_settings(mock_repo) -> None:
+    assert base.repository() is mock_repo()
+
+
+@mock.patch.object(base, "_shared_repository", None)
+@mock.patch.object(base.settings, "SESSION_STORE", "redis")
+@mock.patch("jaanevis.repository.redissessions.redis_session_store")
+@mock.patch("jaanevis.repository.memrepo.MemRepo")
+def test_sessions_answered_by_session_store(mock_repo, session_store) -> None:
+    repo = base.repository()
+
+    repo.get_session_by_session_id(session_id="id")
+    repo.get_by_code(code="code")
+
+    session_store().get_session_by_session_id.assert_called_once_with(
+        session_id="id"
+    )
+    mock_repo().get_session_by_session_id.assert_not_called()
+    mock_repo().get_by_code.assert_called_once_with(code="code")
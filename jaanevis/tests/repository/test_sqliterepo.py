@@ -0,0 +1,354 @@
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pytz import timezone
+
+from jaanevis.domain import note as n
+from jaanevis.domain import session as s
+from jaanevis.domain import user as u
+from jaanevis.repository import sqliterepo
+
+uuid_session = "554f8c37-b3a1-4846-a1b6-02cc4d158646"
+LAT, LONG = 30.0, 50.0
+COUNTRY = "IR"
+CREATED = datetime.now(timezone("Asia/Tehran"))
+
+
+@pytest.fixture
+def notes() -> list[n.Note]:
+    return [
+        n.Note(
+            created=CREATED,
+            code=str(uuid.uuid4()),
+            creator="default",
+            url="http://example.com/1",
+            text="some #text",
+            lat=LAT,
+            long=LONG,
+        ),
+        n.Note(
+            created=CREATED + timedelta(days=1),
+            code=str(uuid.uuid4()),
+            creator="default2",
+            url="http://example.com/2",
+            text="#some text",
+            lat=LAT + 1,
+            long=LONG + 1,
+        ),
+    ]
+
+
+@pytest.fixture
+def repo(tmp_path, notes) -> sqliterepo.SQLiteRepo:
+    repo = sqliterepo.SQLiteRepo(db_path=tmp_path / "db.sqlite3")
+    for note in notes:
+        repo.add(note)
+    repo.create_user(
+        email="test@test.com", username="username", password="password"
+    )
+    repo.create_session(
+        email="test@test.com",
+        username="username",
+        session_id=uuid_session,
+        expire_time=(datetime.now() + timedelta(days=1)).timestamp(),
+    )
+    return repo
+
+
+def test_sqlite_repository_uses_wal_mode(repo) -> None:
+    conn = sqlite3.connect(repo.db_path)
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_repository_list_sorted_by_created(repo, notes) -> None:
+    assert repo.list() == notes[::-1]
+
+
+def test_sqlite_repository_list_with_limit_skip(repo, notes) -> None:
+    assert repo.list(limit=1, skip=1) == [notes[0]]
+
+
+def test_sqlite_repository_list_after_cursor(repo, notes) -> None:
+    newest = notes[-1]
+    after = (newest.created.timestamp(), str(newest.code))
+
+    assert repo.list(after=after) == notes[-2::-1]
+    assert repo.list(limit=1, after=after) == [notes[-2]]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"creator__eq": "default"},
+        {"url__eq": "http://example.com/1"},
+        {"lat__eq": LAT},
+        {"long__eq": LONG},
+        {"tag__eq": "text"},
+    ],
+)
+def test_sqlite_repository_list_with_filters(repo, notes, filters) -> None:
+    assert repo.list(filters=filters) == [notes[0]]
+
+
+def test_sqlite_repository_list_with_country_filter(repo, notes) -> None:
+    assert repo.list(filters={"country__eq": COUNTRY}) == notes[::-1]
+
+
+def test_sqlite_repository_get_by_code(repo, notes) -> None:
+    assert repo.get_by_code(code=str(notes[0].code)) == notes[0]
+    assert repo.get_by_code(code="nocode") is None
+
+
+def test_sqlite_repository_delete_by_code(repo, notes) -> None:
+    assert repo.delete_by_code(code=str(notes[0].code)) == notes[0]
+    assert repo.get_by_code(code=str(notes[0].code)) is None
+    assert repo.list(filters={"tag__eq": "text"}) == []
+
+
+def test_sqlite_repository_update(repo, notes) -> None:
+    updated = repo.update(obj=notes[0], data={"url": "https://newurl.com"})
+
+    assert updated.url == "https://newurl.com"
+    assert repo.get_by_code(code=str(notes[0].code)) == updated
+
+
+def test_sqlite_repository_users(repo) -> None:
+    user = u.User(
+        email="test@test.com", username="username", password="password"
+    )
+
+    assert repo.get_user_by_username(username="username") == user
+    assert repo.get_user_by_email(email="test@test.com") == user
+
+    updated = repo.update_user(obj=user, data={"is_active": True})
+    assert updated.is_active is True
+
+    repo.delete_user(username="username")
+    assert repo.get_user_by_username(username="username") is None
+
+
+def test_sqlite_repository_rejects_duplicate_username(repo) -> None:
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.create_user(
+            email="other@test.com", username="username", password="password"
+        )
+
+
+def test_sqlite_repository_sessions(repo) -> None:
+    session = repo.get_session_by_session_id(session_id=uuid_session)
+
+    assert session.username == "username"
+    assert repo.get_session_by_session_id_and_email(
+        session_id=uuid_session, email="test@test.com"
+    )
+    assert repo.get_session_by_session_id_and_username(
+        session_id=uuid_session, username="username"
+    )
+    assert not repo.get_session_by_session_id_and_username(
+        session_id=uuid_session, username="other"
+    )
+
+    repo.delete_session_by_session_id(session_id=uuid_session)
+    assert repo.get_session_by_session_id(session_id=uuid_session) is None
+
+
+def test_sqlite_repository_create_or_update_session(repo) -> None:
+    new_session_id = str(uuid.uuid4())
+
+    session = repo.create_or_update_session(
+        email="test@test.com",
+        username="username",
+        session_id=new_session_id,
+        expire_time=0.0,
+    )
+
+    assert session == s.Session(
+        email="test@test.com",
+        username="username",
+        session_id=new_session_id,
+        expire_time=0.0,
+    )
+    assert repo.get_session_by_session_id(session_id=uuid_session) is None
+    assert repo.get_session_by_session_id(session_id=new_session_id)
+
+
+def test_sqlite_repository_delete_expired_sessions(repo) -> None:
+    expired_session_id = str(uuid.uuid4())
+    repo.create_session(
+        email="test@test.com",
+        username="username",
+        session_id=expired_session_id,
+        expire_time=(datetime.now() - timedelta(days=1)).timestamp(),
+    )
+
+    assert repo.delete_expired_sessions(datetime.now().timestamp()) == 1
+    assert repo.get_session_by_session_id(expired_session_id) is None
+    assert repo.get_session_by_session_id(uuid_session)
+
+
+def test_sqlite_repository_list_with_tag_in_filter(repo, notes) -> None:
+    filters = {"tag__in": ["text", "some", "none"]}
+
+    assert repo.list(filters=filters) == notes[::-1]
+
+
+def test_sqlite_repository_list_with_tag_all_filter(repo, notes) -> None:
+    repo.update(obj=notes[0], data={"tags": ["text", "some"]})
+
+    result = repo.list(filters={"tag__all": ["text", "some"]})
+
+    assert [note.code for note in result] == [notes[0].code]
+
+
+def test_sqlite_repository_list_with_location_within_filter(
+    repo, notes
+) -> None:
+    bbox = (LONG - 0.5, LAT - 0.5, LONG + 0.5, LAT + 0.5)
+
+    assert repo.list(filters={"location__within": bbox}) == [notes[0]]
+
+    repo.update(obj=notes[0], data={"lat": 10.0, "long": 10.0})
+    assert repo.list(filters={"location__within": bbox}) == []
+
+    repo.delete_by_code(code=str(notes[0].code))
+    assert repo.list(filters={"location__within": (9, 9, 11, 11)}) == []
+
+
+@pytest.fixture
+def spread_repo(tmp_path) -> sqliterepo.SQLiteRepo:
+    repo = sqliterepo.SQLiteRepo(db_path=tmp_path / "spread.sqlite3")
+    # notes about 0, 111, 222 and 1100 km north of LAT, LONG
+    for i, lat_offset in enumerate([0, 1, 2, 10]):
+        repo.add(
+            n.Note(
+                created=CREATED + timedelta(hours=i),
+                url=f"http://example.com/spread/{i}",
+                lat=LAT + lat_offset,
+                long=LONG,
+            )
+        )
+    return repo
+
+
+@pytest.mark.parametrize("radius_km, count", [(50, 1), (150, 2), (2000, 4)])
+def test_sqlite_repository_list_with_location_radius_filter(
+    spread_repo, radius_km, count
+) -> None:
+    notes = spread_repo.list(
+        filters={"location__radius": (LAT, LONG, radius_km)}
+    )
+
+    assert len(notes) == count
+
+
+def test_sqlite_repository_list_nearest_notes(spread_repo) -> None:
+    notes = spread_repo.list(
+        filters={"location__nearest": (LAT + 11, LONG, 2)}
+    )
+
+    assert [note.lat for note in notes] == [LAT + 10, LAT + 2]
+    assert (
+        spread_repo.list(
+            filters={"location__nearest": (LAT + 11, LONG, 2)}, limit=1, skip=1
+        )
+        == notes[1:]
+    )
+
+
+def test_sqlite_repository_clusters(repo, notes) -> None:
+    (cluster,) = repo.clusters(zoom=0)
+    assert cluster.count == 2
+    assert cluster.code is None
+
+    clusters = sorted(repo.clusters(zoom=10), key=lambda c: c.lat)
+    assert [c.code for c in clusters] == [str(note.code) for note in notes]
+
+    bbox = (LONG - 0.1, LAT - 0.1, LONG + 0.1, LAT + 0.1)
+    assert [c.code for c in repo.clusters(zoom=10, bbox=bbox)] == [
+        str(notes[0].code)
+    ]
+
+
+def test_sqlite_repository_clusters_fetch_single_notes_at_once(
+    repo, notes
+) -> None:
+    statements = []
+    repo._connection().set_trace_callback(statements.append)
+
+    clusters = repo.clusters(zoom=10)
+
+    assert sorted(c.code for c in clusters) == sorted(
+        str(note.code) for note in notes
+    )
+    assert len(statements) == 2
+
+
+def test_sqlite_repository_clusters_follow_note_changes(repo, notes) -> None:
+    repo.update(obj=notes[0], data={"lat": -LAT, "long": -LONG})
+    assert sorted(c.count for c in repo.clusters(zoom=0)) == [1, 1]
+
+    repo.delete_by_code(code=str(notes[0].code))
+    assert [c.count for c in repo.clusters(zoom=0)] == [1]
+
+
+def test_sqlite_repository_builds_clusters_of_existing_notes(repo) -> None:
+    with repo._connection() as conn:
+        conn.execute("DELETE FROM cluster_zooms")
+        conn.execute("DELETE FROM note_clusters")
+
+    reopened = sqliterepo.SQLiteRepo(db_path=repo.db_path)
+
+    assert reopened.clusters(zoom=0)[0].count == 2
+
+
+def test_sqlite_repository_get_many_by_code(repo, notes) -> None:
+    codes = [str(note.code) for note in notes]
+
+    found = repo.get_many_by_code([*codes, "missing"])
+
+    assert sorted(found, key=lambda note: note.created) == notes
+
+
+def test_sqlite_repository_add_many(repo, notes) -> None:
+    new_notes = [
+        n.Note(
+            code=str(uuid.uuid4()),
+            created=CREATED - timedelta(days=i + 1),
+            url=f"https://example.com/{i}",
+            text="#batch",
+            lat=i,
+            long=i,
+        )
+        for i in range(3)
+    ]
+
+    repo.add_many(new_notes)
+
+    assert repo.list() == notes[::-1] + new_notes
+    assert repo.list(filters={"tag__in": ["batch"]}) == new_notes
+    assert repo.clusters(zoom=0)[0].count == 5
+
+
+def test_sqlite_repository_update_many(repo, notes) -> None:
+    codes = [str(note.code) for note in notes]
+
+    updated = repo.update_many(
+        {codes[0]: {"tags": ["new"]}, codes[1]: {"lat": -LAT}}
+    )
+
+    assert len(updated) == 2
+    assert repo.get_by_code(codes[0]).tags == ["new"]
+    assert repo.get_by_code(codes[1]).lat == -LAT
+
+
+def test_sqlite_repository_delete_many_by_code(repo, notes) -> None:
+    codes = [str(note.code) for note in notes]
+
+    deleted = repo.delete_many_by_code(codes)
+
+    assert sorted(deleted, key=lambda note: note.created) == notes
+    assert repo.list() == []
+    assert repo.clusters(zoom=0) == []
@@ -0,0 +1,87 @@
+import uuid
+from unittest import mock
+
+import pytest
+
+from jaanevis.config import settings
+from jaanevis.domain import note as n
+from jaanevis.domain import user as u
+from jaanevis.requests import note_batch_request as req
+
+user = u.User(email="a@a.com", username="username", password="password")
+notes = [
+    n.Note(url=f"https://example.com/{i}", lat=i, long=i) for i in range(2)
+]
+
+
+def test_build_add_notes_request() -> None:
+    request = req.AddNotesRequest.build(notes=notes, user=user)
+
+    assert bool(request) is True
+    assert request.notes == notes
+    assert request.user == user
+
+
+@pytest.mark.parametrize(
+    "items, message",
+    [
+        ([], "Empty batch"),
+        (notes * 2, "Too many notes in batch"),
+        (["note"], "Invalid note type"),
+        ([notes[0], notes[0]], "Duplicate note codes"),
+    ],
+)
+def test_build_add_notes_request_with_invalid_notes(items, message) -> None:
+    with mock.patch.object(settings, "NOTE_BATCH_MAX_SIZE", 3):
+        request = req.AddNotesRequest.build(notes=items, user=user)
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == "body"
+    assert request.errors[0]["message"] == message
+
+
+def test_build_add_notes_request_with_invalid_user() -> None:
+    request = req.AddNotesRequest.build(notes=notes, user=None)
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == "user"
+
+
+def test_build_update_notes_request() -> None:
+    updates = [n.NoteBatchUpdateApi(code="a", text="text")]
+
+    request = req.UpdateNotesRequest.build(notes=updates, user=user)
+
+    assert bool(request) is True
+    assert request.notes == updates
+
+
+def test_build_update_notes_request_with_duplicate_codes() -> None:
+    updates = [n.NoteBatchUpdateApi(code="a"), n.NoteBatchUpdateApi(code="a")]
+
+    request = req.UpdateNotesRequest.build(notes=updates, user=user)
+
+    assert bool(request) is False
+    assert request.errors[0]["message"] == "Duplicate note codes"
+
+
+def test_build_delete_notes_request() -> None:
+    codes = [str(uuid.uuid4()), str(uuid.uuid4())]
+
+    request = req.DeleteNotesRequest.build(codes=codes, user=user)
+
+    assert bool(request) is True
+    assert request.codes == codes
+
+
+@pytest.mark.parametrize(
+    "codes, parameter",
+    [([], "body"), (["a", ""], "code"), (["a", "a"], "code")],
+)
+def test_build_delete_notes_request_with_invalid_codes(
+    codes, parameter
+) -> None:
+    request = req.DeleteNotesRequest.build(codes=codes, user=user)
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == parameter
@@ -0,0 +1,31 @@
+import pytest
+
+from jaanevis.requests.note_cluster_request import NoteClusterRequest
+
+
+def test_build_note_cluster_request() -> None:
+    request = NoteClusterRequest.build(zoom=3, bbox="49,29,51,31")
+
+    assert bool(request) is True
+    assert request.zoom == 3
+    assert request.bbox == (49, 29, 51, 31)
+
+
+def test_build_note_cluster_request_without_bbox() -> None:
+    request = NoteClusterRequest.build(zoom=0)
+
+    assert bool(request) is True
+    assert request.bbox is None
+
+
+@pytest.mark.parametrize(
+    "zoom, bbox, parameter",
+    [(-1, None, "zoom"), ("1", None, "zoom"), (1, "1,2,3", "bbox")],
+)
+def test_build_note_cluster_request_with_invalid_values(
+    zoom, bbox, parameter
+) -> None:
+    request = NoteClusterRequest.build(zoom=zoom, bbox=bbox)
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == parameter
@@ -0,0 +1,35 @@
+from jaanevis.requests.note_export_request import NoteExportRequest
+
+
+def test_build_note_export_request() -> None:
+    request = NoteExportRequest.from_dict(
+        {"format": "csv", "filters": {"creator__eq": "a", "tag__eq": None}}
+    )
+
+    assert bool(request) is True
+    assert request.format == "csv"
+    assert request.filters == {"creator__eq": "a"}
+
+
+def test_build_note_export_request_parses_location_filters() -> None:
+    request = NoteExportRequest.from_dict(
+        {"format": "ndjson", "filters": {"location__within": "1,2,3,4"}}
+    )
+
+    assert request.filters == {"location__within": (1.0, 2.0, 3.0, 4.0)}
+
+
+def test_build_note_export_request_with_invalid_format() -> None:
+    request = NoteExportRequest.from_dict({"format": "xml", "filters": {}})
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == "format"
+
+
+def test_build_note_export_request_with_invalid_filters() -> None:
+    request = NoteExportRequest.from_dict(
+        {"format": "csv", "filters": {"wrong__eq": 1}}
+    )
+
+    assert bool(request) is False
+    assert request.errors[0]["parameter"] == "filters"
@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
+
 import pytest
 
 from jaanevis.requests import note_list_request as req
+from jaanevis.utils.cursor import encode_cursor
 
 
 def test_build_note_list_request_without_parameters() -> None:
@@ -106,3 +109,110 @@ def test_build_note_list_request_from_dict_with_limit_skip() -> None:
     assert bool(request) is True
     assert request.limit == 10
     assert request.skip == 5
+
+
+@pytest.mark.parametrize("key", ["tag__in", "tag__all"])
+def test_build_note_list_request_tag_list_filters(key: str) -> None:
+    filters = {key: ["a", "b"]}
+
+    request = req.NoteListRequest.from_dict({"filters": filters})
+
+    assert request.filters == {key: ["a", "b"]}
+    assert bool(request) is True
+
+
+@pytest.mark.parametrize("key", ["tag__in", "tag__all"])
+def test_build_note_list_request_rejects_non_list_tag_filters(
+    key: str,
+) -> None:
+    request = req.NoteListRequest.from_dict({"filters": {key: "a"}})
+
+    assert request.has_errors()
+    assert request.errors[0]["parameter"] == "filters"
+
+
+@pytest.mark.parametrize("key", ["tag__in", "tag__all"])
+def test_build_note_list_request_drops_empty_tag_filters(key: str) -> None:
+    request = req.NoteListRequest.from_dict({"filters": {key: []}})
+
+    assert request.filters == {}
+    assert bool(request) is True
+
+
+def test_build_note_list_request_decodes_cursor() -> None:
+    created = datetime.now(timezone.utc)
+    cursor = encode_cursor(created, "code")
+
+    request = req.NoteListRequest.from_dict({"cursor": cursor})
+
+    assert bool(request) is True
+    assert request.after == (created.timestamp(), "code")
+
+
+@pytest.mark.parametrize("cursor", ["invalid", "bnVsbA", "WzEsIDJd"])
+def test_build_note_list_request_rejects_invalid_cursor(cursor: str) -> None:
+    request = req.NoteListRequest.from_dict({"cursor": cursor})
+
+    assert request.has_errors()
+    assert request.errors[0]["parameter"] == "cursor"
+
+
+@pytest.mark.parametrize(
+    "bbox", ["49.5,29.5,50.5,30.5", [49.5, 29.5, 50.5, 30.5]]
+)
+def test_build_note_list_request_location_within_filter(bbox) -> None:
+    request = req.NoteListRequest.from_dict(
+        {"filters": {"location__within": bbox}}
+    )
+
+    assert bool(request) is True
+    assert request.filters == {"location__within": (49.5, 29.5, 50.5, 30.5)}
+
+
+@pytest.mark.parametrize(
+    "bbox", ["1,2,3", "a,b,c,d", "10,0,0,10", "0,-91,10,10", 5]
+)
+def test_build_note_list_request_rejects_invalid_bbox(bbox) -> None:
+    request = req.NoteListRequest.from_dict(
+        {"filters": {"location__within": bbox}}
+    )
+
+    assert request.has_errors()
+    assert request.errors[0]["parameter"] == "filters"
+
+
+@pytest.mark.parametrize(
+    "key, value, expected",
+    [
+        ("location__radius", "30,50,2.5", (30.0, 50.0, 2.5)),
+        ("location__radius", ["30", "50", 10], (30.0, 50.0, 10.0)),
+        ("location__nearest", "30,50,3", (30.0, 50.0, 3)),
+    ],
+)
+def test_build_note_list_request_location_point_filters(
+    key, value, expected
+) -> None:
+    request = req.NoteListRequest.from_dict({"filters": {key: value}})
+
+    assert bool(request) is True
+    assert request.filters == {key: expected}
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("location__radius", "30,50"),
+        ("location__radius", "30,50,0"),
+        ("location__radius", ["30", "50", None]),
+        ("location__radius", "91,50,1"),
+        ("location__nearest", "30,50,1.5"),
+        ("location__nearest", "30,50,-1"),
+    ],
+)
+def test_build_note_list_request_rejects_invalid_location_point_filters(
+    key, value
+) -> None:
+    request = req.NoteListRequest.from_dict({"filters": {key: value}})
+
+    assert request.has_errors()
+    assert request.errors[0]["parameter"] == "filters"
@@ -0,0 +1,81 @@
+import asyncio
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+
+from pytz import timezone
+
+from jaanevis.domain import note as n
+from jaanevis.serializers import note_export_serializer as ser
+
+LAT, LONG = 30.0, 50.0
+CREATED = datetime.now(timezone("Asia/Tehran"))
+notes = [
+    n.Note(
+        code=str(uuid.uuid4()),
+        creator_id="a@a.com",
+        creator="default",
+        url=f"http://example.com/{i}",
+        text="some #text #here",
+        lat=LAT,
+        long=LONG,
+        created=CREATED,
+    )
+    for i in range(3)
+]
+
+
+async def pages():
+    yield notes[:2]
+    yield []
+    yield notes[2:]
+
+
+def export(chunks) -> str:
+    async def collect() -> str:
+        return "".join([chunk async for chunk in chunks(pages())])
+
+    return asyncio.run(collect())
+
+
+def test_export_ndjson() -> None:
+    lines = export(ser.ndjson_chunks).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        ser.note_to_export_dict(note) for note in notes
+    ]
+    assert "creator_id" not in lines[0]
+
+
+def test_export_geojson_feature_collection() -> None:
+    collection = json.loads(export(ser.geojson_chunks))
+
+    assert collection["type"] == "FeatureCollection"
+    assert [f["properties"]["code"] for f in collection["features"]] == [
+        note.code for note in notes
+    ]
+    assert collection["features"][0]["geometry"] == {
+        "type": "Point",
+        "coordinates": [LONG, LAT],
+    }
+
+
+def test_export_empty_geojson_feature_collection() -> None:
+    async def no_pages():
+        return
+        yield
+
+    async def collect() -> str:
+        return "".join([c async for c in ser.geojson_chunks(no_pages())])
+
+    assert json.loads(asyncio.run(collect()))["features"] == []
+
+
+def test_export_csv() -> None:
+    rows = [*csv.DictReader(io.StringIO(export(ser.csv_chunks)))]
+
+    assert [row["code"] for row in rows] == [note.code for note in notes]
+    assert rows[0]["tags"] == "text here"
+    assert float(rows[0]["lat"]) == LAT
@@ -115,11 +115,11 @@ def test_serialize_notes_to_geojson() -> None:
                 "coordinates": [notes[0].long, notes[0].lat],
             },
             "properties": {
-                "url": notes[0].url,
+                "url": "http://example.com/1",
                 "creator": "default",
                 "text": "some text",
                 "country": COUNTRY,
-                "code": code_1,
+                "code": str(code_1),
             },
         },
         {
@@ -129,11 +129,11 @@ def test_serialize_notes_to_geojson() -> None:
                 "coordinates": [notes[1].long, notes[1].lat],
             },
             "properties": {
-                "url": notes[1].url,
+                "url": "http://example.com/2",
                 "creator": "default",
                 "text": "some text",
                 "country": COUNTRY,
-                "code": code_2,
+                "code": str(code_2),
             },
         },
     ]
@@ -170,3 +170,20 @@ def test_serialize_notes_to_geojson_features() -> None:
             ),
         )
     ]
+
+
+def test_serialize_notes_to_read_dicts_like_read_model() -> None:
+    note = n.Note(
+        code=uuid.uuid4(),
+        creator_id="a@a.com",
+        creator="default",
+        text="some #text",
+        url="http://example.com",
+        lat=LAT,
+        long=LONG,
+    )
+
+    read_dicts = ser.notes_to_read_dicts([note])
+
+    assert read_dicts == [n.NoteRead(**note.to_dict()).dict()]
+    assert json.loads(ser.dumps(read_dicts)) == read_dicts
@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 
 from jaanevis.domain import user as u
@@ -7,11 +8,11 @@ from jaanevis.usecases import activate_user as uc
 
 
 def test_activate_user_handle_invalid_request() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username=None, token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -22,12 +23,12 @@ def test_activate_user_handle_invalid_request() -> None:
 
 
 def test_activate_user_handle_non_existent_token() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_session_by_session_id_and_username.return_value = None
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="user1", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -38,12 +39,12 @@ def test_activate_user_handle_non_existent_token() -> None:
 
 
 def test_activate_user_handle_non_existent_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.return_value = None
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="user1", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -54,7 +55,7 @@ def test_activate_user_handle_non_existent_user() -> None:
 
 
 def test_activate_user_handle_active_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.return_value = u.User(
         email="a@a.com",
         username="user1",
@@ -64,7 +65,7 @@ def test_activate_user_handle_active_user() -> None:
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="user1", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -75,7 +76,7 @@ def test_activate_user_handle_active_user() -> None:
 
 
 def test_activate_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(
         email="a@a.com",
         username="username",
@@ -95,7 +96,7 @@ def test_activate_user() -> None:
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="username", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is True
     repo.update_user.assert_called()
@@ -103,7 +104,7 @@ def test_activate_user() -> None:
 
 
 def test_delete_session_after_user_activation() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(
         email="a@a.com",
         username="username",
@@ -122,19 +123,19 @@ def test_delete_session_after_user_activation() -> None:
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="username", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is True
     repo.delete_session_by_session_id.assert_called_with(session_id="token")
 
 
 def test_activate_user_handles_generic_error() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.side_effect = Exception("An error message")
 
     usecase = uc.ActivateUserUseCase(repo)
     request = req.ActivateUserRequest.build(username="username", token="token")
-    response = usecase.execute(request)
+    response = asyncio.run(usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 from unittest import mock
@@ -13,7 +14,7 @@ from jaanevis.usecases import logout as logout_uc
 
 def test_authenticte_finds_correct_user() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -27,22 +28,43 @@ def test_authenticte_finds_correct_user() -> None:
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=str(session))
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     repo.get_session_by_session_id.assert_called_with(session_id=str(session))
     repo.get_user_by_email.assert_called_with(email="a@a.com")
     assert response.value.username == "username"
 
 
+@mock.patch.object(uc, "session_cache")
+def test_authenticate_caches_user_of_session(session_cache) -> None:
+    session = s.Session(email="a@a.com", username="username")
+    user = u.User(
+        email="a@a.com", username="username", password="p", is_active=True
+    )
+    repo = mock.AsyncMock()
+    repo.get_session_by_session_id.return_value = session
+    repo.get_user_by_email.return_value = user
+
+    auth_usecase = uc.AuthenticateUseCase(repo)
+    request_obj = req.AuthenticateRequest.build(
+        session=str(session.session_id)
+    )
+    asyncio.run(auth_usecase.execute(request_obj))
+
+    session_cache.set.assert_called_once_with(
+        str(session.session_id), user, session.expire_time
+    )
+
+
 def test_authenticte_response_unauthorized_on_invalid_session() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     session = "invalidsession"
     repo.get_session_by_session_id.return_value = None
 
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=session)
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     assert bool(response) is False
     assert response.value == {
@@ -53,13 +75,13 @@ def test_authenticte_response_unauthorized_on_invalid_session() -> None:
 
 
 def test_authenticte_response_unauthorized_on_empty_session() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     session = ""
 
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=session)
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     assert bool(response) is False
     assert response.value == {
@@ -70,14 +92,14 @@ def test_authenticte_response_unauthorized_on_empty_session() -> None:
 
 
 def test_authenticte_handles_non_existant_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = None
     session = uuid.uuid4()
 
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=session)
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     assert bool(response) is False
     assert response.value == {
@@ -88,7 +110,7 @@ def test_authenticte_handles_non_existant_user() -> None:
 
 
 def test_authenticte_handles_expired_session() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = None
     session = uuid.uuid4()
     repo.get_user_by_email.return_value = u.User(
@@ -109,7 +131,7 @@ def test_authenticte_handles_expired_session() -> None:
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=session)
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     assert bool(response) is False
     repo.delete_session_by_session_id.assert_called_with(
@@ -124,7 +146,7 @@ def test_authenticte_handles_expired_session() -> None:
 
 def test_logout_removes_existant_user_session() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -138,7 +160,7 @@ def test_logout_removes_existant_user_session() -> None:
     logout_usecase = logout_uc.LogoutUseCase(repo)
     request_obj = logout_req.LogoutRequest.build(session=str(session))
 
-    response = logout_usecase.execute(request_obj)
+    response = asyncio.run(logout_usecase.execute(request_obj))
 
     assert bool(response) is True
     repo.delete_session_by_session_id.assert_called_with(
@@ -146,9 +168,21 @@ def test_logout_removes_existant_user_session() -> None:
     )
 
 
+def test_logout_posts_event_for_session_cache() -> None:
+    repo = mock.AsyncMock()
+    repo.get_session_by_session_id.return_value = None
+
+    logout_usecase = logout_uc.LogoutUseCase(repo)
+    request_obj = logout_req.LogoutRequest.build(session="session")
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        asyncio.run(logout_usecase.execute(request_obj))
+
+    post_event.assert_called_once_with("user_logged_out", "session")
+
+
 def test_logout_success_non_existent_session() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -160,14 +194,14 @@ def test_logout_success_non_existent_session() -> None:
     logout_usecase = logout_uc.LogoutUseCase(repo)
     request_obj = logout_req.LogoutRequest.build(session=str(session))
 
-    response = logout_usecase.execute(request_obj)
+    response = asyncio.run(logout_usecase.execute(request_obj))
 
     assert bool(response) is True
 
 
 def test_logout_success_non_existent_user() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = None
     repo.get_session_by_session_id.return_value = s.Session(
         email="a@a.com", username="user1", session_id=session
@@ -176,13 +210,13 @@ def test_logout_success_non_existent_user() -> None:
     logout_usecase = logout_uc.LogoutUseCase(repo)
     request_obj = logout_req.LogoutRequest.build(session=str(session))
 
-    response = logout_usecase.execute(request_obj)
+    response = asyncio.run(logout_usecase.execute(request_obj))
 
     assert bool(response) is True
 
 
 def test_authenticte_handles_deactive_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -197,7 +231,7 @@ def test_authenticte_handles_deactive_user() -> None:
     auth_usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=session)
 
-    response = auth_usecase.execute(request_obj)
+    response = asyncio.run(auth_usecase.execute(request_obj))
 
     assert bool(response) is False
     assert response.value == {
@@ -209,7 +243,7 @@ def test_authenticte_handles_deactive_user() -> None:
 
 def test_authenticate_handles_generic_error() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -221,7 +255,7 @@ def test_authenticate_handles_generic_error() -> None:
     usecase = uc.AuthenticateUseCase(repo)
     request_obj = req.AuthenticateRequest.build(session=str(session))
 
-    response_obj = usecase.execute(request_obj)
+    response_obj = asyncio.run(usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -233,13 +267,13 @@ def test_authenticate_handles_generic_error() -> None:
 
 def test_logout_handles_generic_error() -> None:
     session = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_session_by_session_id.side_effect = Exception("An error message")
 
     usecase = logout_uc.LogoutUseCase(repo)
     request_obj = logout_req.LogoutRequest.build(session=str(session))
 
-    response_obj = usecase.execute(request_obj)
+    response_obj = asyncio.run(usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 from unittest import mock
@@ -14,7 +15,7 @@ from jaanevis.utils.security import hash_password
 @freeze_time(datetime.now())
 def test_login_create_session_on_success() -> None:
     session_id = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     password = "password"
     hashed_password = hash_password(password)
 
@@ -32,7 +33,7 @@ def test_login_create_session_on_success() -> None:
         login_request = req.LoginRequest(
             username="username", password="password"
         )
-        response = login_usecase.execute(login_request)
+        response = asyncio.run(login_usecase.execute(login_request))
 
         assert bool(response) is True
         repo.get_user_by_username.assert_called_with(username="username")
@@ -48,7 +49,7 @@ def test_login_create_session_on_success() -> None:
 @freeze_time(datetime.now())
 def test_login_create_session_with_correct_expire_time() -> None:
     session_id = uuid.uuid4()
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     password = "password"
     hashed_password = hash_password(password)
 
@@ -68,7 +69,7 @@ def test_login_create_session_with_correct_expire_time() -> None:
         login_request = req.LoginRequest(
             username="username", password=password
         )
-        response = login_usecase.execute(login_request)
+        response = asyncio.run(login_usecase.execute(login_request))
 
         assert bool(response) is True
         repo.create_or_update_session.assert_called_with(
@@ -81,13 +82,13 @@ def test_login_create_session_with_correct_expire_time() -> None:
 
 
 def test_login_fails_on_non_existant_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     repo.get_user_by_username.return_value = None
 
     login_usecase = uc.LoginUseCase(repo)
     login_request = req.LoginRequest(username="username", password="password")
-    response = login_usecase.execute(login_request)
+    response = asyncio.run(login_usecase.execute(login_request))
 
     assert bool(response) is False
     assert response.type == res.ResponseFailure.PARAMETERS_ERROR
@@ -95,7 +96,7 @@ def test_login_fails_on_non_existant_user() -> None:
 
 
 def test_login_fails_on_wrong_password() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(
         email="a@a.com",
         username="username",
@@ -109,7 +110,7 @@ def test_login_fails_on_wrong_password() -> None:
     login_request = req.LoginRequest(
         username="username", password="wrong password"
     )
-    response = login_usecase.execute(login_request)
+    response = asyncio.run(login_usecase.execute(login_request))
 
     assert bool(response) is False
     assert response.type == res.ResponseFailure.PARAMETERS_ERROR
@@ -118,7 +119,7 @@ def test_login_fails_on_wrong_password() -> None:
 
 @mock.patch("jaanevis.utils.security.verify_password")
 def test_login_fails_on_inactive_user(pass_verify_mock) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(
         email="a@a.com",
         username="username",
@@ -130,7 +131,7 @@ def test_login_fails_on_inactive_user(pass_verify_mock) -> None:
 
     login_usecase = uc.LoginUseCase(repo)
     login_request = req.LoginRequest(username="username", password="password")
-    response = login_usecase.execute(login_request)
+    response = asyncio.run(login_usecase.execute(login_request))
 
     assert bool(response) is False
     assert response.type == res.ResponseFailure.PARAMETERS_ERROR
@@ -142,12 +143,12 @@ def test_login_fails_on_inactive_user(pass_verify_mock) -> None:
 
 
 def test_login_handles_generic_error() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.side_effect = Exception("An error message")
 
     login_usecase = uc.LoginUseCase(repo)
     login_request = req.LoginRequest(username="username", password="password")
-    response = login_usecase.execute(login_request)
+    response = asyncio.run(login_usecase.execute(login_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -155,3 +156,21 @@ def test_login_handles_generic_error() -> None:
         "code": res.StatusCode.failure,
         "message": "Exception: An error message",
     }
+
+
+@mock.patch("jaanevis.utils.security.verify_password", return_value=True)
+def test_login_posts_event_for_session_cache(_) -> None:
+    repo = mock.AsyncMock()
+    repo.get_user_by_username.return_value = u.User(
+        email="a@a.com",
+        username="username",
+        password="password",
+        is_active=True,
+    )
+
+    login_usecase = uc.LoginUseCase(repo)
+    login_request = req.LoginRequest(username="username", password="password")
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        asyncio.run(login_usecase.execute(login_request))
+
+    post_event.assert_called_once_with("user_logged_in", "username")
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from unittest import mock
 
@@ -24,13 +25,13 @@ def new_note() -> n.Note:
 
 
 def test_add_note(new_note: n.Note) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(email="a@a.com", username="username", password="password")
 
     add_note_usecase = uc.AddNoteUseCase(repo)
     add_note_request = req.AddNoteRequest(note=new_note, user=user)
 
-    response = add_note_usecase.execute(add_note_request)
+    response = asyncio.run(add_note_usecase.execute(add_note_request))
     expected_note = n.Note(
         created=CREATED,
         code=new_note.code,
@@ -50,7 +51,7 @@ def test_add_note(new_note: n.Note) -> None:
 
 @mock.patch("jaanevis.utils.event.post_event")
 def test_add_note_send_note_add_event(event_mock, new_note: n.Note) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(email="a@a.com", username="username", password="password")
     expected_note = n.Note(
         created=CREATED,
@@ -66,34 +67,34 @@ def test_add_note_send_note_add_event(event_mock, new_note: n.Note) -> None:
     add_note_usecase = uc.AddNoteUseCase(repo)
     add_note_request = req.AddNoteRequest(note=new_note, user=user)
 
-    response = add_note_usecase.execute(add_note_request)
+    response = asyncio.run(add_note_usecase.execute(add_note_request))
 
     assert bool(response) is True
     event_mock.assert_called_with("note_added", expected_note)
 
 
 def test_add_note_handles_non_existant_user(new_note: n.Note) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = None
 
     add_note_usecase = uc.AddNoteUseCase(repo)
     add_note_request = req.AddNoteRequest.build(note=new_note, user=user)
 
-    response = add_note_usecase.execute(add_note_request)
+    response = asyncio.run(add_note_usecase.execute(add_note_request))
 
     assert bool(response) is False
     assert response.type == res.ResponseFailure.PARAMETERS_ERROR
 
 
 def test_add_note_handles_generic_error(new_note: n.Note) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.add.side_effect = Exception("An error message")
     user = u.User(email="a@a.com", username="username", password="password")
 
     add_note_usecase = uc.AddNoteUseCase(repo)
     request_obj = req.AddNoteRequest(note=new_note, user=user)
 
-    response_obj = add_note_usecase.execute(request_obj)
+    response_obj = asyncio.run(add_note_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -104,12 +105,12 @@ def test_add_note_handles_generic_error(new_note: n.Note) -> None:
 
 
 def test_add_note_handles_bad_request() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     add_note_usecase = uc.AddNoteUseCase(repo)
     request_obj = req.AddNoteRequest.build(note=None, user=None)
 
-    response_obj = add_note_usecase.execute(request_obj)
+    response_obj = asyncio.run(add_note_usecase.execute(request_obj))
 
     assert bool(request_obj) is False
     assert response_obj.value == {
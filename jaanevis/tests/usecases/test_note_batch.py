@@ -0,0 +1,138 @@
+import asyncio
+import uuid
+from unittest import mock
+
+from jaanevis.domain import note as n
+from jaanevis.domain import user as u
+from jaanevis.requests import note_batch_request as req
+from jaanevis.responses import response as res
+from jaanevis.usecases import note_batch as uc
+
+notes = [
+    n.Note(
+        code=str(uuid.uuid4()),
+        creator_id="a@a.com",
+        creator="username",
+        url=f"https://example.com/{i}",
+        lat=i,
+        long=i,
+    )
+    for i in range(2)
+]
+codes = [note.code for note in notes]
+user = u.User(email="a@a.com", username="username", password="password")
+
+
+def test_add_notes_sets_creator_and_adds_them_at_once() -> None:
+    repo = mock.AsyncMock()
+    new_notes = [
+        n.Note(url=f"https://example.com/{i}", lat=i, long=i) for i in range(2)
+    ]
+
+    usecase = uc.AddNotesUseCase(repo)
+    request = req.AddNotesRequest.build(notes=new_notes, user=user)
+
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is True
+    assert all(note.creator == "username" for note in response.value)
+    assert all(note.creator_id == "a@a.com" for note in response.value)
+    repo.add_many.assert_called_once_with(new_notes)
+    post_event.assert_called_once_with("notes_added", new_notes)
+
+
+def test_add_notes_handles_invalid_request() -> None:
+    repo = mock.AsyncMock()
+
+    usecase = uc.AddNotesUseCase(repo)
+    request = req.AddNotesRequest.build(notes=[], user=user)
+    response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is False
+    assert response.value["message"] == "body: Empty batch"
+    repo.add_many.assert_not_called()
+
+
+def test_update_notes() -> None:
+    repo = mock.AsyncMock()
+    repo.get_many_by_code.return_value = notes
+    repo.update_many.return_value = notes
+
+    usecase = uc.UpdateNotesUseCase(repo)
+    request = req.UpdateNotesRequest.build(
+        notes=[
+            n.NoteBatchUpdateApi(code=codes[0], text="text"),
+            n.NoteBatchUpdateApi(code=codes[1], url="https://example.com"),
+        ],
+        user=user,
+    )
+
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is True
+    repo.get_many_by_code.assert_called_once_with(codes)
+    repo.update_many.assert_called_once_with(
+        {codes[0]: {"text": "text"}, codes[1]: {"url": "https://example.com"}}
+    )
+    post_event.assert_called_once()
+    assert post_event.call_args.args[0] == "notes_updated"
+
+
+def test_update_notes_fails_for_missing_notes() -> None:
+    repo = mock.AsyncMock()
+    repo.get_many_by_code.return_value = notes[:1]
+
+    usecase = uc.UpdateNotesUseCase(repo)
+    request = req.UpdateNotesRequest.build(
+        notes=[n.NoteBatchUpdateApi(code=code) for code in codes], user=user
+    )
+    response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is False
+    assert response.type == res.ResponseFailure.RESOURCE_ERROR
+    assert codes[1] in response.message
+    repo.update_many.assert_not_called()
+
+
+def test_delete_notes() -> None:
+    repo = mock.AsyncMock()
+    repo.get_many_by_code.return_value = notes
+
+    usecase = uc.DeleteNotesUseCase(repo)
+    request = req.DeleteNotesRequest.build(codes=codes, user=user)
+
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is True
+    assert response.value == notes
+    repo.delete_many_by_code.assert_called_once_with(codes)
+    post_event.assert_called_once_with("notes_deleted", notes)
+
+
+def test_delete_notes_of_other_users_is_denied() -> None:
+    repo = mock.AsyncMock()
+    other = n.Note(
+        code=str(uuid.uuid4()),
+        creator="other",
+        url="https://a.com",
+        lat=1,
+        long=1,
+    )
+    repo.get_many_by_code.return_value = [notes[0], other]
+
+    usecase = uc.DeleteNotesUseCase(repo)
+    request = req.DeleteNotesRequest.build(
+        codes=[codes[0], other.code], user=user
+    )
+    response = asyncio.run(usecase.execute(request))
+
+    assert bool(response) is False
+    assert response.value == {
+        "type": res.ResponseFailure.PARAMETERS_ERROR,
+        "code": res.StatusCode.permission_denied,
+        "message": "permission denied",
+    }
+    repo.delete_many_by_code.assert_not_called()
@@ -0,0 +1,61 @@
+import asyncio
+from unittest import mock
+
+from jaanevis.domain import note as n
+from jaanevis.requests.note_cluster_request import NoteClusterRequest
+from jaanevis.responses import response as res
+from jaanevis.usecases import note_clusters as uc
+
+
+def test_note_clusters() -> None:
+    repo = mock.AsyncMock()
+    repo.clusters.return_value = [
+        n.NoteCluster(lat=30.5, long=50.5, count=2),
+        n.NoteCluster(lat=10, long=20, count=1, code="code"),
+    ]
+
+    note_clusters_usecase = uc.NoteClusterUseCase(repo)
+    request = NoteClusterRequest.build(zoom=2, bbox="0,0,60,60")
+
+    response = asyncio.run(note_clusters_usecase.execute(request))
+
+    assert bool(response) is True
+    repo.clusters.assert_called_with(zoom=2, bbox=(0, 0, 60, 60))
+    assert [feature.dict() for feature in response.value] == [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": (50.5, 30.5)},
+            "properties": {"count": 2, "code": None},
+        },
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": (20, 10)},
+            "properties": {"count": 1, "code": "code"},
+        },
+    ]
+
+
+def test_note_clusters_handles_bad_request() -> None:
+    repo = mock.AsyncMock()
+
+    note_clusters_usecase = uc.NoteClusterUseCase(repo)
+    request = NoteClusterRequest.build(zoom=-1)
+
+    response = asyncio.run(note_clusters_usecase.execute(request))
+
+    assert bool(response) is False
+    assert response.type == res.ResponseFailure.PARAMETERS_ERROR
+    repo.clusters.assert_not_called()
+
+
+def test_note_clusters_handles_generic_error() -> None:
+    repo = mock.AsyncMock()
+    repo.clusters.side_effect = Exception("An error message")
+
+    note_clusters_usecase = uc.NoteClusterUseCase(repo)
+    request = NoteClusterRequest.build(zoom=1)
+
+    response = asyncio.run(note_clusters_usecase.execute(request))
+
+    assert bool(response) is False
+    assert response.value["message"] == "Exception: An error message"
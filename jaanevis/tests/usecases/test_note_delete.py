@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from unittest import mock
 
@@ -21,12 +22,12 @@ user = u.User(email="a@a.com", username="username", password="password")
 
 
 def test_note_delete_handles_invalid_code() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     delete_note_usecase = uc.DeleteNoteUseCase(repo)
     request_obj = req.DeleteNoteRequest.build(code=None, user=user)
 
-    response_obj = delete_note_usecase.execute(request_obj)
+    response_obj = asyncio.run(delete_note_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -37,13 +38,13 @@ def test_note_delete_handles_invalid_code() -> None:
 
 
 def test_note_delete_handles_invalid_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     code = str(uuid.uuid4())
 
     delete_note_usecase = uc.DeleteNoteUseCase(repo)
     request_obj = req.DeleteNoteRequest.build(code=code, user=None)
 
-    response_obj = delete_note_usecase.execute(request_obj)
+    response_obj = asyncio.run(delete_note_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -54,22 +55,35 @@ def test_note_delete_handles_invalid_user() -> None:
 
 
 def test_delete_note_by_code() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.delete_by_code.return_value = notes[0]
     repo.get_by_code.return_value = notes[0]
 
     note_delete_usecase = uc.DeleteNoteUseCase(repo)
     request = req.DeleteNoteRequest.build(code=notes[0].code, user=user)
 
-    response = note_delete_usecase.execute(request)
+    response = asyncio.run(note_delete_usecase.execute(request))
 
     assert bool(response) is True
     repo.delete_by_code.assert_called_with(code=notes[0].code)
     assert response.value == notes[0]
 
 
+@mock.patch("jaanevis.utils.event.post_event")
+def test_delete_note_sends_note_deleted_event(event_mock) -> None:
+    repo = mock.AsyncMock()
+    repo.get_by_code.return_value = notes[0]
+
+    note_delete_usecase = uc.DeleteNoteUseCase(repo)
+    request = req.DeleteNoteRequest.build(code=notes[0].code, user=user)
+
+    asyncio.run(note_delete_usecase.execute(request))
+
+    event_mock.assert_called_with("note_deleted", notes[0])
+
+
 def test_delete_note_by_code_wrong_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     wrong_user = u.User(
         email="b@b.com", username="wrong_user", password="password"
     )
@@ -78,7 +92,7 @@ def test_delete_note_by_code_wrong_user() -> None:
     note_delete_usecase = uc.DeleteNoteUseCase(repo)
     request = req.DeleteNoteRequest.build(code=notes[0].code, user=wrong_user)
 
-    response = note_delete_usecase.execute(request)
+    response = asyncio.run(note_delete_usecase.execute(request))
 
     assert bool(response) is False
     repo.delete_by_code.assert_not_called()
@@ -90,13 +104,13 @@ def test_delete_note_by_code_wrong_user() -> None:
 
 
 def test_delete_note_by_code_handles_nonexistent_code() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = None
 
     note_delete_usecase = uc.DeleteNoteUseCase(repo)
     request = req.DeleteNoteRequest.build(code="nocode", user=user)
 
-    response = note_delete_usecase.execute(request)
+    response = asyncio.run(note_delete_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -107,13 +121,13 @@ def test_delete_note_by_code_handles_nonexistent_code() -> None:
 
 
 def test_delete_note_by_code_handles_generic_error() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.side_effect = Exception("An error message")
 
     note_delete_usecase = uc.DeleteNoteUseCase(repo)
     request = req.DeleteNoteRequest.build(code=notes[0].code, user=user)
 
-    response = note_delete_usecase.execute(request)
+    response = asyncio.run(note_delete_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from unittest import mock
+
+from pytz import timezone
+
+from jaanevis.domain import note as n
+from jaanevis.requests.note_export_request import NoteExportRequest
+from jaanevis.usecases import note_export as uc
+
+CREATED = datetime.now(timezone("Asia/Tehran"))
+notes = [
+    n.Note(
+        code=str(uuid.uuid4()),
+        creator="default",
+        url=f"http://example.com/{i}",
+        lat=30,
+        long=50,
+        country="IR",
+        created=CREATED - timedelta(days=i),
+    )
+    for i in range(5)
+]
+
+
+def export(usecase, request) -> tuple[bool, str]:
+    async def run() -> tuple[bool, str]:
+        response = await usecase.execute(request)
+        if not response:
+            return False, response.value["message"]
+        return True, "".join([chunk async for chunk in response.value])
+
+    return asyncio.run(run())
+
+
+def test_note_export_reads_notes_page_by_page() -> None:
+    repo = mock.AsyncMock()
+    repo.list.side_effect = [notes[:2], notes[2:4], notes[4:]]
+    request = NoteExportRequest.from_dict(
+        {"format": "ndjson", "filters": {"creator__eq": "default"}}
+    )
+
+    ok, body = export(uc.NoteExportUseCase(repo, page_size=2), request)
+
+    assert ok is True
+    codes = [json.loads(line)["code"] for line in body.splitlines()]
+    assert codes == [note.code for note in notes]
+    assert repo.list.call_args_list == [
+        mock.call(filters={"creator__eq": "default"}, limit=2, after=None),
+        mock.call(
+            filters={"creator__eq": "default"},
+            limit=2,
+            after=(notes[1].created.timestamp(), notes[1].code),
+        ),
+        mock.call(
+            filters={"creator__eq": "default"},
+            limit=2,
+            after=(notes[3].created.timestamp(), notes[3].code),
+        ),
+    ]
+
+
+def test_note_export_stops_after_full_last_page() -> None:
+    repo = mock.AsyncMock()
+    repo.list.side_effect = [notes[:2], []]
+    request = NoteExportRequest.from_dict({"format": "geojson"})
+
+    ok, body = export(uc.NoteExportUseCase(repo, page_size=2), request)
+
+    assert len(json.loads(body)["features"]) == 2
+    assert repo.list.call_count == 2
+
+
+def test_note_export_of_nearest_notes_reads_one_page() -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = notes[:3]
+    request = NoteExportRequest.from_dict(
+        {"format": "csv", "filters": {"location__nearest": "30,50,3"}}
+    )
+
+    ok, body = export(uc.NoteExportUseCase(repo, page_size=2), request)
+
+    assert len(body.splitlines()) == 4
+    repo.list.assert_called_once_with(
+        filters={"location__nearest": (30.0, 50.0, 3)}
+    )
+
+
+def test_note_export_handles_invalid_request() -> None:
+    repo = mock.AsyncMock()
+    request = NoteExportRequest.from_dict({"format": "xml"})
+
+    ok, message = export(uc.NoteExportUseCase(repo), request)
+
+    assert ok is False
+    assert message == "format: Invalid export format"
+    repo.list.assert_not_called()
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from datetime import datetime
 from unittest import mock
@@ -5,7 +6,6 @@ from unittest import mock
 import pytest
 from pytz import timezone
 
-from jaanevis.domain import geojson as geo
 from jaanevis.domain import note as n
 from jaanevis.requests import note_list_request as req
 from jaanevis.responses import response as res
@@ -62,88 +62,143 @@ def domain_notes() -> list[n.Note]:
 
 
 @pytest.fixture
-def domain_notes_geojson() -> list[n.NoteGeoJsonFeature]:
-    geojson_notes = []
-    for note in notes:
-        properties = n.NoteGeoJsonProperties(
-            url=note.url,
-            creator=note.creator,
-            code=note.code,
-            country=COUNTRY,
-            text=note.text,
-        )
-        geometry = geo.GeoJsonPoint(coordinates=[note.long, note.lat])
-        geojson_notes.append(
-            n.NoteGeoJsonFeature(geometry=geometry, properties=properties)
-        )
-    return geojson_notes
+def domain_notes_geojson() -> list[dict]:
+    return [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [note.long, note.lat],
+            },
+            "properties": {
+                "code": str(note.code),
+                "creator": note.creator,
+                "text": note.text,
+                "country": COUNTRY,
+                "url": str(note.url),
+            },
+        }
+        for note in notes
+    ]
 
 
 def test_note_list_without_parameters(domain_notes) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes
 
     note_list_usecase = uc.NoteListUseCase(repo)
     request = req.NoteListRequest()
 
-    response = note_list_usecase.execute(request)
+    response = asyncio.run(note_list_usecase.execute(request))
 
     assert bool(response) is True
-    repo.list.assert_called_with(filters=None, limit=None, skip=0)
+    repo.list.assert_called_with(filters=None, limit=None, skip=0, after=None)
     assert response.value == domain_notes
 
 
 def test_note_list_without_parameters_with_limit(domain_notes) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes[:2]
 
     note_list_usecase = uc.NoteListUseCase(repo)
     request = req.NoteListRequest.from_dict({"limit": 2, "skip": 0})
 
-    response = note_list_usecase.execute(request)
+    response = asyncio.run(note_list_usecase.execute(request))
 
     assert bool(response) is True
-    repo.list.assert_called_with(filters=None, limit=2, skip=0)
+    repo.list.assert_called_with(filters=None, limit=2, skip=0, after=None)
     assert response.value == domain_notes[:2]
 
 
 def test_note_list_without_parameters_with_skip(domain_notes) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes[1:]
 
     note_list_usecase = uc.NoteListUseCase(repo)
     request = req.NoteListRequest.from_dict({"limit": 100, "skip": 1})
 
-    response = note_list_usecase.execute(request)
+    response = asyncio.run(note_list_usecase.execute(request))
 
     assert bool(response) is True
-    repo.list.assert_called_with(filters=None, limit=100, skip=1)
+    repo.list.assert_called_with(filters=None, limit=100, skip=1, after=None)
     assert response.value == domain_notes[1:]
 
 
 def test_note_list_with_filters(domain_notes) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes
 
     note_list_usecase = uc.NoteListUseCase(repo)
     qry_filters = {"code__eq": 5}
     request_obj = req.NoteListRequest.from_dict({"filters": qry_filters})
 
-    response_obj = note_list_usecase.execute(request_obj)
+    response_obj = asyncio.run(note_list_usecase.execute(request_obj))
 
     assert bool(response_obj) is True
-    repo.list.assert_called_with(filters=qry_filters, limit=None, skip=0)
+    repo.list.assert_called_with(
+        filters=qry_filters, limit=None, skip=0, after=None
+    )
     assert response_obj.value == domain_notes
 
 
+def test_note_list_returns_cursor_of_full_page(domain_notes) -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = domain_notes[:2]
+
+    note_list_usecase = uc.NoteListUseCase(repo)
+    first_page = asyncio.run(
+        note_list_usecase.execute(req.NoteListRequest.from_dict({"limit": 2}))
+    )
+    cursor = first_page.meta["next_cursor"]
+    asyncio.run(
+        note_list_usecase.execute(
+            req.NoteListRequest.from_dict({"limit": 2, "cursor": cursor})
+        )
+    )
+
+    last = domain_notes[1]
+    repo.list.assert_called_with(
+        filters=None,
+        limit=2,
+        skip=0,
+        after=(last.created.timestamp(), str(last.code)),
+    )
+
+
+def test_note_list_returns_no_cursor_for_last_page(domain_notes) -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = domain_notes[:1]
+
+    note_list_usecase = uc.NoteListUseCase(repo)
+    request = req.NoteListRequest.from_dict({"limit": 2})
+
+    response = asyncio.run(note_list_usecase.execute(request))
+
+    assert response.meta["next_cursor"] is None
+
+
+def test_note_list_returns_no_cursor_for_nearest_notes(domain_notes) -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = domain_notes[:2]
+
+    note_list_usecase = uc.NoteListUseCase(repo)
+    request = req.NoteListRequest.from_dict(
+        {"limit": 2, "filters": {"location__nearest": "30,50,2"}}
+    )
+
+    response = asyncio.run(note_list_usecase.execute(request))
+
+    assert response.meta["next_cursor"] is None
+
+
 def test_note_list_handles_generic_error() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.side_effect = Exception("An error message")
 
     note_list_usecase = uc.NoteListUseCase(repo)
     request_obj = req.NoteListRequest.from_dict({})
 
-    response_obj = note_list_usecase.execute(request_obj)
+    response_obj = asyncio.run(note_list_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -154,12 +209,12 @@ def test_note_list_handles_generic_error() -> None:
 
 
 def test_note_list_handles_bad_request() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     note_list_usecase = uc.NoteListUseCase(repo)
     request_obj = req.NoteListRequest.from_dict({"filters": 5})
 
-    response_obj = note_list_usecase.execute(request_obj)
+    response_obj = asyncio.run(note_list_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -170,30 +225,30 @@ def test_note_list_handles_bad_request() -> None:
 
 
 def test_geojson_note_list(domain_notes, domain_notes_geojson) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes
 
     geojson_note_list_usecase = uc.GeoJsonNoteListUseCase(repo)
     request = req.NoteListRequest()
 
-    response = geojson_note_list_usecase.execute(request)
+    response = asyncio.run(geojson_note_list_usecase.execute(request))
 
     assert bool(response) is True
-    repo.list.assert_called_with(filters=None, limit=None, skip=0)
+    repo.list.assert_called_with(filters=None, limit=None, skip=0, after=None)
     assert response.value == domain_notes_geojson
 
 
 def test_geojson_note_list_with_limit_skip(
     domain_notes, domain_notes_geojson
 ) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.list.return_value = domain_notes[1:3]
 
     geojson_note_list_usecase = uc.GeoJsonNoteListUseCase(repo)
     request = req.NoteListRequest.from_dict({"limit": 2, "skip": 1})
 
-    response = geojson_note_list_usecase.execute(request)
+    response = asyncio.run(geojson_note_list_usecase.execute(request))
 
     assert bool(response) is True
-    repo.list.assert_called_with(filters=None, limit=2, skip=1)
+    repo.list.assert_called_with(filters=None, limit=2, skip=1, after=None)
     assert response.value == domain_notes_geojson[1:3]
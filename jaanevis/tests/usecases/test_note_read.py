@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from unittest import mock
 
@@ -25,12 +26,12 @@ notes = [
 
 
 def test_note_read_handles_bad_request() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     read_note_usecase = uc.ReadNoteUseCase(repo)
     request_obj = req.ReadNoteRequest.build(code=None)
 
-    response_obj = read_note_usecase.execute(request_obj)
+    response_obj = asyncio.run(read_note_usecase.execute(request_obj))
 
     assert bool(response_obj) is False
     assert response_obj.value == {
@@ -41,13 +42,13 @@ def test_note_read_handles_bad_request() -> None:
 
 
 def test_read_note_by_code() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = notes[0]
 
     note_read_usecase = uc.ReadNoteUseCase(repo)
     request = req.ReadNoteRequest.build(code=notes[0].code)
 
-    response = note_read_usecase.execute(request)
+    response = asyncio.run(note_read_usecase.execute(request))
 
     assert bool(response) is True
     repo.get_by_code.assert_called_with(code=notes[0].code)
@@ -55,13 +56,13 @@ def test_read_note_by_code() -> None:
 
 
 def test_read_note_by_code_handles_nonexistent_code() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = None
 
     note_read_usecase = uc.ReadNoteUseCase(repo)
     request = req.ReadNoteRequest.build(code="nocode")
 
-    response = note_read_usecase.execute(request)
+    response = asyncio.run(note_read_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -72,13 +73,13 @@ def test_read_note_by_code_handles_nonexistent_code() -> None:
 
 
 def test_read_note_by_code_handles_generic_error() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.side_effect = Exception("An error message")
 
     note_read_usecase = uc.ReadNoteUseCase(repo)
     request = req.ReadNoteRequest.build(code=notes[0].code)
 
-    response = note_read_usecase.execute(request)
+    response = asyncio.run(note_read_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -0,0 +1,209 @@
+import asyncio
+import uuid
+from unittest import mock
+
+import pytest
+
+from jaanevis.config import settings
+from jaanevis.domain import note as n
+from jaanevis.repository import memrepo
+from jaanevis.repository.asyncrepo import AsyncRepo
+from jaanevis.requests.note_tile_request import NoteTileRequest
+from jaanevis.usecases import note_tiles as uc
+from jaanevis.utils import geo, mvt, tile_listener
+
+LAT, LONG = 30.0, 50.0
+
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def read_fields(data: bytes) -> list[tuple[int, int | bytes]]:
+    fields, pos = [], 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        if key & 0x7 == 0:
+            value, pos = read_varint(data, pos)
+        else:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos : pos + length], pos + length
+        fields.append((key >> 3, value))
+    return fields
+
+
+def read_packed(data: bytes) -> list[int]:
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def decode_tile(tile: bytes) -> dict:
+    """layer name -> list of (geometry, properties) of point features"""
+
+    layers = {}
+    for _, layer in read_fields(tile):
+        fields = read_fields(layer)
+        keys = [value.decode() for number, value in fields if number == 3]
+        values = [
+            read_fields(value)[0][1].decode()
+            for number, value in fields
+            if number == 4
+        ]
+        features = []
+        for number, feature in fields:
+            if number != 2:
+                continue
+            feature_fields = dict(read_fields(feature))
+            tags = read_packed(feature_fields[2])
+            properties = {
+                keys[tags[i]]: values[tags[i + 1]]
+                for i in range(0, len(tags), 2)
+            }
+            features.append((read_packed(feature_fields[4]), properties))
+        name = next(value for number, value in fields if number == 1)
+        layers[name.decode()] = features
+    return layers
+
+
+@pytest.fixture
+def note() -> n.Note:
+    return n.Note(
+        code=str(uuid.uuid4()),
+        creator="default",
+        url="https://example.com",
+        lat=LAT,
+        long=LONG,
+    )
+
+
+@pytest.fixture
+def cache() -> mvt.TileCache:
+    return mvt.TileCache(size=10, ttl=60)
+
+
+def tile_request(
+    note: n.Note, zoom: int = geo.CLUSTER_MAX_ZOOM
+) -> NoteTileRequest:
+    ((x, y),) = mvt.tiles_for(zoom, note.lat, note.long, buffer=0)
+    return NoteTileRequest.build(zoom=zoom, x=x, y=y)
+
+
+def test_note_tile_encodes_notes_in_tile(note, cache) -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = [note]
+    request = tile_request(note)
+
+    response = asyncio.run(uc.NoteTileUseCase(repo, cache).execute(request))
+
+    assert bool(response) is True
+    ((geometry, properties),) = decode_tile(response.value)["notes"]
+    px, py = mvt.project(request.zoom, LAT, LONG)
+    assert geometry == [
+        9,
+        round((px - request.x) * mvt.EXTENT) * 2,
+        round((py - request.y) * mvt.EXTENT) * 2,
+    ]
+    assert properties == {
+        "code": note.code,
+        "creator": "default",
+        "country": note.country,
+        "url": "https://example.com",
+    }
+    (_, kwargs) = repo.list.call_args
+    bbox = kwargs["filters"]["location__within"]
+    assert bbox[0] < LONG < bbox[2] and bbox[1] < LAT < bbox[3]
+    assert kwargs["limit"] == settings.TILE_MAX_NOTES
+
+
+def test_note_tile_draws_clusters_below_cluster_max_zoom(cache) -> None:
+    notes = [
+        n.Note(
+            creator="default",
+            url="https://example.com",
+            text="some #text",
+            country="IR",
+            lat=lat,
+            long=long,
+        ).to_dict()
+        for lat in range(-80, 81, 5)
+        for long in range(-175, 176, 5)
+    ]
+    repo = AsyncRepo(memrepo.MemRepo({"notes": notes}))
+    request = NoteTileRequest.build(zoom=0, x=0, y=0)
+
+    with mock.patch.object(repo.repo, "list") as list_notes:
+        response = asyncio.run(
+            uc.NoteTileUseCase(repo, cache).execute(request)
+        )
+
+    list_notes.assert_not_called()
+    features = decode_tile(response.value)["notes"]
+    assert 0 < len(features) <= 16 < len(notes)
+    assert sum(int(properties["count"]) for _, properties in features) == len(
+        notes
+    )
+
+
+def test_note_tile_is_cached_until_a_note_in_it_changes(note, cache) -> None:
+    repo = mock.AsyncMock()
+    repo.list.return_value = [note]
+    note_tiles_usecase = uc.NoteTileUseCase(repo, cache)
+    request = tile_request(note)
+
+    first = asyncio.run(note_tiles_usecase.execute(request)).value
+    assert asyncio.run(note_tiles_usecase.execute(request)).value is first
+    assert repo.list.call_count == 1
+
+    cache.invalidate_point(LAT, LONG)
+    asyncio.run(note_tiles_usecase.execute(request))
+    assert repo.list.call_count == 2
+
+
+def test_note_events_invalidate_tiles(note) -> None:
+    request = tile_request(note)
+    key = (request.zoom, request.x, request.y)
+    mvt.tile_cache.set(key, b"tile", mvt.tile_cache.version)
+
+    tile_listener.handle_note_deleted_event(note)
+
+    assert mvt.tile_cache.get(key) is None
+
+
+def test_note_tile_is_not_cached_when_invalidated_while_built(
+    note, cache
+) -> None:
+    repo = mock.AsyncMock()
+
+    def list_and_change(**kwargs):
+        cache.invalidate_point(LAT, LONG)
+        return [note]
+
+    repo.list.side_effect = list_and_change
+    request = tile_request(note)
+
+    asyncio.run(uc.NoteTileUseCase(repo, cache).execute(request))
+
+    assert cache.get((request.zoom, request.x, request.y)) is None
+
+
+@pytest.mark.parametrize(
+    "zoom, x, y", [(-1, 0, 0), (23, 0, 0), (1, 2, 0), (1, 0, -1)]
+)
+def test_note_tile_request_rejects_invalid_tiles(zoom, x, y) -> None:
+    request = NoteTileRequest.build(zoom=zoom, x=x, y=y)
+
+    response = asyncio.run(
+        uc.NoteTileUseCase(mock.AsyncMock()).execute(request)
+    )
+
+    assert bool(response) is False
@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 
 import pytest
@@ -26,7 +27,7 @@ def user() -> u.User:
 
 
 def test_update_note(note: n.Note, user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = note
 
     newurl = "https://newurl.com"
@@ -40,7 +41,7 @@ def test_update_note(note: n.Note, user: u.User) -> None:
         code=str(note.code), note=note_update, user=user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is True
     repo.update.assert_called_with(obj=note, data={"url": newurl})
@@ -48,8 +49,29 @@ def test_update_note(note: n.Note, user: u.User) -> None:
     assert response.value == updated_note
 
 
+@mock.patch("jaanevis.utils.event.post_event")
+def test_update_note_sends_note_updated_event(
+    event_mock, note: n.Note, user: u.User
+) -> None:
+    repo = mock.AsyncMock()
+    repo.get_by_code.return_value = note
+    updated_note = n.Note(**{**note.to_dict(), "lat": 2})
+    repo.update.return_value = updated_note
+
+    update_note_usecase = uc.UpdateNoteUseCase(repo)
+    update_note_request = req.UpdateNoteRequest.build(
+        code=str(note.code), note=n.NoteUpdateApi(lat=2), user=user
+    )
+
+    asyncio.run(update_note_usecase.execute(update_note_request))
+
+    event_mock.assert_called_with(
+        "note_updated", {"note": note, "updated_note": updated_note}
+    )
+
+
 def test_note_update_handles_invalid_code(note: n.Note, user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     newurl = "https://newurl.com"
     note_update = n.NoteUpdateApi(url=newurl)
 
@@ -58,7 +80,7 @@ def test_note_update_handles_invalid_code(note: n.Note, user: u.User) -> None:
         code="", note=note_update, user=user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -69,14 +91,14 @@ def test_note_update_handles_invalid_code(note: n.Note, user: u.User) -> None:
 
 
 def test_note_update_handles_invalid_note(note: n.Note, user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     update_note_usecase = uc.UpdateNoteUseCase(repo)
     update_note_request = req.UpdateNoteRequest.build(
         code="code", note=None, user=user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -89,7 +111,7 @@ def test_note_update_handles_invalid_note(note: n.Note, user: u.User) -> None:
 def test_note_update_handles_nonexistent_note(
     note: n.Note, user: u.User
 ) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = None
     newurl = "https://newurl.com"
     note_update = n.NoteUpdateApi(url=newurl)
@@ -99,7 +121,7 @@ def test_note_update_handles_nonexistent_note(
         code="nocode", note=note_update, user=user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -110,7 +132,7 @@ def test_note_update_handles_nonexistent_note(
 
 
 def test_note_update_handles_wrong_user(note: n.Note) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.return_value = note
     wrong_user = u.User(
         email="b@b.com", username="wrong_user", password="password"
@@ -127,7 +149,7 @@ def test_note_update_handles_wrong_user(note: n.Note) -> None:
         code=str(note.code), note=note_update, user=wrong_user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is False
     repo.update.assert_not_called()
@@ -139,7 +161,7 @@ def test_note_update_handles_wrong_user(note: n.Note) -> None:
 
 
 def test_update_note_handles_generic_error(note: n.Note, user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_by_code.side_effect = Exception("An error message")
 
     newurl = "https://newurl.com"
@@ -150,7 +172,7 @@ def test_update_note_handles_generic_error(note: n.Note, user: u.User) -> None:
         code=str(note.code), note=note_update, user=user
     )
 
-    response = update_note_usecase.execute(update_note_request)
+    response = asyncio.run(update_note_usecase.execute(update_note_request))
 
     assert bool(response) is False
     assert response.value == {
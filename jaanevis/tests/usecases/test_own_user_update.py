@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 
 import pytest
@@ -19,7 +20,7 @@ def user() -> u.User:
 
 
 def test_update_own_user() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.return_value = None
     user = u.User(email="a@a.com", username="username", password="password")
     new_username = "new_username"
@@ -36,7 +37,7 @@ def test_update_own_user() -> None:
         update_user=user_update, user=user
     )
 
-    response = update_user_usecase.execute(update_user_request)
+    response = asyncio.run(update_user_usecase.execute(update_user_request))
 
     assert bool(response) is True
     repo.update_user.assert_called_with(
@@ -46,8 +47,28 @@ def test_update_own_user() -> None:
     assert response.value == user_read
 
 
+def test_update_own_user_posts_event(user: u.User) -> None:
+    repo = mock.AsyncMock()
+    repo.get_user_by_username.return_value = None
+    updated_user = u.User(
+        email=user.email, username="new", password="p", is_active=True
+    )
+    repo.update_user.return_value = updated_user
+
+    update_user_usecase = uc.UpdateOwnUserUseCase(repo)
+    update_user_request = req.UpdateOwnUserRequest.build(
+        update_user=u.UserUpdateApi(username="new"), user=user
+    )
+    with mock.patch("jaanevis.utils.event.post_event") as post_event:
+        asyncio.run(update_user_usecase.execute(update_user_request))
+
+    post_event.assert_called_once_with(
+        "user_updated", {"user": user, "updated_user": updated_user}
+    )
+
+
 def test_own_user_update_handles_invalid_user(user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     user = u.User(email="a@a.com", username="username", password="password")
 
     update_user_usecase = uc.UpdateOwnUserUseCase(repo)
@@ -55,7 +76,7 @@ def test_own_user_update_handles_invalid_user(user: u.User) -> None:
         update_user=None, user=user
     )
 
-    response = update_user_usecase.execute(update_user_request)
+    response = asyncio.run(update_user_usecase.execute(update_user_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -66,7 +87,7 @@ def test_own_user_update_handles_invalid_user(user: u.User) -> None:
 
 
 def test_update_user_handles_generic_error(user: u.User) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.side_effect = Exception("An error message")
     user = u.User(email="a@a.com", username="username", password="password")
 
@@ -78,7 +99,7 @@ def test_update_user_handles_generic_error(user: u.User) -> None:
         update_user=user_update, user=user
     )
 
-    response = update_user_usecase.execute(update_user_request)
+    response = asyncio.run(update_user_usecase.execute(update_user_request))
 
     assert bool(response) is False
     assert response.value == {
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from unittest import mock
 
@@ -10,7 +11,7 @@ from jaanevis.usecases import register as uc
 
 
 def test_register_usecase_init() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     register_usecase = uc.RegisterUseCase(repo=repo)
 
@@ -18,13 +19,13 @@ def test_register_usecase_init() -> None:
 
 
 def test_register_handle_bad_request_invalid_email() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     request = req.RegisterRequest.build(
         email="", username="username", password=""
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -35,13 +36,13 @@ def test_register_handle_bad_request_invalid_email() -> None:
 
 
 def test_register_handle_bad_request_invalid_username() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     request = req.RegisterRequest.build(
         email="a@a.com", username="", password="1234"
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -52,7 +53,7 @@ def test_register_handle_bad_request_invalid_username() -> None:
 
 
 def test_register_handle_existing_email() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.return_value = None
     repo.get_user_by_email.return_value = u.User(
         email="a@a.com",
@@ -65,7 +66,7 @@ def test_register_handle_existing_email() -> None:
         email="a@a.com", username="username", password="12345678"
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     repo.get_user_by_email.assert_called_with(email="a@a.com")
@@ -77,7 +78,7 @@ def test_register_handle_existing_email() -> None:
 
 
 def test_register_handle_existing_username() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     repo.get_user_by_username.return_value = u.User(
         email="a@a.com",
         username="username",
@@ -89,7 +90,7 @@ def test_register_handle_existing_username() -> None:
         email="a@a.com", username="username", password="12345678"
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     repo.get_user_by_username.assert_called_with(username="username")
@@ -101,13 +102,13 @@ def test_register_handle_existing_username() -> None:
 
 
 def test_register_handle_bad_request_invalid_password() -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
 
     request = req.RegisterRequest.build(
         email="a@a.com", username="username", password="1234"
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     assert response.value == {
@@ -119,7 +120,7 @@ def test_register_handle_bad_request_invalid_password() -> None:
 
 @mock.patch("jaanevis.utils.security.hash_password")
 def test_register_creates_user(mock_hash) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     email, username, password = "a@a.com", "username", "22334455"
     user = u.User(email=email, username=username, password=password)
     hashed_password = "hashedpassword"
@@ -134,7 +135,7 @@ def test_register_creates_user(mock_hash) -> None:
         email=email, username=username, password=password
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is True
     repo.create_user.assert_called_with(
@@ -146,7 +147,7 @@ def test_register_creates_user(mock_hash) -> None:
 @freeze_time(datetime.now())
 @mock.patch("secrets.token_urlsafe")
 def test_register_creates_user_activation_session(mock_secrets) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     email, username, password = "a@a.com", "username", "22334455"
     user = u.User(email=email, username=username, password=password)
     secret_session = "secret_session"
@@ -161,7 +162,7 @@ def test_register_creates_user_activation_session(mock_secrets) -> None:
         email=email, username=username, password=password
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is True
     repo.create_session.assert_called_with(
@@ -175,7 +176,7 @@ def test_register_creates_user_activation_session(mock_secrets) -> None:
 @mock.patch("jaanevis.utils.event.post_event")
 @mock.patch("secrets.token_urlsafe")
 def test_register_send_user_registered_event(mock_secrets, event_mock) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     email, username, password = "a@a.com", "username", "22334455"
     user = u.User(email=email, username=username, password=password)
     activation_token = "token"
@@ -189,7 +190,7 @@ def test_register_send_user_registered_event(mock_secrets, event_mock) -> None:
         email=email, username=username, password=password
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is True
     event_mock.assert_called_with(
@@ -204,7 +205,7 @@ def test_register_send_user_registered_event(mock_secrets, event_mock) -> None:
 
 @mock.patch("jaanevis.utils.security.hash_password")
 def test_register_deletes_created_user_on_exception(mock_hash) -> None:
-    repo = mock.Mock()
+    repo = mock.AsyncMock()
     email, username, password = "a@a.com", "username", "22334455"
     user = u.User(email=email, username=username, password=password)
     hashed_password = "hashedpassword"
@@ -219,7 +220,7 @@ def test_register_deletes_created_user_on_exception(mock_hash) -> None:
         email=email, username=username, password=password
     )
     register_usecase = uc.RegisterUseCase(repo)
-    response = register_usecase.execute(request)
+    response = asyncio.run(register_usecase.execute(request))
 
     assert bool(response) is False
     repo.create_user.assert_called()
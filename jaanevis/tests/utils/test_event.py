@@ -0,0 +1,23 @@
+import asyncio
+import threading
+from unittest import mock
+
+from jaanevis.utils import event
+
+
+@mock.patch.dict(event.subscribers, clear=True)
+def test_post_event_async_runs_subscribers_off_the_event_loop() -> None:
+    seen = []
+    event.subscribe("note_added", lambda data: seen.append(data))
+    event.subscribe(
+        "note_added", lambda data: seen.append(threading.get_ident())
+    )
+
+    async def post() -> int:
+        await event.post_event_async("note_added", "note")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(post())
+
+    assert seen[0] == "note"
+    assert seen[1] != loop_thread
@@ -0,0 +1,108 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from jaanevis.utils import geo
+
+LAT, LONG = 30.0, 50.0
+COUNTRY = "IR"
+
+
+@pytest.fixture(autouse=True)
+def geocode_cache():
+    geo.clear_geocode_cache()
+    yield
+    geo.clear_geocode_cache()
+
+
+def test_country_from_latlong() -> None:
+    assert geo.get_country_from_latlong(LAT, LONG) == COUNTRY
+
+
+@mock.patch("reverse_geocode.search")
+def test_nearby_points_share_a_geocode_cache_entry(search) -> None:
+    search.return_value = [{"country_code": COUNTRY}]
+
+    countries = [
+        geo.get_country_from_latlong(LAT, LONG),
+        geo.get_country_from_latlong(LAT + 0.001, LONG - 0.001),
+        geo.get_country_from_latlong(LAT + 1, LONG),
+    ]
+
+    assert countries == [COUNTRY] * 3
+    assert search.call_args_list == [
+        mock.call([(LAT, LONG)]),
+        mock.call([(LAT + 1, LONG)]),
+    ]
+    info = geo.geocode_cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (1, 2, 2)
+
+
+@mock.patch.object(geo.settings, "GEOCODE_CACHE_PRECISION", 0)
+@mock.patch("reverse_geocode.search")
+def test_geocode_cache_precision_is_configurable(search) -> None:
+    search.return_value = []
+
+    assert geo.get_country_from_latlong(LAT + 0.3, LONG - 0.3) is None
+    assert geo.get_country_from_latlong(LAT - 0.3, LONG + 0.3) is None
+
+    search.assert_called_once_with([(LAT, LONG)])
+
+
+@mock.patch("reverse_geocode.search")
+def test_countries_from_latlongs_geocode_points_at_once(search) -> None:
+    search.return_value = [{"country_code": COUNTRY}, {"country_code": "FR"}]
+    points = [(LAT, LONG), (48.85, 2.35), (LAT + 0.001, LONG)]
+
+    countries = geo.get_countries_from_latlongs(points)
+
+    assert countries == [COUNTRY, "FR", COUNTRY]
+    search.assert_called_once_with([(LAT, LONG), (48.85, 2.35)])
+
+
+@mock.patch("reverse_geocode.search")
+def test_countries_from_no_latlongs(search) -> None:
+    assert geo.get_countries_from_latlongs([]) == []
+    search.assert_not_called()
+
+
+@mock.patch.object(geo, "_geocoder_ready", new_callable=threading.Event)
+def test_geocoder_warm_up(ready) -> None:
+    with mock.patch("reverse_geocode.search") as search:
+        geo.start_geocoder_warm_up().join()
+
+    search.assert_called_once()
+    assert geo.geocoder_ready()
+
+
+@mock.patch.object(geo, "_geocoder_ready", new_callable=threading.Event)
+def test_failed_geocoder_warm_up_is_not_ready(ready) -> None:
+    with mock.patch("reverse_geocode.search", side_effect=OSError):
+        geo.warm_up_geocoder()
+
+    assert not geo.geocoder_ready()
+
+
+@mock.patch("reverse_geocode.search")
+def test_countries_from_latlongs_share_the_geocode_cache(search) -> None:
+    search.return_value = [{"country_code": COUNTRY}, {}]
+    geo.get_countries_from_latlongs([(LAT, LONG), (0.0, 0.0)])
+
+    assert geo.get_country_from_latlong(LAT, LONG) == COUNTRY
+    assert geo.get_country_from_latlong(0.0, 0.0) is None
+    assert geo.get_countries_from_latlongs([(LAT, LONG)]) == [COUNTRY]
+    search.assert_called_once()
+
+
+@mock.patch.object(geo, "_geocode_cache", new=geo.GeocodeCache(size=1))
+@mock.patch("reverse_geocode.search")
+def test_geocode_cache_drops_least_recently_used_points(search) -> None:
+    search.return_value = [{"country_code": COUNTRY}]
+    geo.get_country_from_latlong(LAT, LONG)
+    geo.get_country_from_latlong(LAT + 1, LONG)
+
+    geo.get_country_from_latlong(LAT, LONG)
+
+    assert search.call_count == 3
+    assert geo.geocode_cache_info()["size"] == 1
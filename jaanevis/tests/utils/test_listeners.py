@@ -0,0 +1,38 @@
+from unittest import mock
+
+from jaanevis import tasks
+from jaanevis.domain import note as n
+from jaanevis.utils import email_listener, telegram_listener
+
+
+@mock.patch("jaanevis.tasks.core.q")
+def test_enqueue_queues_jobs_by_path(q) -> None:
+    tasks.enqueue("jaanevis.utils.telegram.send_message_to_channel", "msg")
+
+    q.enqueue.assert_called_once_with(
+        "jaanevis.utils.telegram.send_message_to_channel", "msg"
+    )
+
+
+@mock.patch("jaanevis.tasks.enqueue")
+def test_note_added_event_enqueues_telegram_message(enqueue) -> None:
+    note = n.Note(
+        url="https://example.com", lat=30, long=50, country="IR", text="x"
+    )
+
+    telegram_listener.handle_new_note_add_event(note)
+
+    path, message = enqueue.call_args.args
+    assert path == "jaanevis.utils.telegram.send_message_to_channel"
+    assert "https://example.com" in message
+
+
+@mock.patch("jaanevis.tasks.enqueue")
+def test_user_registered_event_enqueues_activation_email(enqueue) -> None:
+    email_listener.handle_user_registered_event(
+        {"email": "a@a.com", "username": "a", "activation_token": "token"}
+    )
+
+    assert enqueue.call_args.args == ("jaanevis.utils.mail.send_email",)
+    assert enqueue.call_args.kwargs["email_to"] == "a@a.com"
+    assert "token=token" in enqueue.call_args.kwargs["text"]
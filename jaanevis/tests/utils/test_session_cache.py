@@ -0,0 +1,121 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from jaanevis.domain import user as u
+from jaanevis.requests.login_request import LoginRequest
+from jaanevis.usecases import login
+from jaanevis.utils import event, session_listener
+from jaanevis.utils.session_cache import SessionCache
+
+user = u.User(email="a@a.com", username="username", password="password")
+other = u.User(email="b@b.com", username="other", password="password")
+
+
+@pytest.fixture
+def cache() -> SessionCache:
+    return SessionCache(size=2, ttl=60)
+
+
+def in_a_day() -> float:
+    return time.time() + 86400
+
+
+def test_cached_user_of_session(cache) -> None:
+    cache.set("session", user, in_a_day())
+
+    assert cache.get("session") is user
+    assert cache.get("other") is None
+
+
+def test_entries_expire_with_ttl_or_session(cache) -> None:
+    cache.set("session", user, in_a_day())
+    cache.set("short", user, time.time() + 5)
+    cache.set("expired", user, time.time() - 5)
+
+    assert cache.get("expired") is None
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 30):
+        assert cache.get("session") is user
+        assert cache.get("short") is None
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 61):
+        assert cache.get("session") is None
+
+
+def test_least_recently_used_entries_are_dropped(cache) -> None:
+    cache.set("first", user, in_a_day())
+    cache.set("second", other, in_a_day())
+    cache.get("first")
+
+    cache.set("third", other, in_a_day())
+
+    assert cache.get("second") is None
+    assert cache.get("first") is user
+    assert cache.get("third") is other
+
+
+def test_invalidate_user_drops_all_sessions_of_user() -> None:
+    cache = SessionCache(size=10, ttl=60)
+    cache.set("first", user, in_a_day())
+    cache.set("second", user, in_a_day())
+    cache.set("third", other, in_a_day())
+
+    cache.invalidate_user(user.username)
+
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+    assert cache.get("third") is other
+
+
+@mock.patch.dict(event.subscribers, clear=True)
+@mock.patch.object(
+    session_listener,
+    "session_cache",
+    new_callable=SessionCache,
+    size=10,
+    ttl=60,
+)
+def test_logout_and_user_update_events_invalidate_cache(cache) -> None:
+    session_listener.setup_session_cache_event_handlers()
+    cache.set("first", user, in_a_day())
+    cache.set("second", user, in_a_day())
+    cache.set("third", other, in_a_day())
+
+    event.post_event("user_logged_out", "third")
+    assert cache.get("third") is None
+    assert cache.get("first") is user
+
+    event.post_event("user_updated", {"user": user, "updated_user": other})
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+
+
+@mock.patch.dict(event.subscribers, clear=True)
+@mock.patch.object(
+    session_listener,
+    "session_cache",
+    new_callable=SessionCache,
+    size=10,
+    ttl=60,
+)
+@mock.patch("jaanevis.utils.security.verify_password", return_value=True)
+def test_login_again_invalidates_replaced_session(_, cache) -> None:
+    session_listener.setup_session_cache_event_handlers()
+    repo = mock.AsyncMock()
+    repo.get_user_by_username.return_value = u.User(
+        email="a@a.com",
+        username="username",
+        password="password",
+        is_active=True,
+    )
+    login_usecase = login.LoginUseCase(repo)
+    login_request = LoginRequest(username="username", password="password")
+    session = asyncio.run(login_usecase.execute(login_request)).value
+    cache.set(session["session"], user, in_a_day())
+    cache.set("other", other, in_a_day())
+
+    asyncio.run(login_usecase.execute(login_request))
+
+    assert cache.get(session["session"]) is None
+    assert cache.get("other") is other
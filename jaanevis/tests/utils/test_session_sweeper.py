@@ -0,0 +1,45 @@
+import asyncio
+from unittest import mock
+
+from jaanevis.utils import session_sweeper
+
+
+def test_sweep_deletes_sessions_expired_by_now() -> None:
+    repo = mock.AsyncMock()
+    repo.delete_expired_sessions.return_value = 3
+
+    with mock.patch("time.time", return_value=100.0):
+        removed = asyncio.run(session_sweeper.sweep_expired_sessions(repo))
+
+    assert removed == 3
+    repo.delete_expired_sessions.assert_called_once_with(100.0)
+
+
+@mock.patch.object(
+    session_sweeper, "sweep_expired_sessions", new_callable=mock.AsyncMock
+)
+def test_sweeper_keeps_running_after_failed_sweep(sweep) -> None:
+    sweep.side_effect = [Exception("repository failed"), 1, 1]
+
+    async def run() -> None:
+        with mock.patch.object(
+            session_sweeper.settings, "SESSION_SWEEP_INTERVAL", 0.001
+        ):
+            session_sweeper.start_session_sweeper()
+        while sweep.await_count < 3:
+            await asyncio.sleep(0.001)
+        session_sweeper.stop_session_sweeper()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert session_sweeper._sweeper is None
+
+
+@mock.patch.object(session_sweeper.settings, "SESSION_SWEEP_INTERVAL", 0)
+def test_sweeper_disabled_without_interval() -> None:
+    async def run() -> None:
+        session_sweeper.start_session_sweeper()
+
+    asyncio.run(run())
+
+    assert session_sweeper._sweeper is None
@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from jaanevis.i18n import gettext as _
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.auth_request import AuthenticateRequest
 from jaanevis.responses import (
     ResponseFailure,
@@ -9,20 +9,25 @@ from jaanevis.responses import (
     ResponseSuccess,
     StatusCode,
 )
+from jaanevis.utils.session_cache import session_cache
 
 
 class AuthenticateUseCase:
-    """authenticate a user from auth session"""
+    """authenticate a user from auth session
 
-    def __init__(self, repo: Repository) -> None:
+    users of authenticated sessions are put in the session cache, which
+    callers check before building a repository for this.
+    """
+
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: AuthenticateRequest) -> ResponseObject:
+    async def execute(self, request: AuthenticateRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
 
         try:
-            session = self.repo.get_session_by_session_id(
+            session = await self.repo.get_session_by_session_id(
                 session_id=request.session
             )
             if not session:
@@ -30,7 +35,7 @@ class AuthenticateUseCase:
                     _("Session not found"), code=StatusCode.invalid_session
                 )
 
-            user = self.repo.get_user_by_email(email=session.email)
+            user = await self.repo.get_user_by_email(email=session.email)
             if not user:
                 return ResponseFailure.build_resource_error("User not found")
 
@@ -40,12 +45,13 @@ class AuthenticateUseCase:
                 )
 
             if session.expire_time < datetime.now().timestamp():
-                self.repo.delete_session_by_session_id(
+                await self.repo.delete_session_by_session_id(
                     session_id=str(session.session_id)
                 )
                 return ResponseFailure.build_parameters_error(
                     _("Session expired"), code=StatusCode.expired_session
                 )
+            session_cache.set(request.session, user, session.expire_time)
             return ResponseSuccess(user)
         except Exception as exc:
             return ResponseFailure.build_system_error(
@@ -1,24 +1,25 @@
 from jaanevis.i18n import gettext as _
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.delete_note_request import DeleteNoteRequest
 from jaanevis.responses.response import (
     ResponseFailure,
     ResponseObject,
     ResponseSuccess,
 )
+from jaanevis.utils import event
 
 
 class DeleteNoteUseCase:
     """Use case to delete a note by it's code"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: DeleteNoteRequest) -> ResponseObject:
+    async def execute(self, request: DeleteNoteRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
         try:
-            note = self.repo.get_by_code(code=request.code)
+            note = await self.repo.get_by_code(code=request.code)
             if not note:
                 return ResponseFailure.build_resource_error(
                     f"note with code '{request.code}' not found"
@@ -27,7 +28,8 @@ class DeleteNoteUseCase:
                 return ResponseFailure.build_parameters_error(
                     _("permission denied")
                 )
-            self.repo.delete_by_code(code=request.code)
+            await self.repo.delete_by_code(code=request.code)
+            await event.post_event_async("note_deleted", note)
             return ResponseSuccess(note)
         except Exception as exc:
             return ResponseFailure.build_system_error(
@@ -1,8 +1,9 @@
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 
 from jaanevis.i18n import gettext as _
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.login_request import LoginRequest
 from jaanevis.responses import (
     ResponseFailure,
@@ -10,18 +11,20 @@ from jaanevis.responses import (
     ResponseSuccess,
     StatusCode,
 )
-from jaanevis.utils import security
+from jaanevis.utils import event, security
 
 
 class LoginUseCase:
     """Use case for user to login and get session"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: LoginRequest) -> ResponseObject:
+    async def execute(self, request: LoginRequest) -> ResponseObject:
         try:
-            user = self.repo.get_user_by_username(username=request.username)
+            user = await self.repo.get_user_by_username(
+                username=request.username
+            )
             if not user:
                 if not user:
                     return ResponseFailure.build_parameters_error(
@@ -33,8 +36,11 @@ class LoginUseCase:
                     _("User is not active"), code=StatusCode.inactive_user
                 )
 
-            password_valid = security.verify_password(
-                hashed_password=user.password, password=request.password
+            # hashing is slow on purpose, keep it off the event loop
+            password_valid = await asyncio.to_thread(
+                security.verify_password,
+                hashed_password=user.password,
+                password=request.password,
             )
             if not password_valid:
                 return ResponseFailure.build_parameters_error(
@@ -45,12 +51,14 @@ class LoginUseCase:
             new_session_id = str(uuid.uuid4())
             tomorrow = datetime.now() + timedelta(days=1)
             expire_tomorrow = tomorrow.strftime("%a, %d %b %Y %H:%M:%S GMT")
-            self.repo.create_or_update_session(
+            await self.repo.create_or_update_session(
                 email=user.email,
                 username=user.username,
                 session_id=new_session_id,
                 expire_time=tomorrow.timestamp(),
             )
+            # the session replaced here may still be in session caches
+            await event.post_event_async("user_logged_in", user.username)
             return ResponseSuccess(
                 {"session": new_session_id, "expires": expire_tomorrow}
             )
@@ -1,22 +1,25 @@
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.logout_request import LogoutRequest
 from jaanevis.responses import ResponseFailure, ResponseObject, ResponseSuccess
+from jaanevis.utils import event
 
 
 class LogoutUseCase:
     """usecase for logging a user out"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: LogoutRequest) -> ResponseObject:
+    async def execute(self, request: LogoutRequest) -> ResponseObject:
         try:
-            session = self.repo.get_session_by_session_id(
+            session = await self.repo.get_session_by_session_id(
                 session_id=request.session
             )
-            if not session:
-                return ResponseSuccess(True)
-            self.repo.delete_session_by_session_id(session_id=request.session)
+            if session:
+                await self.repo.delete_session_by_session_id(
+                    session_id=request.session
+                )
+            await event.post_event_async("user_logged_out", request.session)
             return ResponseSuccess(True)
         except Exception as exc:
             return ResponseFailure.build_system_error(
@@ -0,0 +1,122 @@
+from typing import Optional
+
+from jaanevis.domain import note as n
+from jaanevis.domain import user as u
+from jaanevis.i18n import gettext as _
+from jaanevis.repository.asyncrepo import AsyncRepository
+from jaanevis.requests.note_batch_request import (
+    AddNotesRequest,
+    DeleteNotesRequest,
+    UpdateNotesRequest,
+)
+from jaanevis.responses import (
+    ResponseFailure,
+    ResponseObject,
+    ResponseSuccess,
+    StatusCode,
+)
+from jaanevis.utils import event
+
+
+async def _owned_notes(
+    repo: AsyncRepository, codes: list[str], user: u.User
+) -> tuple[Optional[dict[str, n.Note]], Optional[ResponseFailure]]:
+    """notes by code if all exist and belong to the user, else a failure"""
+
+    notes = {
+        str(note.code): note for note in await repo.get_many_by_code(codes)
+    }
+    missing = [code for code in codes if code not in notes]
+    if missing:
+        return None, ResponseFailure.build_resource_error(
+            f"notes with codes {missing} not found"
+        )
+    if any(note.creator != user.username for note in notes.values()):
+        return None, ResponseFailure.build_parameters_error(
+            _("permission denied"), code=StatusCode.permission_denied
+        )
+    return notes, None
+
+
+class AddNotesUseCase:
+    """add many notes with a single repository write"""
+
+    def __init__(self, repo: AsyncRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, request: AddNotesRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+        try:
+            for note in request.notes:
+                note.creator_id = request.user.email
+                note.creator = request.user.username
+            await self.repo.add_many(request.notes)
+            await event.post_event_async("notes_added", request.notes)
+            return ResponseSuccess(request.notes)
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
+
+
+class UpdateNotesUseCase:
+    """update many notes, all or none of them"""
+
+    def __init__(self, repo: AsyncRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, request: UpdateNotesRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+
+        try:
+            codes = [note.code for note in request.notes]
+            notes, failure = await _owned_notes(self.repo, codes, request.user)
+            if failure is not None:
+                return failure
+
+            updates = {}
+            for note in request.notes:
+                data = note.dict(exclude_unset=True, exclude={"code"})
+                if "url" in data:
+                    data["url"] = str(data["url"])
+                updates[note.code] = data
+            updated_notes = await self.repo.update_many(updates)
+            await event.post_event_async(
+                "notes_updated",
+                [
+                    {"note": notes[str(note.code)], "updated_note": note}
+                    for note in updated_notes
+                ],
+            )
+            return ResponseSuccess(updated_notes)
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
+
+
+class DeleteNotesUseCase:
+    """delete many notes by their codes, all or none of them"""
+
+    def __init__(self, repo: AsyncRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, request: DeleteNotesRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+        try:
+            notes, failure = await _owned_notes(
+                self.repo, request.codes, request.user
+            )
+            if failure is not None:
+                return failure
+            await self.repo.delete_many_by_code(request.codes)
+            deleted_notes = list(notes.values())
+            await event.post_event_async("notes_deleted", deleted_notes)
+            return ResponseSuccess(deleted_notes)
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
@@ -0,0 +1,30 @@
+from jaanevis.repository.asyncrepo import AsyncRepository
+from jaanevis.requests.note_cluster_request import NoteClusterRequest
+from jaanevis.responses.response import (
+    ResponseFailure,
+    ResponseObject,
+    ResponseSuccess,
+)
+from jaanevis.serializers import note_geojson_serializer as geo_serializer
+
+
+class NoteClusterUseCase:
+    """cluster notes of a map zoom level as geojson features"""
+
+    def __init__(self, repo: AsyncRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, request: NoteClusterRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+        try:
+            clusters = await self.repo.clusters(
+                zoom=request.zoom, bbox=request.bbox
+            )
+            return ResponseSuccess(
+                geo_serializer.clusters_to_geojson_features(clusters)
+            )
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
@@ -0,0 +1,58 @@
+from typing import Any, AsyncIterator, Optional
+
+from jaanevis.domain import note as n
+from jaanevis.repository.asyncrepo import AsyncRepository
+from jaanevis.requests.note_export_request import NoteExportRequest
+from jaanevis.responses.response import (
+    ResponseFailure,
+    ResponseObject,
+    ResponseSuccess,
+)
+from jaanevis.serializers import note_export_serializer as ser
+
+# notes read from the repository at a time while exporting
+EXPORT_PAGE_SIZE = 1000
+
+
+class NoteExportUseCase:
+    """stream all notes matching filters as text chunks of a format
+
+    notes are read page by page after the last exported one, so only a
+    page of notes is held in memory however many are exported.
+    """
+
+    def __init__(
+        self, repo: AsyncRepository, page_size: int = EXPORT_PAGE_SIZE
+    ) -> None:
+        self.repo = repo
+        self.page_size = page_size
+
+    async def execute(self, request: NoteExportRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+        try:
+            chunks = ser.EXPORT_FORMATS[request.format][2]
+            return ResponseSuccess(chunks(self._pages(request.filters)))
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
+
+    async def _pages(
+        self, filters: Optional[dict[str, Any]]
+    ) -> AsyncIterator[list[n.Note]]:
+        filters = filters or {}
+        # nearest notes are ordered by distance and limited to k anyway
+        if "location__nearest" in filters:
+            yield await self.repo.list(filters=filters)
+            return
+        after = None
+        while True:
+            notes = await self.repo.list(
+                filters=filters, limit=self.page_size, after=after
+            )
+            if notes:
+                yield notes
+            if len(notes) < self.page_size:
+                return
+            after = (notes[-1].created.timestamp(), str(notes[-1].code))
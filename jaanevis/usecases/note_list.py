@@ -1,4 +1,4 @@
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.note_list_request import NoteListRequest
 from jaanevis.responses.response import (
     ResponseFailure,
@@ -6,20 +6,30 @@ from jaanevis.responses.response import (
     ResponseSuccess,
 )
 from jaanevis.serializers import note_geojson_serializer as geo_serializer
+from jaanevis.utils.cursor import encode_cursor
 
 
 class NoteListUseCase:
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: NoteListRequest) -> ResponseObject:
+    async def execute(self, request: NoteListRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
         try:
-            notes = self.repo.list(
-                filters=request.filters, limit=request.limit, skip=request.skip
+            notes = await self.repo.list(
+                filters=request.filters,
+                limit=request.limit,
+                skip=request.skip,
+                after=request.after,
             )
-            return ResponseSuccess(notes)
+            meta = {"next_cursor": None}
+            # nearest notes are ordered by distance, not by creation time
+            nearest = "location__nearest" in (request.filters or {})
+            if request.limit and len(notes) == request.limit and not nearest:
+                last = notes[-1]
+                meta["next_cursor"] = encode_cursor(last.created, last.code)
+            return ResponseSuccess(notes, meta=meta)
         except Exception as exc:
             return ResponseFailure.build_system_error(
                 "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
@@ -29,24 +39,27 @@ class NoteListUseCase:
 class GeoJsonNoteListUseCase:
     """list notes with geojson feature format"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: NoteListRequest) -> ResponseObject:
+    async def execute(self, request: NoteListRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
         note_list_usecase = NoteListUseCase(self.repo)
         request_obj = NoteListRequest(
-            filters=request.filters, limit=request.limit, skip=request.skip
+            filters=request.filters,
+            limit=request.limit,
+            skip=request.skip,
+            after=request.after,
         )
-        response = note_list_usecase.execute(request_obj)
+        response = await note_list_usecase.execute(request_obj)
 
         if not response:
             return response
 
         try:
-            geojson_notes = geo_serializer.notes_to_geojson_features(
-                response.value
-            )
-            return ResponseSuccess(geojson_notes)
+            geojson_notes = geo_serializer.notes_to_geojson(response.value)
+            return ResponseSuccess(geojson_notes, meta=response.meta)
         except Exception as exc:
             return ResponseFailure.build_system_error(
                 "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
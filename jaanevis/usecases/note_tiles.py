@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any
+
+from jaanevis.config import settings
+from jaanevis.repository.asyncrepo import AsyncRepository
+from jaanevis.requests.note_tile_request import NoteTileRequest
+from jaanevis.responses.response import (
+    ResponseFailure,
+    ResponseObject,
+    ResponseSuccess,
+)
+from jaanevis.utils import geo, mvt
+
+
+class NoteTileUseCase:
+    """notes of a map tile encoded as a mapbox vector tile
+
+    tiles zoomed out below the cluster max zoom draw note clusters with
+    their count, and the code of single notes, like the cluster
+    endpoint.
+    """
+
+    def __init__(
+        self, repo: AsyncRepository, cache: mvt.TileCache = mvt.tile_cache
+    ) -> None:
+        self.repo = repo
+        self.cache = cache
+
+    async def execute(self, request: NoteTileRequest) -> ResponseObject:
+        if not request:
+            return ResponseFailure.build_from_invalid_request_object(request)
+        try:
+            key = (request.zoom, request.x, request.y)
+            tile = self.cache.get(key)
+            if tile is None:
+                version = self.cache.version
+                tile = await self._build_tile(request)
+                self.cache.set(key, tile, version)
+            return ResponseSuccess(tile)
+        except Exception as exc:
+            return ResponseFailure.build_system_error(
+                "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
+            )
+
+    async def _build_tile(self, request: NoteTileRequest) -> bytes:
+        bbox = mvt.tile_bbox(
+            request.zoom, request.x, request.y, buffer=mvt.BUFFER
+        )
+        if request.zoom < geo.CLUSTER_MAX_ZOOM:
+            points = await self._cluster_points(request.zoom, bbox)
+        else:
+            points = await self._note_points(bbox)
+        return await asyncio.to_thread(
+            mvt.encode_tile,
+            "notes",
+            points,
+            request.zoom,
+            request.x,
+            request.y,
+        )
+
+    async def _cluster_points(
+        self, zoom: int, bbox: geo.BBox
+    ) -> list[tuple[float, float, dict[str, Any]]]:
+        """note clusters centered in the tile, a few per tile"""
+
+        min_lon, min_lat, max_lon, max_lat = bbox
+        clusters = await self.repo.clusters(zoom=zoom, bbox=bbox)
+        return [
+            (
+                cluster.lat,
+                cluster.long,
+                {"count": cluster.count, "code": cluster.code},
+            )
+            for cluster in clusters
+            if min_lon <= cluster.long <= max_lon
+            and min_lat <= cluster.lat <= max_lat
+        ]
+
+    async def _note_points(
+        self, bbox: geo.BBox
+    ) -> list[tuple[float, float, dict[str, Any]]]:
+        notes = await self.repo.list(
+            filters={"location__within": bbox},
+            limit=settings.TILE_MAX_NOTES,
+        )
+        return [
+            (
+                note.lat,
+                note.long,
+                {
+                    "code": note.code,
+                    "creator": note.creator,
+                    "country": note.country,
+                    "url": note.url,
+                    "text": note.text or None,
+                },
+            )
+            for note in notes
+        ]
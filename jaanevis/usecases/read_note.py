@@ -1,4 +1,4 @@
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.read_note_request import ReadNoteRequest
 from jaanevis.responses.response import (
     ResponseFailure,
@@ -10,14 +10,14 @@ from jaanevis.responses.response import (
 class ReadNoteUseCase:
     """Use case to get a note by it's code"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: ReadNoteRequest) -> ResponseObject:
+    async def execute(self, request: ReadNoteRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
         try:
-            note = self.repo.get_by_code(code=request.code)
+            note = await self.repo.get_by_code(code=request.code)
             if not note:
                 return ResponseFailure.build_resource_error(
                     f"note with code '{request.code}' not found"
@@ -1,9 +1,10 @@
+import asyncio
 import secrets
 from datetime import datetime, timedelta
 
 from jaanevis.domain import user as u
 from jaanevis.i18n import gettext as _
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.register_request import RegisterRequest
 from jaanevis.responses import (
     ResponseFailure,
@@ -17,28 +18,33 @@ from jaanevis.utils import event, security
 class RegisterUseCase:
     """usecase for user registration"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: RegisterRequest) -> ResponseObject:
+    async def execute(self, request: RegisterRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
 
         try:
-            user = self.repo.get_user_by_username(username=request.username)
+            user = await self.repo.get_user_by_username(
+                username=request.username
+            )
             if user:
                 return ResponseFailure.build_resource_error(
                     _("User with this username already exists"),
                     code=StatusCode.user_exists,
                 )
-            user = self.repo.get_user_by_email(email=request.email)
+            user = await self.repo.get_user_by_email(email=request.email)
             if user:
                 return ResponseFailure.build_resource_error(
                     _("User with this email already exists"),
                     code=StatusCode.user_exists,
                 )
-            hashed_password = security.hash_password(request.password)
-            created_user = self.repo.create_user(
+            # hashing is slow on purpose, keep it off the event loop
+            hashed_password = await asyncio.to_thread(
+                security.hash_password, request.password
+            )
+            created_user = await self.repo.create_user(
                 email=request.email,
                 username=request.username,
                 password=hashed_password,
@@ -46,14 +52,14 @@ class RegisterUseCase:
 
             activation_token = secrets.token_urlsafe(40)
             expire_time = (datetime.now() + timedelta(days=2)).timestamp()
-            self.repo.create_session(
+            await self.repo.create_session(
                 session_id=activation_token,
                 email=request.email,
                 username=request.username,
                 expire_time=expire_time,
             )
 
-            event.post_event(
+            await event.post_event_async(
                 "user_registered",
                 {
                     "email": request.email,
@@ -68,7 +74,7 @@ class RegisterUseCase:
 
             return ResponseSuccess(new_user)
         except Exception as exc:
-            self.repo.delete_user(username=request.email)
+            await self.repo.delete_user(username=request.email)
             return ResponseFailure.build_system_error(
                 "{}: {}".format(exc.__class__.__name__, "{}".format(exc))
             )
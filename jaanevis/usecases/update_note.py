@@ -1,21 +1,22 @@
 from jaanevis.i18n import gettext as _
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.update_note_request import UpdateNoteRequest
 from jaanevis.responses import ResponseFailure, ResponseObject, ResponseSuccess
+from jaanevis.utils import event
 
 
 class UpdateNoteUseCase:
     """update a note"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: UpdateNoteRequest) -> ResponseObject:
+    async def execute(self, request: UpdateNoteRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
 
         try:
-            note = self.repo.get_by_code(code=request.code)
+            note = await self.repo.get_by_code(code=request.code)
             if not note:
                 return ResponseFailure.build_resource_error(
                     f"note with code '{request.code}' not found"
@@ -26,8 +27,12 @@ class UpdateNoteUseCase:
                 )
 
             data = request.note.dict(exclude_unset=True)
-            data["url"] = str(data["url"])
-            updated_note = self.repo.update(obj=note, data=data)
+            if "url" in data:
+                data["url"] = str(data["url"])
+            updated_note = await self.repo.update(obj=note, data=data)
+            await event.post_event_async(
+                "note_updated", {"note": note, "updated_note": updated_note}
+            )
             return ResponseSuccess(updated_note)
         except Exception as exc:
             return ResponseFailure.build_system_error(
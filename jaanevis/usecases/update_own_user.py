@@ -1,21 +1,22 @@
 from jaanevis.domain import user as u
-from jaanevis.repository.base import Repository
+from jaanevis.repository.asyncrepo import AsyncRepository
 from jaanevis.requests.update_own_user_request import UpdateOwnUserRequest
 from jaanevis.responses import ResponseFailure, ResponseObject, ResponseSuccess
+from jaanevis.utils import event
 
 
 class UpdateOwnUserUseCase:
     """update own user"""
 
-    def __init__(self, repo: Repository) -> None:
+    def __init__(self, repo: AsyncRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: UpdateOwnUserRequest) -> ResponseObject:
+    async def execute(self, request: UpdateOwnUserRequest) -> ResponseObject:
         if not request:
             return ResponseFailure.build_from_invalid_request_object(request)
 
         try:
-            user_exists = self.repo.get_user_by_username(
+            user_exists = await self.repo.get_user_by_username(
                 username=request.update_user.username
             )
             if user_exists:
@@ -24,7 +25,13 @@ class UpdateOwnUserUseCase:
                 )
 
             data = request.update_user.dict(exclude_unset=True)
-            updated_user = self.repo.update_user(obj=request.user, data=data)
+            updated_user = await self.repo.update_user(
+                obj=request.user, data=data
+            )
+            await event.post_event_async(
+                "user_updated",
+                {"user": request.user, "updated_user": updated_user},
+            )
             user_read = u.UserRead(
                 username=updated_user.username,
                 is_active=updated_user.is_active,
@@ -0,0 +1,26 @@
+"""opaque cursors for keyset pagination of notes"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+def encode_cursor(created: datetime, code: str) -> str:
+    """cursor pointing after the note with given created time and code"""
+
+    raw = json.dumps([created.timestamp(), str(code)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """(created timestamp, code) key of a cursor, ValueError if invalid"""
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        created, code = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(created, (int, float)) or not isinstance(code, str):
+        raise ValueError("invalid cursor")
+    return float(created), code
@@ -1,9 +1,8 @@
+from jaanevis import tasks
 from jaanevis.config import settings
 from jaanevis.i18n import gettext as _
-from jaanevis.tasks.core import q
 
 from .event import subscribe
-from .mail import send_email
 
 
 def handle_user_registered_event(data):
@@ -17,8 +16,8 @@ def handle_user_registered_event(data):
     )
     mail_text = f"visit this link to activate your account {activation_url}"
     mail_subject = _("Jaanevis Account Activation")
-    q.enqueue(
-        send_email,
+    tasks.enqueue(
+        "jaanevis.utils.mail.send_email",
         email_to=email,
         text=mail_text,
         subject=mail_subject,
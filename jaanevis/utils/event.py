@@ -1,3 +1,4 @@
+import asyncio
 from collections import defaultdict
 
 subscribers = defaultdict(list)
@@ -12,3 +13,13 @@ def post_event(event_type: str, data):
         return
     for fn in subscribers[event_type]:
         fn(data)
+
+
+async def post_event_async(event_type: str, data) -> None:
+    """post an event from a coroutine
+
+    subscribers block, enqueueing jobs in redis among others, so they
+    run in a worker thread and keep the event loop free.
+    """
+
+    await asyncio.to_thread(post_event, event_type, data)
@@ -1,13 +1,299 @@
 """utils for geographical calculations"""
 
-import reverse_geocode
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from jaanevis.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BBox = tuple[float, float, float, float]
+
+EARTH_RADIUS_KM = 6371.0088
+# no two points on earth are farther apart than half its circumference
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+# deepest zoom level notes are clustered at
+CLUSTER_MAX_ZOOM = 16
+
+_geocoder_ready = threading.Event()
+
+
+def _search(points: Sequence[tuple[float, float]]) -> list[dict[str, str]]:
+    """nearest cities of points
+
+    reverse_geocode pulls in scipy, so it is imported on first use to
+    keep it out of the startup of everything not geocoding.
+    """
+
+    import reverse_geocode
+
+    return reverse_geocode.search(points)
+
+
+def warm_up_geocoder() -> None:
+    """build the reverse geocoding index ahead of the first lookup
+
+    reverse_geocode is imported, loads its cities and builds a kd-tree
+    on the first search, which would otherwise stall the first note
+    created.
+    """
+
+    try:
+        _search([(0.0, 0.0)])
+    except Exception:
+        logger.exception("reverse geocoder warm up failed")
+        return
+    _geocoder_ready.set()
+
+
+def start_geocoder_warm_up() -> threading.Thread:
+    thread = threading.Thread(
+        target=warm_up_geocoder, name="geocoder-warm-up", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def geocoder_ready() -> bool:
+    return _geocoder_ready.is_set()
+
+
+def quantize(lat: float, long: float) -> tuple[float, float]:
+    """point rounded to the geocode cache precision"""
+
+    precision = settings.GEOCODE_CACHE_PRECISION
+    return round(lat, precision), round(long, precision)
+
+
+class GeocodeCache:
+    """countries by rounded point, least recently used are dropped
+
+    points without a country are cached too, so a point that found
+    nothing is not searched again either.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._countries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, keys: Iterable[tuple[float, float]]
+    ) -> tuple[dict[tuple[float, float], str | None], list]:
+        """cached countries of points and the points not cached"""
+
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._countries:
+                    self._countries.move_to_end(key)
+                    found[key] = self._countries[key]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+                    self.misses += 1
+        return found, missing
+
+    def store(self, countries: dict[tuple[float, float], str | None]) -> None:
+        with self._lock:
+            for key, country in countries.items():
+                self._countries[key] = country
+                self._countries.move_to_end(key)
+            while len(self._countries) > self.size:
+                self._countries.popitem(last=False)
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._countries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._countries.clear()
+            self.hits = self.misses = 0
+
+
+_geocode_cache = GeocodeCache(settings.GEOCODE_CACHE_SIZE)
 
 
 def get_country_from_latlong(lat: float, long: float) -> str | None:
-    loc_data = reverse_geocode.search([(lat, long)])
-    if not loc_data:
-        return None
-    return loc_data[0]["country_code"]
+    """country code of a point, cached by the point rounded to
+    GEOCODE_CACHE_PRECISION decimals"""
+
+    return get_countries_from_latlongs([(lat, long)])[0]
+
+
+def get_countries_from_latlongs(
+    points: Sequence[tuple[float, float]]
+) -> list[str | None]:
+    """country codes of many points with a single reverse geocoding query
+
+    points are rounded like in get_country_from_latlong, answered from
+    the geocode cache where possible and every other distinct rounded
+    point is searched once.
+    """
+
+    keys = [quantize(lat, long) for lat, long in points]
+    countries, missing = _geocode_cache.lookup(dict.fromkeys(keys))
+    if missing:
+        searched = dict.fromkeys(missing)
+        for key, location in zip(missing, _search(missing), strict=False):
+            searched[key] = location.get("country_code")
+        _geocode_cache.store(searched)
+        countries.update(searched)
+    return [countries[key] for key in keys]
+
+
+def geocode_cache_info() -> dict[str, int]:
+    """hits, misses and size of the geocode cache"""
+
+    return _geocode_cache.info()
+
+
+def clear_geocode_cache() -> None:
+    _geocode_cache.clear()
+
+
+def parse_bbox(value: str | Any) -> BBox:
+    """(min_lon, min_lat, max_lon, max_lat) from a sequence or a comma
+    separated string, ValueError if it is not a valid bounding box"""
+
+    if isinstance(value, str):
+        value = value.split(",")
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in value)
+    except TypeError as exc:
+        raise ValueError("invalid bounding box") from exc
+    if not (
+        -180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90
+    ):
+        raise ValueError("invalid bounding box")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def in_bbox(lat: float, long: float, bbox: BBox) -> bool:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return min_lon <= long <= max_lon and min_lat <= lat <= max_lat
+
+
+def _parse_point_and(value: str | Any) -> tuple[float, float, float]:
+    """lat, long and a positive number from a sequence or a comma
+    separated string"""
+
+    if isinstance(value, str):
+        value = value.split(",")
+    try:
+        lat, long, number = (float(v) for v in value)
+    except TypeError as exc:
+        raise ValueError("invalid point") from exc
+    if not (-90 <= lat <= 90 and -180 <= long <= 180 and number > 0):
+        raise ValueError("invalid point")
+    return lat, long, number
+
+
+def parse_circle(value: str | Any) -> tuple[float, float, float]:
+    """(lat, long, radius_km), ValueError if it is not a valid circle"""
+
+    return _parse_point_and(value)
+
+
+def parse_nearest(value: str | Any) -> tuple[float, float, int]:
+    """(lat, long, k), ValueError if k is not a positive integer"""
+
+    lat, long, k = _parse_point_and(value)
+    if not k.is_integer():
+        raise ValueError("k must be an integer")
+    return lat, long, int(k)
+
+
+def haversine_km(
+    lat1: float, long1: float, lat2: float, long2: float
+) -> float:
+    """great circle distance between two points in kilometers"""
+
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(long2 - long1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_array(
+    lat: float, long: float, lats: "np.ndarray", longs: "np.ndarray"
+) -> "np.ndarray":
+    """distances in kilometers from a point to arrays of points"""
+
+    import numpy as np
+
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(longs - long)
+    a = (
+        np.sin(dphi / 2) ** 2
+        + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def bbox_around(lat: float, long: float, radius_km: float) -> BBox:
+    """bounding box containing every point within radius_km of a point
+
+    the box spans all longitudes when the circle reaches a pole or
+    crosses the antimeridian.
+    """
+
+    angle = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angle)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        return -180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0)
+    dlong = math.degrees(
+        math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat))))
+    )
+    min_long, max_long = long - dlong, long + dlong
+    if min_long < -180 or max_long > 180:
+        return -180.0, min_lat, 180.0, max_lat
+    return min_long, min_lat, max_long, max_lat
+
+
+def cluster_cell_size(zoom: int) -> float:
+    """size in degrees of cluster cells, four of them span a map tile
+
+    cells halve with every zoom level, so each cell splits into four
+    cells of the next level.
+    """
+
+    return 90 / 2**zoom
+
+
+def cluster_cell(zoom: int, lat: float, long: float) -> tuple[int, int]:
+    size = cluster_cell_size(zoom)
+    return math.floor((long + 180) / size), math.floor((lat + 90) / size)
+
+
+def cluster_cell_bbox(zoom: int, cell: tuple[int, int]) -> BBox:
+    size = cluster_cell_size(zoom)
+    x, y = cell
+    return (
+        max(x * size - 180, -180.0),
+        max(y * size - 90, -90.0),
+        min((x + 1) * size - 180, 180.0),
+        min((y + 1) * size - 90, 90.0),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+"""mapbox vector tiles of notes and a cache for them
+
+tiles are encoded by hand following the vector tile 2.1 protobuf
+schema, which only needs varints and length delimited fields.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from jaanevis.config import settings
+from jaanevis.utils import geo
+
+EXTENT = 4096
+# share of the tile extent added around tiles so edge points are drawn
+BUFFER = 64 / EXTENT
+MAX_TILE_ZOOM = 22
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# protobuf wire types
+VARINT, LENGTH_DELIMITED = 0, 2
+POINT = 1
+MOVE_TO = 1
+
+
+def tile_count(zoom: int) -> int:
+    return 2**zoom
+
+
+def tiles_for(
+    zoom: int, lat: float, long: float, buffer: float = BUFFER
+) -> set[tuple[int, int]]:
+    """(x, y) of the tiles a point is drawn in, including their buffers"""
+
+    x, y = project(zoom, lat, long)
+    last = tile_count(zoom) - 1
+    return {
+        (min(max(math.floor(tx), 0), last), min(max(math.floor(ty), 0), last))
+        for tx in (x - buffer, x + buffer)
+        for ty in (y - buffer, y + buffer)
+    }
+
+
+def project(zoom: int, lat: float, long: float) -> tuple[float, float]:
+    """web mercator position of a point in tile units of a zoom level"""
+
+    lat = min(max(lat, -85.0511), 85.0511)
+    count = tile_count(zoom)
+    x = (long + 180) / 360 * count
+    phi = math.radians(lat)
+    y = (1 - math.asinh(math.tan(phi)) / math.pi) / 2 * count
+    return x, y
+
+
+def _tile_lat(zoom: int, y: float) -> float:
+    n = math.pi * (1 - 2 * y / tile_count(zoom))
+    return math.degrees(math.atan(math.sinh(n)))
+
+
+def tile_bbox(zoom: int, x: int, y: int, buffer: float = 0) -> geo.BBox:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile
+
+    tiles on the top and bottom rows reach the poles so notes beyond
+    the web mercator limits still show up.
+    """
+
+    count = tile_count(zoom)
+    max_lat = 90.0 if y == 0 else _tile_lat(zoom, y - buffer)
+    min_lat = -90.0 if y == count - 1 else _tile_lat(zoom, y + 1 + buffer)
+    return (
+        max((x - buffer) / count * 360 - 180, -180.0),
+        max(min_lat, -90.0),
+        min((x + 1 + buffer) / count * 360 - 180, 180.0),
+        min(max_lat, 90.0),
+    )
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(number: int, wire_type: int) -> bytes:
+    return _varint(number << 3 | wire_type)
+
+
+def _message(number: int, data: bytes) -> bytes:
+    return _key(number, LENGTH_DELIMITED) + _varint(len(data)) + data
+
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _message(number, b"".join(_varint(value) for value in values))
+
+
+def encode_tile(
+    layer: str,
+    points: Iterable[tuple[float, float, dict[str, Any]]],
+    zoom: int,
+    x: int,
+    y: int,
+) -> bytes:
+    """vector tile with a layer of (lat, long, properties) points
+
+    properties with None values are left out, others are encoded as
+    strings.
+    """
+
+    keys: dict[str, int] = {}
+    values: dict[str, int] = {}
+    features = []
+    for lat, long, properties in points:
+        px, py = project(zoom, lat, long)
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(str(value), len(values)))
+        geometry = (
+            MOVE_TO | 1 << 3,
+            _zigzag(round((px - x) * EXTENT)),
+            _zigzag(round((py - y) * EXTENT)),
+        )
+        features.append(
+            _message(
+                2,
+                _packed(2, tags)
+                + _key(3, VARINT)
+                + _varint(POINT)
+                + _packed(4, geometry),
+            )
+        )
+    data = (
+        _key(15, VARINT)
+        + _varint(2)
+        + _message(1, layer.encode())
+        + b"".join(features)
+        + b"".join(_message(3, key.encode()) for key in keys)
+        + b"".join(
+            _message(4, _message(1, value.encode())) for value in values
+        )
+        + _key(5, VARINT)
+        + _varint(EXTENT)
+    )
+    return _message(3, data)
+
+
+class TileCache:
+    """encoded tiles by (zoom, x, y), least recently used are dropped
+
+    tiles expire after a ttl so changes made by other processes show up,
+    and are invalidated right away for changes posted as note events.
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.size = size
+        self.ttl = ttl
+        self.version = 0
+        self._tiles: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int, int]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._tiles.get(key)
+            if entry is None:
+                return None
+            expires, tile = entry
+            if expires < time.monotonic():
+                del self._tiles[key]
+                return None
+            self._tiles.move_to_end(key)
+            return tile
+
+    def set(
+        self, key: tuple[int, int, int], tile: bytes, version: int
+    ) -> None:
+        """cache a tile built when the cache was at the given version
+
+        tiles built before an invalidation are stale and not cached.
+        """
+
+        with self._lock:
+            if version != self.version:
+                return
+            self._tiles[key] = (time.monotonic() + self.ttl, tile)
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.size:
+                self._tiles.popitem(last=False)
+
+    def invalidate_point(self, lat: float, long: float) -> None:
+        """drop tiles of every zoom level containing a point"""
+
+        with self._lock:
+            self.version += 1
+            for zoom in range(MAX_TILE_ZOOM + 1):
+                for x, y in tiles_for(zoom, lat, long):
+                    self._tiles.pop((zoom, x, y), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._tiles.clear()
+
+
+tile_cache = TileCache(settings.TILE_CACHE_SIZE, settings.TILE_CACHE_TTL)
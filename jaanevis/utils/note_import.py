@@ -0,0 +1,168 @@
+"""streaming readers for bulk note imports
+
+geojson feature collections and ndjson files are read incrementally, so
+imports use constant memory no matter how large the file is.
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+from pydantic import ValidationError
+
+from jaanevis.domain import note as n
+from jaanevis.utils import geo
+
+FORMATS = ("geojson", "ndjson")
+# note fields taken from imported records, creators are set on import
+# and codes are new so records cannot overwrite stored notes
+IMPORT_FIELDS = ("url", "lat", "long", "country", "text", "tags", "created")
+BUFFER_SIZE = 1 << 16
+
+
+def detect_format(path: str) -> str:
+    if path.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "geojson"
+
+
+class _JsonStream:
+    """json values read one at a time from a text stream"""
+
+    def __init__(self, stream: TextIO, buffer_size: int) -> None:
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.stream.read(self.buffer_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """next non whitespace character, empty at the end of the stream"""
+
+        while True:
+            while (
+                self.pos < len(self.buffer) and self.buffer[self.pos].isspace()
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer may go on in the next read
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_geojson_features(
+    stream: TextIO, buffer_size: int = BUFFER_SIZE
+) -> Iterator[dict[str, Any]]:
+    """features of a feature collection, other members are skipped"""
+
+    reader = _JsonStream(stream, buffer_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key != "features":
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[dict[str, Any]]:
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {number}: {exc}") from exc
+
+
+def iter_records(stream: TextIO, file_format: str) -> Iterator[dict]:
+    if file_format == "ndjson":
+        return iter_ndjson(stream)
+    return iter_geojson_features(stream)
+
+
+def record_to_note_data(record: dict[str, Any]) -> dict[str, Any]:
+    """note fields of a geojson feature or a flat note record"""
+
+    if record.get("type") == "Feature":
+        long, lat = record["geometry"]["coordinates"][:2]
+        record = {**(record.get("properties") or {}), "lat": lat, "long": long}
+    data = {key: record[key] for key in IMPORT_FIELDS if key in record}
+    lat, long = float(data["lat"]), float(data["long"])
+    if not (-90 <= lat <= 90 and -180 <= long <= 180):
+        raise ValueError("coordinates out of range")
+    data["lat"], data["long"] = lat, long
+    return data
+
+
+def notes_from_records(
+    records: list[dict[str, Any]], first_number: int = 1
+) -> tuple[list[n.Note], list[str]]:
+    """validated notes of a chunk of records and errors of invalid ones
+
+    countries missing from records are geocoded for the whole chunk at
+    once instead of note by note.
+    """
+
+    errors, datas = [], []
+    for number, record in enumerate(records, first_number):
+        try:
+            datas.append((number, record_to_note_data(record)))
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            errors.append(f"record {number}: invalid record ({exc!r})")
+
+    missing = [data for _, data in datas if not data.get("country")]
+    countries = geo.get_countries_from_latlongs(
+        [(data["lat"], data["long"]) for data in missing]
+    )
+    for data, country in zip(missing, countries, strict=True):
+        data["country"] = country or ""
+
+    notes = []
+    for number, data in datas:
+        try:
+            notes.append(n.Note(**data, geocode=False))
+        except (TypeError, ValidationError) as exc:
+            errors.append(f"record {number}: {exc}")
+    return notes, errors
@@ -0,0 +1,87 @@
+"""users resolved from sessions, cached in the process
+
+authenticating a request looks up the session and its user in the
+repository, hot sessions are answered from here instead.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from jaanevis.config import settings
+from jaanevis.domain import user as u
+
+
+class SessionCache:
+    """users by session id, least recently used are dropped
+
+    entries expire after a ttl, or when their session does if that is
+    sooner, so changes made by other processes show up. logins, logouts
+    and user changes posted as events drop them right away.
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.size = size
+        self.ttl = ttl
+        self._users: OrderedDict = OrderedDict()
+        self._sessions_by_username: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[u.User]:
+        with self._lock:
+            entry = self._users.get(session_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                self._drop(session_id)
+                return None
+            self._users.move_to_end(session_id)
+            return user
+
+    def set(self, session_id: str, user: u.User, expire_time: float) -> None:
+        """cache the user of a session expiring at a unix timestamp"""
+
+        lifetime = min(self.ttl, expire_time - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._drop(session_id)
+            self._users[session_id] = (time.monotonic() + lifetime, user)
+            self._sessions_by_username.setdefault(user.username, set()).add(
+                session_id
+            )
+            while len(self._users) > self.size:
+                self._drop(next(iter(self._users)))
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._users.pop(session_id, None)
+        if entry is None:
+            return
+        username = entry[1].username
+        sessions = self._sessions_by_username.get(username, set())
+        sessions.discard(session_id)
+        if not sessions:
+            self._sessions_by_username.pop(username, None)
+
+    def invalidate_session(self, session_id: str) -> None:
+        with self._lock:
+            self._drop(session_id)
+
+    def invalidate_user(self, username: str) -> None:
+        """drop every cached session of a user"""
+
+        with self._lock:
+            for session_id in self._sessions_by_username.pop(username, ()):
+                self._users.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._sessions_by_username.clear()
+
+
+session_cache = SessionCache(
+    settings.SESSION_CACHE_SIZE, settings.SESSION_CACHE_TTL
+)
@@ -0,0 +1,22 @@
+from .event import subscribe
+from .session_cache import session_cache
+
+
+def handle_user_logged_out_event(session_id):
+    session_cache.invalidate_session(session_id)
+
+
+def handle_user_logged_in_event(username):
+    # logging in replaces the session of the user
+    session_cache.invalidate_user(username)
+
+
+def handle_user_updated_event(data):
+    # any change may matter for authentication, like deactivation
+    session_cache.invalidate_user(data["user"].username)
+
+
+def setup_session_cache_event_handlers():
+    subscribe("user_logged_in", handle_user_logged_in_event)
+    subscribe("user_logged_out", handle_user_logged_out_event)
+    subscribe("user_updated", handle_user_updated_event)
@@ -0,0 +1,55 @@
+"""periodic removal of expired sessions and activation tokens
+
+sessions are only dropped when presented after they expired, so ones
+never used again pile up in the repository without a sweep.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from jaanevis.config import settings
+from jaanevis.repository.asyncrepo import AsyncRepository, async_repository
+
+logger = logging.getLogger(__name__)
+
+_sweeper: Optional[asyncio.Task] = None
+
+
+async def sweep_expired_sessions(
+    repo: Optional[AsyncRepository] = None,
+) -> int:
+    """delete expired sessions, returns how many were removed"""
+
+    if repo is None:
+        repo = await async_repository()
+    removed = await repo.delete_expired_sessions(time.time())
+    logger.info("removed %d expired sessions", removed)
+    return removed
+
+
+async def run_session_sweeper(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_expired_sessions()
+        except Exception:
+            logger.exception("sweeping expired sessions failed")
+
+
+def start_session_sweeper() -> None:
+    """sweep every SESSION_SWEEP_INTERVAL seconds on the running loop"""
+
+    global _sweeper
+    if _sweeper is None and settings.SESSION_SWEEP_INTERVAL > 0:
+        _sweeper = asyncio.create_task(
+            run_session_sweeper(settings.SESSION_SWEEP_INTERVAL)
+        )
+
+
+def stop_session_sweeper() -> None:
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.cancel()
+        _sweeper = None
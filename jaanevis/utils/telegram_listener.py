@@ -1,7 +1,6 @@
-from jaanevis.tasks.core import q
+from jaanevis import tasks
 
 from .event import subscribe
-from .telegram import send_message_to_channel
 
 
 def handle_new_note_add_event(note):
@@ -22,8 +21,14 @@ def handle_new_note_add_event(note):
         long=note.long,
     )
 
-    q.enqueue(send_message_to_channel, msg)
+    tasks.enqueue("jaanevis.utils.telegram.send_message_to_channel", msg)
+
+
+def handle_new_notes_add_event(notes):
+    for note in notes:
+        handle_new_note_add_event(note)
 
 
 def setup_note_add_event_handlers():
     subscribe("note_added", handle_new_note_add_event)
+    subscribe("notes_added", handle_new_notes_add_event)
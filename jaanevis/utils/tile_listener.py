@@ -0,0 +1,39 @@
+from .event import subscribe
+from .mvt import tile_cache
+
+
+def handle_note_added_event(note):
+    tile_cache.invalidate_point(note.lat, note.long)
+
+
+def handle_note_updated_event(data):
+    for note in (data["note"], data["updated_note"]):
+        tile_cache.invalidate_point(note.lat, note.long)
+
+
+def handle_note_deleted_event(note):
+    tile_cache.invalidate_point(note.lat, note.long)
+
+
+def handle_notes_added_event(notes):
+    for note in notes:
+        handle_note_added_event(note)
+
+
+def handle_notes_updated_event(changes):
+    for data in changes:
+        handle_note_updated_event(data)
+
+
+def handle_notes_deleted_event(notes):
+    for note in notes:
+        handle_note_deleted_event(note)
+
+
+def setup_tile_cache_event_handlers():
+    subscribe("note_added", handle_note_added_event)
+    subscribe("note_updated", handle_note_updated_event)
+    subscribe("note_deleted", handle_note_deleted_event)
+    subscribe("notes_added", handle_notes_added_event)
+    subscribe("notes_updated", handle_notes_updated_event)
+    subscribe("notes_deleted", handle_notes_deleted_event)